@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Existence Index Benchmark
+=========================
+
+Compares the three ``existence_index`` modes (see ``keyindex.KeyIndex``)
+on ``ClienteManager`` with an empty client cache, so every lookup has to
+decide whether a client file exists. The index needs the directory
+watcher, so every mode runs with ``watch_enabled``:
+
+- miss: ``buscar_cliente`` of names that were never stored (always
+  confirmed on disk, whatever the mode)
+- duplicate check: the existence test ``crear_cliente`` runs before
+  writing, for stored and new names alike
+- build: the directory scan that fills the index on first use
+- memory: bytes held by the index
+
+Usage:
+    python benchmarks/bench_existence.py [--clients 20000] [--lookups 20000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from axanet.cliente_manager import ClienteManager
+from axanet.config import DatabaseConfig
+
+
+def per_call(function, names) -> float:
+    started = time.perf_counter()
+    for name in names:
+        function(name)
+    return (time.perf_counter() - started) / len(names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20000, help="Clients in the store")
+    parser.add_argument("--lookups", type=int, default=20000, help="Lookups per case")
+    args = parser.parse_args()
+
+    stored = [f"cliente_{index}" for index in range(args.clients)]
+    missing = [f"ausente_{index}" for index in range(args.lookups)]
+    mixed = random.sample(stored, min(args.lookups // 2, len(stored))) + missing[:args.lookups // 2]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        gestor = ClienteManager(data_dir, DatabaseConfig(base_directory=data_dir, existence_index="none"))
+        gestor.crear_clientes_lote(
+            (f"Cliente {index}", "5512345678", f"c{index}@example.com", "Alta") for index in range(args.clients)
+        )
+        gestor.cerrar()
+
+        print(f"{'mode':<6} {'build ms':>9} {'miss us':>8} {'dup check us':>13} {'memory KiB':>11} {'disk checks':>12}")
+        for mode in ("none", "set", "bloom"):
+            # Without a cache capacity every client stays cached; a fresh
+            # manager starts empty, so nothing is answered from the cache
+            gestor = ClienteManager(data_dir, DatabaseConfig(base_directory=data_dir, watch_enabled=True,
+                                                             existence_index=mode))
+            started = time.perf_counter()
+            if gestor._indice_claves is not None:
+                gestor._indice_claves.build()
+            build = time.perf_counter() - started
+            miss = per_call(gestor.buscar_cliente, missing)
+            duplicate = per_call(gestor._existe_en_disco, mixed)
+            stats = gestor.obtener_estadisticas_indice_claves()
+            gestor.cerrar()
+            memory = f"{stats['memory_bytes'] / 1024:>11.0f}" if stats else f"{'':>11}"
+            checks = f"{stats['disk_checks']:>12,}" if stats else f"{'':>12}"
+            print(f"{mode:<6} {build * 1e3:>9.1f} {miss * 1e6:>8.2f} {duplicate * 1e6:>13.2f} {memory} {checks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Directory Layout Benchmark
+==========================
+
+Compares the flat layout (every client file in the data directory) with
+hashed shard directories (``shard_depth``, see ``layout.ClientFileLayout``):
+
+- create: writing N new client files (no fsync, to measure the directory cost)
+- lookup: ``exists`` + read of random clients; in both layouts the path is
+  computed directly, so this is one directory lookup per level
+- list: enumerating every client name
+- migrate: moving all N files from the flat layout to the sharded one
+
+Small directories show little difference; it grows with N and with the
+file system (directory size matters most on network and older file systems).
+
+Usage:
+    python benchmarks/bench_layout.py [--clients 10000 100000] [--depth 2] [--lookups 20000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from axanet.layout import ClientFileLayout
+from axanet.storage import write_files_durably
+
+
+def timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def run(clients: int, depth: int, lookups: int):
+    """Return (create, lookup per op, list, migrate) seconds for one layout."""
+    names = [f"cliente_{index}" for index in range(clients)]
+    sample = random.sample(names, min(lookups, clients))
+    with tempfile.TemporaryDirectory() as directory:
+        layout = ClientFileLayout.open(Path(directory), ".txt", depth)
+
+        def create():
+            for start in range(0, clients, 1000):
+                write_files_durably(((layout.path_for(name), name) for name in names[start:start + 1000]), sync=False)
+
+        def lookup():
+            for name in sample:
+                if layout.exists(name):
+                    layout.read_text(name)
+
+        create_time = timed(create)
+        lookup_time = timed(lookup) / len(sample)
+        list_time = timed(layout.names)
+        migrate_time = timed(lambda: layout.migrate_to(2, sync=False)) if depth == 0 else None
+        return create_time, lookup_time, list_time, migrate_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[10000, 100000], help="Client files")
+    parser.add_argument("--depth", type=int, default=2, help="Shard depth compared with the flat layout")
+    parser.add_argument("--lookups", type=int, default=20000, help="Random lookups per run")
+    args = parser.parse_args()
+
+    print(f"{'clients':>9} {'depth':>6} {'create s':>9} {'lookup us':>10} {'list s':>8} {'migrate s':>10}")
+    for clients in args.clients:
+        for depth in (0, args.depth):
+            create, lookup, listing, migrate = run(clients, depth, args.lookups)
+            migrate_text = f"{migrate:>10.2f}" if migrate is not None else f"{'':>10}"
+            print(f"{clients:>9,} {depth:>6} {create:>9.2f} {lookup * 1e6:>10.1f} {listing:>8.2f} {migrate_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Lookup Microbenchmark
+=====================
+
+Measures cache-hit lookups on both managers and compares them with the
+original key derivation, which built and validated a throwaway model
+object on every call:
+
+- legacy key: ``Cliente(nombre, "0000000000", "temp@temp.com")`` /
+  ``Client(name, "", "")`` just to read the normalized name
+- obtener_cliente / buscar_cliente on ``ClienteManager``
+- get_client / find_client / client_exists on ``ClientManager``
+
+Usage:
+    python benchmarks/bench_lookup.py [--clients 2000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=2000, help="Clients in the store")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    # The two managers use different file formats, so each gets its own directory
+    with tempfile.TemporaryDirectory() as data_dir, tempfile.TemporaryDirectory() as english_dir:
+        os.environ["AXANET_DATA_DIR"] = english_dir
+        from axanet.cliente_manager import ClienteManager
+        from axanet.config import DatabaseConfig
+        from axanet.modelos import Cliente
+        from axanet.models import Client
+        from axanet.services import ClientManager
+
+        names = [f"Cliente Número {i}" for i in range(args.clients)]
+        gestor = ClienteManager(data_dir, DatabaseConfig(base_directory=data_dir))
+        gestor.crear_clientes_lote(
+            (name, "5512345678", f"c{i}@example.com", "Alta") for i, name in enumerate(names)
+        )
+        manager = ClientManager()
+        manager.create_clients_batch(
+            (name, "5512345678", f"c{i}@example.com", "Setup") for i, name in enumerate(names)
+        )
+
+        def legacy_cliente_lookup(name):
+            key = Cliente(nombre=name, telefono="0000000000", email="temp@temp.com").nombre_normalizado
+            return gestor._cache_clientes.get(key)
+
+        def legacy_client_lookup(name):
+            key = Client(name=name, phone="", email="").normalized_name
+            return manager._get_loaded_client(key)
+
+        # Warm every cache (clients, normalization memo) before timing
+        for name in names:
+            gestor.obtener_cliente(name)
+            manager.get_client(name)
+
+        cases = [
+            ("legacy Cliente key + get", legacy_cliente_lookup),
+            ("obtener_cliente", gestor.obtener_cliente),
+            ("buscar_cliente", gestor.buscar_cliente),
+            ("legacy Client key + get", legacy_client_lookup),
+            ("get_client", manager.get_client),
+            ("find_client", manager.find_client),
+            ("client_exists", manager.client_exists),
+        ]
+
+        print(f"{'case':<26} {'ns/call':>10}")
+        for label, function in cases:
+            best = min(timeit.repeat(lambda: [function(name) for name in names], number=1, repeat=args.repeat))
+            print(f"{label:<26} {best / len(names) * 1e9:>10.0f}")
+
+        gestor.cerrar()
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Memory Benchmark
+================
+
+Reports bytes per cached client for the original object layout and the
+compact models:
+
+- legacy Cliente: ``__dict__`` instance, string dates, list of ``Servicio``
+- Cliente: ``__slots__``, packed dates, ``ServiceList`` of services
+- legacy Client: plain dataclass with a list of ``Service`` dataclasses
+- Client: ``slots=True`` dataclass with a ``ServiceList``
+
+Every client gets the same name, phone, email and services in each case,
+so the difference comes from the object layout only.
+
+Allocations are counted with ``tracemalloc``, which slows Python down a
+lot: the default million clients takes several minutes.
+
+Usage:
+    python benchmarks/bench_memory.py [--clients 1000000] [--services 3]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from axanet.modelos import Cliente, Servicio
+from axanet.models import Client, Service
+
+
+DESCRIPTIONS = ["Instalación", "Soporte técnico", "Mantenimiento", "Consultoría", "Capacitación"]
+START = datetime(2024, 1, 1, 9, 0, 0)
+
+
+class LegacyServicio:
+    def __init__(self, descripcion, fecha_solicitud):
+        self.descripcion = descripcion
+        self.fecha_solicitud = fecha_solicitud
+
+
+class LegacyCliente:
+    def __init__(self, nombre, telefono, email):
+        self.nombre = nombre
+        self.telefono = telefono
+        self.email = email
+        self.servicios = []
+        self.id_cliente = ""
+        self.fecha_registro = ""
+
+
+@dataclass
+class LegacyService:
+    description: str
+    date_requested: datetime
+
+
+@dataclass
+class LegacyClient:
+    name: str
+    phone: str
+    email: str
+    services: List[LegacyService] = field(default_factory=list)
+    client_id: str = ""
+    registration_date: datetime = field(default_factory=datetime.now)
+
+
+def client_data(index: int, services: int):
+    """Return the raw fields of one synthetic client (built outside the measurement)."""
+    moment = START + timedelta(minutes=index)
+    return (
+        f"Cliente Número {index}",
+        f"55{index:08d}",
+        f"cliente{index}@example.com",
+        f"CN{index}_{moment:%Y%m%d%H%M%S}",
+        moment,
+        [(DESCRIPTIONS[(index + n) % len(DESCRIPTIONS)], moment + timedelta(days=n)) for n in range(services)],
+    )
+
+
+def build_legacy_cliente(nombre, telefono, email, id_cliente, momento, servicios):
+    cliente = LegacyCliente(nombre, telefono, email)
+    cliente.id_cliente = id_cliente
+    cliente.fecha_registro = momento.strftime("%Y-%m-%d")
+    cliente.servicios = [LegacyServicio(d, f.strftime("%Y-%m-%d %H:%M:%S")) for d, f in servicios]
+    return cliente
+
+
+def build_cliente(nombre, telefono, email, id_cliente, momento, servicios):
+    cliente = Cliente.__new__(Cliente)
+    cliente.nombre, cliente.telefono, cliente.email, cliente.id_cliente = nombre, telefono, email, id_cliente
+    cliente.fecha_registro = momento.strftime("%Y-%m-%d")
+    cliente.servicios = [Servicio(d, f.strftime("%Y-%m-%d %H:%M:%S")) for d, f in servicios]
+    return cliente
+
+
+def build_legacy_client(name, phone, email, client_id, moment, services):
+    return LegacyClient(name, phone, email, [LegacyService(d, f) for d, f in services], client_id, moment)
+
+
+def build_client(name, phone, email, client_id, moment, services):
+    return Client(name, phone, email, [Service(d, f) for d, f in services], client_id, moment)
+
+
+def measure(builder, rows) -> float:
+    """Return the bytes allocated per client while keeping every client alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cache = {row[0]: builder(*row) for row in rows}
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The dict itself is the same in every case; only the values are reported
+    per_client = (after - before - sys.getsizeof(cache)) / len(rows)
+    del cache
+    return per_client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1_000_000, help="Clients kept in memory")
+    parser.add_argument("--services", type=int, default=3, help="Services per client")
+    args = parser.parse_args()
+
+    rows = [client_data(index, args.services) for index in range(args.clients)]
+
+    # (label, builder, label of the case it is compared with)
+    cases = [
+        ("legacy Cliente", build_legacy_cliente, None),
+        ("Cliente (compact)", build_cliente, "legacy Cliente"),
+        ("legacy Client", build_legacy_client, None),
+        ("Client (compact)", build_client, "legacy Client"),
+    ]
+
+    print(f"{args.clients:,} clients, {args.services} services each")
+    print(f"{'case':<20} {'bytes/client':>13} {'total MiB':>10} {'saving':>8}")
+    results = {}
+    for label, builder, baseline in cases:
+        results[label] = measure(builder, rows)
+        saving = 1 - results[label] / results[baseline] if baseline else 0.0
+        total = results[label] * args.clients / 2 ** 20
+        print(f"{label:<20} {results[label]:>13.0f} {total:>10.1f} {saving:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Normalization Microbenchmark
+============================
+
+Compares the original name normalization code with the shared engine in
+``axanet.normalization``:
+
+- legacy accented: seven ``str.replace`` calls plus an uncompiled ``re.sub``
+- legacy normalizar_nombre: builds and validates a throwaway ``Cliente``
+- translate (cold): ``normalize_accented`` without its memo cache
+- translate (memoized): ``normalize_accented`` on names already seen
+- legacy / new whitespace rule used by ``models.Client``
+
+Usage:
+    python benchmarks/bench_normalization.py [--names 10000] [--repeat 5]
+"""
+
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from axanet.modelos import Cliente
+from axanet.normalization import normalize_accented, normalize_whitespace
+
+
+FIRST_NAMES = ["José", "María", "Ana", "Luis", "Sofía", "Ángel", "Iñaki", "François", "Núria", "Raúl"]
+LAST_NAMES = ["García", "Núñez", "Pérez", "López", "Martínez", "Gómez", "Díaz", "Muñoz", "Castro", "Ruíz"]
+
+
+def legacy_accented(name: str) -> str:
+    normalized = name.lower()
+    replacements = {'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u', 'ñ': 'n', 'ç': 'c', ' ': '_'}
+    for original, replacement in replacements.items():
+        normalized = normalized.replace(original, replacement)
+    return re.sub(r'[^a-z0-9_]', '', normalized)
+
+
+def legacy_normalizar_nombre(name: str) -> str:
+    return Cliente(nombre=name, telefono="0000000000", email="temp@temp.com").nombre_normalizado
+
+
+def legacy_whitespace(name: str) -> str:
+    return re.sub(r"\s+", "_", name.strip().lower())
+
+
+def make_names(count: int) -> list:
+    rng = random.Random(42)
+    return [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}" for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=10000, help="Distinct names per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    names = make_names(args.names)
+    # Half of the names without accents, the common case for the bytes fast path
+    names += [name.encode("ascii", "ignore").decode("ascii") for name in names[::2]]
+    for name in names:
+        assert normalize_accented.__wrapped__(name) == legacy_accented(name)
+        assert normalize_whitespace.__wrapped__(name) == legacy_whitespace(name)
+
+    # Prime the memo so the "memoized" case measures cache hits
+    for name in names:
+        normalize_accented(name)
+        normalize_whitespace(name)
+
+    # (label, function, label of the case it is compared with)
+    cases = [
+        ("legacy accented", legacy_accented, None),
+        ("legacy normalizar_nombre", legacy_normalizar_nombre, None),
+        ("translate (cold)", normalize_accented.__wrapped__, "legacy accented"),
+        ("translate (memoized)", normalize_accented, "legacy normalizar_nombre"),
+        ("legacy whitespace", legacy_whitespace, None),
+        ("whitespace (cold)", normalize_whitespace.__wrapped__, "legacy whitespace"),
+        ("whitespace (memoized)", normalize_whitespace, "legacy whitespace"),
+    ]
+
+    print(f"{'case':<26} {'ns/call':>10} {'speedup':>9}  vs")
+    timings = {}
+    for label, function, baseline in cases:
+        best = min(timeit.repeat(lambda: [function(name) for name in names], number=1, repeat=args.repeat))
+        timings[label] = best / len(names) * 1e9
+        speedup = timings[baseline] / timings[label] if baseline else 1.0
+        print(f"{label:<26} {timings[label]:>10.0f} {speedup:>8.1f}x  {baseline or ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmark
+================
+
+Parses synthetic client files with the original parsers and with the
+single-pass parsers in ``modelos.Cliente`` and ``models.Client``:
+
+- legacy desde_archivo: strip/split, ``startswith`` chain, ``split(":")``
+  per field, ``rsplit`` per service, then the validating constructor
+- desde_archivo: single pass, validating constructor
+- desde_archivo (confiar): single pass, no re-validation
+- legacy / new from_file_content for the English file format
+
+The files are generated in memory (reading a million files from disk
+would measure the file system, not the parser). Every parser is checked
+against its legacy version on the generated data before timing.
+
+Usage:
+    python benchmarks/bench_parser.py [--files 1000000] [--services 3]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from axanet.exceptions import ValidationError
+from axanet.modelos import Cliente, Servicio
+from axanet.models import Client, Service
+
+
+DESCRIPTIONS = ["Instalación", "Soporte técnico", "Mantenimiento", "Consultoría (remota)", "Capacitación"]
+START = datetime(2024, 1, 1, 9, 0, 0)
+
+
+def legacy_desde_archivo(contenido_archivo: str) -> Cliente:
+    lineas = contenido_archivo.strip().split('\n')
+    nombre = ""
+    telefono = ""
+    email = ""
+    id_cliente = ""
+    fecha_registro = ""
+    servicios_seccion = False
+    servicios_encontrados = []
+    for linea in lineas:
+        linea = linea.strip()
+        if linea.startswith("Nombre:"):
+            nombre = linea.split(":", 1)[1].strip()
+        elif linea.startswith("ID_Cliente:"):
+            id_cliente = linea.split(":", 1)[1].strip()
+        elif linea.startswith("Telefono:"):
+            telefono = linea.split(":", 1)[1].strip()
+        elif linea.startswith("Correo:"):
+            email = linea.split(":", 1)[1].strip()
+        elif linea.startswith("FechaRegistro:"):
+            fecha_registro = linea.split(":", 1)[1].strip()
+        elif linea == "Servicios:":
+            servicios_seccion = True
+        elif servicios_seccion and linea.startswith("- "):
+            servicio_texto = linea[2:]
+            if "(" in servicio_texto and ")" in servicio_texto:
+                partes = servicio_texto.rsplit("(", 1)
+                if len(partes) == 2:
+                    descripcion = partes[0].strip()
+                    fecha_parte = partes[1].rstrip(")")
+                    servicios_encontrados.append((descripcion, fecha_parte))
+                else:
+                    servicios_encontrados.append((servicio_texto, None))
+            else:
+                servicios_encontrados.append((servicio_texto, None))
+    cliente = Cliente(nombre=nombre, telefono=telefono, email=email)
+    cliente.id_cliente = id_cliente
+    cliente.fecha_registro = fecha_registro
+    for descripcion, fecha in servicios_encontrados:
+        cliente.servicios.append(Servicio(descripcion, fecha))
+    return cliente
+
+
+def legacy_from_file_content(content: str) -> Client:
+    lines = content.strip().split('\n')
+    client_data = {}
+    services = []
+    in_services_section = False
+    for line in lines:
+        line = line.strip()
+        if line == "Services:":
+            in_services_section = True
+            continue
+        if in_services_section:
+            if line.startswith("- ") and " (" in line and line.endswith(")"):
+                service_text = line[2:]
+                last_paren = service_text.rfind("(")
+                if last_paren != -1:
+                    description = service_text[:last_paren].strip()
+                    date_str = service_text[last_paren+1:-1].strip()
+                    try:
+                        service_date = datetime.strptime(date_str, "%Y-%m-%d")
+                        services.append(Service(description=description, date_requested=service_date))
+                    except ValueError:
+                        continue
+            continue
+        if ":" in line:
+            key, value = line.split(":", 1)
+            key = key.strip()
+            value = value.strip()
+            if key == "Name":
+                client_data["name"] = value
+            elif key == "Client_ID":
+                client_data["client_id"] = value
+            elif key == "Phone":
+                client_data["phone"] = value
+            elif key == "Email":
+                client_data["email"] = value
+            elif key == "RegistrationDate":
+                try:
+                    client_data["registration_date"] = datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    client_data["registration_date"] = datetime.now()
+    for field in ["name", "phone", "email"]:
+        if field not in client_data:
+            raise ValidationError(field, "", f"Required field '{field}' not found in file")
+    client = Client(
+        name=client_data["name"],
+        phone=client_data["phone"],
+        email=client_data["email"],
+        client_id=client_data.get("client_id", ""),
+        registration_date=client_data.get("registration_date", datetime.now())
+    )
+    client.services = services
+    return client
+
+
+def make_files(count: int, services: int):
+    """Return (Spanish contents, English contents) for ``count`` synthetic clients."""
+    rng = random.Random(42)
+    spanish, english = [], []
+    for index in range(count):
+        moment = START + timedelta(minutes=index)
+        history = [
+            (rng.choice(DESCRIPTIONS), moment + timedelta(days=n, seconds=rng.randrange(86400)))
+            for n in range(services)
+        ]
+        spanish.append("\n".join([
+            f"Nombre: Cliente Número {index}",
+            f"ID_Cliente: CN_{moment:%Y%m%d%H%M%S}",
+            f"Telefono: 55{index:08d}",
+            f"Correo: cliente{index}@example.com",
+            f"FechaRegistro: {moment:%Y-%m-%d}",
+            "Servicios:",
+            *(f"- {description} ({date:%Y-%m-%d %H:%M:%S})" for description, date in history),
+        ]))
+        english.append("\n".join([
+            f"Name: Client Number {index}",
+            f"Client_ID: CN_{moment:%Y%m%d%H%M%S}",
+            f"Phone: 55{index:08d}",
+            f"Email: client{index}@example.com",
+            f"RegistrationDate: {moment:%Y-%m-%d}",
+            "Services:",
+            *(f"- {description} ({date:%Y-%m-%d})" for description, date in history),
+        ]))
+    return spanish, english
+
+
+def same_cliente(a: Cliente, b: Cliente) -> bool:
+    return a.a_campos_instantanea() == b.a_campos_instantanea()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1_000_000, help="Synthetic client files")
+    parser.add_argument("--services", type=int, default=3, help="Services per client")
+    args = parser.parse_args()
+
+    spanish, english = make_files(args.files, args.services)
+    for content in spanish[:1000]:
+        legacy = legacy_desde_archivo(content)
+        assert same_cliente(Cliente.desde_archivo(content), legacy)
+        assert same_cliente(Cliente.desde_archivo(content, confiar=True), legacy)
+    for content in english[:1000]:
+        assert Client.from_file_content(content) == legacy_from_file_content(content)
+
+    # (label, parser, contents, label of the case it is compared with)
+    cases = [
+        ("legacy desde_archivo", legacy_desde_archivo, spanish, None),
+        ("desde_archivo", Cliente.desde_archivo, spanish, "legacy desde_archivo"),
+        ("desde_archivo (confiar)", lambda c: Cliente.desde_archivo(c, confiar=True), spanish, "legacy desde_archivo"),
+        ("legacy from_file_content", legacy_from_file_content, english, None),
+        ("from_file_content", Client.from_file_content, english, "legacy from_file_content"),
+    ]
+
+    print(f"{args.files:,} files, {args.services} services each")
+    print(f"{'case':<26} {'us/file':>9} {'files/s':>11} {'speedup':>9}")
+    timings = {}
+    for label, parse, contents, baseline in cases:
+        started = time.perf_counter()
+        for content in contents:
+            parse(content)
+        timings[label] = (time.perf_counter() - started) / len(contents)
+        speedup = timings[baseline] / timings[label] if baseline else 1.0
+        print(f"{label:<26} {timings[label] * 1e6:>9.2f} {1 / timings[label]:>11,.0f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Client Store Benchmark Suite
+============================
+
+Runs the same measurements on ``ClienteManager`` and
+``services.ClientManager`` over synthetic stores of growing size (see
+``datagen.py``) and saves the results as JSON, so two runs can be
+compared and regressions spotted:
+
+- cold_load_s: open the manager and load every client into memory
+- rss_per_client_bytes: resident memory added by the loaded clients
+- lookup_hit_us / lookup_miss_us: point lookup of a stored / unknown name
+- list_s: list every client (warm)
+- search_us: ``search_clients`` of a name fragment, once its index exists
+  (``ClientManager`` only; ``ClienteManager`` has no search)
+- stats_s: compute the statistics from scratch
+- create_per_s / update_per_s: single creates and service additions,
+  with the default durable writes
+
+Read measurements keep the best of ``--repeat`` runs; writes run once.
+
+Each (manager, size) pair runs in a fresh process so memory and caches
+start empty. The writes are undone afterwards, so a data directory kept
+with ``--data-dir`` can be reused by later runs.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1000 10000 100000] [--managers es en]
+    python benchmarks/bench_suite.py --sizes 1000000 --data-dir /var/tmp/axanet-bench
+    python benchmarks/bench_suite.py --compare benchmarks/results/BASELINE.json
+
+Results go to ``benchmarks/results/<date>-<time>.json`` unless ``--output``
+is given. ``--compare`` prints the change of every metric against an
+earlier result file and exits with status 1 if one got worse by more than
+``--threshold`` (10% by default). Timings on a shared machine vary by a
+few percent between runs; compare runs made on the same machine.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from datagen import client_file, client_name, generate
+
+
+MANAGERS = {"es": "ClienteManager", "en": "ClientManager"}
+# Metric name -> whether a higher value is better
+METRICS = {
+    "cold_load_s": False,
+    "rss_per_client_bytes": False,
+    "lookup_hit_us": False,
+    "lookup_miss_us": False,
+    "list_s": False,
+    "search_us": False,
+    "search_index_s": False,
+    "stats_s": False,
+    "create_per_s": True,
+    "update_per_s": True,
+}
+RESULTS_DIRECTORY = Path(__file__).resolve().parent / "results"
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident memory of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current memory, which is what load measures anyway
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def per_call(function: Callable, arguments: List[Any]) -> float:
+    started = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - started) / len(arguments)
+
+
+def timed(function: Callable) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def best_of(repeat: int, measure: Callable[[int], float]) -> float:
+    """Fastest of ``repeat`` runs (``measure`` gets the run number): the least disturbed by other work."""
+    return min(measure(run) for run in range(repeat))
+
+
+# ----------------------------------------------------------------------
+# Worker: one manager and one store size, in its own process
+# ----------------------------------------------------------------------
+
+def run_worker(manager: str, directory: Path, clients: int, lookups: int, writes: int, seed: int,
+               repeat: int) -> Dict[str, Any]:
+    sampler = random.Random(seed)
+    stored = [client_name(index) for index in sampler.sample(range(clients), min(lookups, clients))]
+    # New unknown names in every run: a repeated miss may be answered by a negative cache
+    unknown = [[f"Nadie Conocido {run} {index}" for index in range(lookups)] for run in range(repeat)]
+    new_names = [client_name(index) for index in range(clients, clients + writes)]
+    updated = sampler.sample(range(clients), min(writes, clients))
+    results: Dict[str, Any] = {"clients": clients}
+
+    gc.collect()
+    baseline = rss_bytes()
+    if manager == "es":
+        from axanet.cliente_manager import ClienteManager
+        from axanet.config import DatabaseConfig
+
+        started = time.perf_counter()
+        gestor = ClienteManager(str(directory), DatabaseConfig(base_directory=str(directory)))
+        gestor.listar_todos_clientes()
+        results["cold_load_s"] = time.perf_counter() - started
+        get, find = gestor.obtener_cliente, gestor.buscar_cliente
+        list_all, search = gestor.listar_todos_clientes, None
+
+        def stats():
+            gestor._estadisticas = None
+            gestor.obtener_estadisticas()
+
+        def create(name):
+            gestor.crear_cliente(name, "5512345678", "nuevo@example.com", "Alta")
+
+        def update(index):
+            gestor.agregar_servicio_cliente(client_name(index), "Revisión")
+
+        close = gestor.cerrar
+    else:
+        os.environ["AXANET_DATA_DIR"] = str(directory)
+        from axanet.config import config_manager
+        from axanet.services import ClientManager
+
+        # The configuration was read when datagen imported the package
+        config_manager.reload_config()
+
+        started = time.perf_counter()
+        client_manager = ClientManager()
+        results["cold_load_s"] = time.perf_counter() - started
+        get, find = client_manager.get_client, client_manager.find_client
+        list_all, search = client_manager.get_all_clients, client_manager.search_clients
+
+        def stats():
+            client_manager._statistics = None
+            client_manager.get_statistics()
+
+        def create(name):
+            client_manager.create_client(name, "5512345678", "new@example.com", "Setup")
+
+        def update(index):
+            client_manager.update_client(client_name(index), "Review")
+
+        close = client_manager.close
+
+    gc.collect()
+    loaded = rss_bytes()
+    results["rss_per_client_bytes"] = (loaded - baseline) / clients if baseline and loaded else None
+
+    for name in stored:
+        get(name)
+    results["lookup_hit_us"] = best_of(repeat, lambda run: per_call(get, stored)) * 1e6
+    results["lookup_miss_us"] = best_of(repeat, lambda run: per_call(find, unknown[run])) * 1e6
+    results["list_s"] = best_of(repeat, lambda run: timed(list_all))
+    if search is not None:
+        queries = [name[-6:] for name in stored[:200]]
+        results["search_index_s"] = timed(lambda: search(queries[0]))
+        results["search_us"] = best_of(repeat, lambda run: per_call(search, queries)) * 1e6
+    results["stats_s"] = best_of(repeat, lambda run: timed(stats))
+    results["create_per_s"] = len(new_names) / timed(lambda: [create(name) for name in new_names])
+    results["update_per_s"] = len(updated) / timed(lambda: [update(index) for index in updated])
+    close()
+    restore(manager, directory, clients, new_names, updated)
+    return results
+
+
+def restore(manager: str, directory: Path, clients: int, created: List[str], updated: List[int]) -> None:
+    """Undo the worker's writes so the store matches the generated data again."""
+    from axanet.layout import ClientFileLayout
+    from axanet.storage import write_files_durably
+
+    layout = ClientFileLayout.open(directory, ".txt")
+    for index in range(clients, clients + len(created)):
+        layout.remove(client_file(manager, index)[0])
+    originals = [client_file(manager, index) for index in updated]
+    write_files_durably(((layout.path_for(name), content) for name, content in originals), sync=False)
+
+
+# ----------------------------------------------------------------------
+# Driver
+# ----------------------------------------------------------------------
+
+def prepare_store(data_directory: Path, manager: str, clients: int, shard_depth: int) -> Path:
+    """Return a store of ``clients`` synthetic clients, generating it unless it is already there."""
+    directory = data_directory / f"{manager}_{clients}_d{shard_depth}"
+    marker = directory / "generated.json"
+    if not marker.exists():
+        if directory.exists():
+            shutil.rmtree(directory)
+        print(f"  generating {clients:,} {MANAGERS[manager]} clients...", flush=True)
+        seconds = generate(directory, clients, manager, shard_depth)
+        marker.write_text(json.dumps({"clients": clients, "seconds": round(seconds, 1)}), encoding="utf-8")
+    return directory
+
+
+def run_case(manager: str, directory: Path, clients: int, args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        output = Path(handle.name)
+    try:
+        command = [
+            sys.executable, __file__, "--worker", manager, str(directory), str(clients), str(output),
+            "--lookups", str(args.lookups), "--writes", str(args.writes), "--seed", str(args.seed),
+            "--repeat", str(args.repeat)
+        ]
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if completed.returncode != 0:
+            return {"clients": clients, "error": completed.stderr.strip().splitlines()[-1:]}
+        return json.loads(output.read_text(encoding="utf-8"))
+    finally:
+        output.unlink(missing_ok=True)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_value(metric: str, value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if metric.endswith("_per_s") or metric == "rss_per_client_bytes":
+        return f"{value:,.0f}"
+    return f"{value:.4g}"
+
+
+def print_results(results: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+    for manager, sizes in results.items():
+        print(f"\n{MANAGERS[manager]}")
+        header = f"{'clients':>9}" + "".join(f" {metric:>20}" for metric in METRICS)
+        print(header)
+        for clients, values in sizes.items():
+            if "error" in values:
+                print(f"{int(clients):>9,} error: {values['error']}")
+                continue
+            print(f"{int(clients):>9,}" + "".join(f" {format_value(m, values.get(m)):>20}" for m in METRICS))
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print the change of every metric; return the number of regressions."""
+    regressions = 0
+    print(f"\nChange against {baseline.get('meta', {}).get('commit') or 'baseline'} "
+          f"(regression = worse by more than {threshold:.0%})")
+    for manager, sizes in current["results"].items():
+        for clients, values in sizes.items():
+            old_values = baseline.get("results", {}).get(manager, {}).get(clients)
+            if not old_values:
+                continue
+            for metric, higher_is_better in METRICS.items():
+                new, old = values.get(metric), old_values.get(metric)
+                if not new or not old:
+                    continue
+                change = new / old - 1
+                worse = -change if higher_is_better else change
+                flag = "REGRESSION" if worse > threshold else ""
+                regressions += bool(flag)
+                print(f"  {MANAGERS[manager]:<15} {int(clients):>9,} {metric:<22} "
+                      f"{format_value(metric, old):>12} -> {format_value(metric, new):>12} {change:>+8.1%} {flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Store sizes (clients)")
+    parser.add_argument("--managers", nargs="+", choices=sorted(MANAGERS), default=["es", "en"],
+                        help="es = ClienteManager, en = ClientManager")
+    parser.add_argument("--lookups", type=int, default=10000, help="Point lookups per case")
+    parser.add_argument("--writes", type=int, default=200, help="Creates and updates per case")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each read measurement (best is kept)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the sampled names")
+    parser.add_argument("--shard-depth", type=int, default=0, help="Layout of the generated stores")
+    parser.add_argument("--data-dir", type=Path, help="Keep generated stores here and reuse them")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/<date>-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier result file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    parser.add_argument("--worker", nargs=4, metavar=("MANAGER", "DIR", "CLIENTS", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        manager, directory, clients, output = args.worker
+        results = run_worker(manager, Path(directory), int(clients), args.lookups, args.writes, args.seed,
+                             args.repeat)
+        Path(output).write_text(json.dumps(results), encoding="utf-8")
+        return
+
+    data_directory = args.data_dir or Path(tempfile.mkdtemp(prefix="axanet-bench-"))
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    try:
+        for manager in args.managers:
+            for clients in args.sizes:
+                print(f"{MANAGERS[manager]}, {clients:,} clients", flush=True)
+                directory = prepare_store(data_directory, manager, clients, args.shard_depth)
+                results.setdefault(manager, {})[str(clients)] = run_case(manager, directory, clients, args)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_directory, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "lookups": args.lookups,
+            "writes": args.writes,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "shard_depth": args.shard_depth
+        },
+        "results": results
+    }
+    print_results(results)
+    output = args.output or RESULTS_DIRECTORY / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults saved to {output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
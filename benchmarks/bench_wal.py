@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Write-Ahead Log Benchmark
+=========================
+
+Measures the cost of adding one service to a client that already has many,
+with and without the write-ahead log (``wal_enabled``):
+
+- without the log every addition rewrites the whole client file, so the
+  cost grows with the number of services
+- with the log an addition is one appended record; the checkpoint at the
+  end (timed separately) folds all of them into the file at once
+
+Both managers are measured, each in its own temporary directory. Run with
+``--no-sync`` to leave out fsync and see the serialization cost alone.
+
+Usage:
+    python benchmarks/bench_wal.py [--services 10 1000 10000] [--updates 200] [--no-sync]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def seed_services(directory: str, services: int, spanish: bool) -> None:
+    """Write a client file with ``services`` services directly (much faster than adding them)."""
+    lines = ["Nombre: Cliente Antiguo", "ID_Cliente: CA_20240101090000", "Telefono: 5512345678",
+             "Correo: antiguo@example.com", "FechaRegistro: 2024-01-01", "Servicios:"] if spanish else \
+            ["Name: Old Client", "Client_ID: OC_20240101090000", "Phone: 5512345678",
+             "Email: old@example.com", "RegistrationDate: 2024-01-01", "Services:"]
+    stamp = "2024-01-01 09:00:00" if spanish else "2024-01-01"
+    lines.extend(f"- Servicio {index} ({stamp})" for index in range(services))
+    name = "cliente_antiguo.txt" if spanish else "old_client.txt"
+    Path(directory, name).write_text("\n".join(lines), encoding="utf-8")
+
+
+def run_spanish(directory: str, args, wal: bool):
+    from axanet.cliente_manager import ClienteManager
+    from axanet.config import DatabaseConfig
+
+    config = DatabaseConfig(base_directory=directory, wal_enabled=wal, durable_writes=not args.no_sync,
+                            wal_checkpoint_interval_seconds=0, wal_checkpoint_records=0)
+    gestor = ClienteManager(directory, config)
+    gestor.obtener_cliente("Cliente Antiguo")  # load it before timing
+    started = time.perf_counter()
+    for index in range(args.updates):
+        gestor.agregar_servicio_cliente("Cliente Antiguo", f"Nuevo {index}")
+    updates = time.perf_counter() - started
+    started = time.perf_counter()
+    gestor.cerrar()
+    return updates, time.perf_counter() - started
+
+
+def run_english(directory: str, args, wal: bool):
+    os.environ["AXANET_DATA_DIR"] = directory
+    os.environ["AXANET_WAL_ENABLED"] = str(wal)
+    os.environ["AXANET_DURABLE_WRITES"] = str(not args.no_sync)
+    os.environ["AXANET_WAL_CHECKPOINT_SECONDS"] = "0"
+    os.environ["AXANET_WAL_CHECKPOINT_RECORDS"] = "0"
+    from axanet.config import config_manager
+    config_manager.reload_config()
+    from axanet.services import ClientManager
+
+    manager = ClientManager()
+    manager.get_client("Old Client")  # load it before timing
+    started = time.perf_counter()
+    for index in range(args.updates):
+        manager.update_client("Old Client", f"New {index}")
+    updates = time.perf_counter() - started
+    started = time.perf_counter()
+    manager.close()
+    return updates, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", type=int, nargs="+", default=[10, 1000, 10000], help="Existing services")
+    parser.add_argument("--updates", type=int, default=200, help="Services added per run")
+    parser.add_argument("--no-sync", action="store_true", help="Turn durable_writes off")
+    args = parser.parse_args()
+
+    print(f"{args.updates} services added per run, durable_writes={'off' if args.no_sync else 'on'}")
+    print(f"{'manager':<15} {'services':>9} {'rewrite us/op':>14} {'wal us/op':>10} {'checkpoint ms':>14} {'speedup':>8}")
+    for label, run, spanish in (("ClienteManager", run_spanish, True), ("ClientManager", run_english, False)):
+        for services in args.services:
+            timings = {}
+            for wal in (False, True):
+                with tempfile.TemporaryDirectory() as directory:
+                    seed_services(directory, services, spanish)
+                    timings[wal] = run(directory, args, wal)
+            rewrite, wal_time = timings[False][0] / args.updates, timings[True][0] / args.updates
+            print(f"{label:<15} {services:>9,} {rewrite * 1e6:>14.1f} {wal_time * 1e6:>10.1f} "
+                  f"{timings[True][1] * 1e3:>14.1f} {rewrite / wal_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Synthetic Client Data
+=====================
+
+Writes a directory of client files in the format of either manager, so
+benchmarks can start from 1,000 or 1,000,000 clients without going
+through the managers' (validated, fsynced) create path.
+
+The data is deterministic: client ``i`` always has the same name, phone,
+email and services, so ``client_file`` can rebuild any file exactly (the
+benchmark suite uses it to undo its writes). Names mix accented and plain
+words; each client has 1 to 5 services spread over two years.
+
+Usage:
+    python benchmarks/datagen.py DIRECTORY [--clients 100000] [--format es|en] [--shard-depth 0]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from axanet.layout import ClientFileLayout
+from axanet.modelos import Cliente, Servicio
+from axanet.models import Client, Service
+from axanet.storage import write_files_durably
+
+
+FIRST_NAMES = ["Ana", "José", "María", "Luis", "Sofía", "Carlos", "Lucía", "Jorge", "Elena", "Raúl", "Marta", "Iván"]
+LAST_NAMES = ["García", "Pérez", "López", "Núñez", "Martínez", "Hernández", "Gómez", "Díaz", "Ruiz", "Ortega"]
+DESCRIPTIONS = ["Instalación", "Soporte técnico", "Mantenimiento", "Consultoría", "Capacitación", "Migración"]
+START = datetime(2024, 1, 1, 9, 0, 0)
+FORMATS = ("es", "en")
+
+
+def client_name(index: int) -> str:
+    """Name of synthetic client ``index`` (unique for every index)."""
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    return f"{first} {last} {index:07d}"
+
+
+def client_file(format: str, index: int) -> Tuple[str, str]:
+    """
+    Build the file of synthetic client ``index``.
+
+    Args:
+        format (str): "es" for ``ClienteManager``, "en" for ``ClientManager``
+        index (int): Client number
+
+    Returns:
+        Tuple[str, str]: Normalized name and file content
+    """
+    name = client_name(index)
+    phone = f"55{index % 100_000_000:08d}"
+    email = f"cliente{index}@example.com"
+    registered = START + timedelta(days=index % 365)
+    services = [
+        (DESCRIPTIONS[(index + k) % len(DESCRIPTIONS)],
+         registered + timedelta(days=(index * 13 + k * 29) % 365, minutes=(index * 7 + k) % 600))
+        for k in range(1 + index * 7 % 5)
+    ]
+    if format == "es":
+        cliente = Cliente(name, phone, email)
+        cliente.id_cliente = f"{name[0]}{name.split()[1][0]}_{registered:%Y%m%d}090000"
+        cliente.fecha_registro = f"{registered:%Y-%m-%d}"
+        cliente.servicios = [Servicio(description, f"{date:%Y-%m-%d %H:%M:%S}") for description, date in services]
+        return cliente.nombre_normalizado, cliente.a_formato_archivo()
+    client = Client(
+        name, phone, email,
+        services=[Service(description, date) for description, date in services],
+        client_id=f"{name[0]}{name.split()[1][0]}_{registered:%Y%m%d}090000",
+        registration_date=registered
+    )
+    return client.normalized_name, client.to_file_format()
+
+
+def iter_client_files(format: str, start: int, stop: int) -> Iterator[Tuple[str, str]]:
+    for index in range(start, stop):
+        yield client_file(format, index)
+
+
+def generate(directory: Path, clients: int, format: str = "es", shard_depth: int = 0) -> float:
+    """
+    Write ``clients`` synthetic client files into ``directory``.
+
+    Files are not fsynced: this is test data, and syncing a million
+    files would dominate the run.
+
+    Returns:
+        float: Seconds taken
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format: {format}")
+    started = time.perf_counter()
+    directory.mkdir(parents=True, exist_ok=True)
+    layout = ClientFileLayout.open(directory, ".txt", shard_depth)
+    for start in range(0, clients, 1000):
+        failures = write_files_durably(
+            ((layout.path_for(name), content)
+             for name, content in iter_client_files(format, start, min(start + 1000, clients))),
+            sync=False
+        )
+        if failures:
+            raise next(iter(failures.values()))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path, help="Data directory to fill")
+    parser.add_argument("--clients", type=int, default=100000, help="Number of clients")
+    parser.add_argument("--format", choices=FORMATS, default="es", help="es = ClienteManager, en = ClientManager")
+    parser.add_argument("--shard-depth", type=int, default=0, help="Hashed subdirectory levels")
+    args = parser.parse_args()
+
+    seconds = generate(args.directory, args.clients, args.format, args.shard_depth)
+    print(f"{args.clients:,} clients written to {args.directory} in {seconds:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Fault Injection Test for Client File Writes
+===========================================
+
+Checks that a crash or an I/O error in the middle of a write never leaves a
+torn (truncated or half-written) client file, for both ``ClienteManager``
+and ``services.ClientManager``:
+
+- kill: a child process keeps adding services to a few clients from several
+  threads (so writes go through group commits) and is killed with SIGKILL
+  at a random moment. Every client file must then parse, round-trip
+  byte for byte, hold the services "Servicio 0..n-1" with no gaps, and hold
+  at least as many services as the child had reported written. The next
+  round starts a new child on the same directory
+- error: ``os.write`` is made to write part of the data and then fail with
+  ENOSPC. The update must raise, and the file must keep its previous
+  content with no temporary file left behind
+
+``--legacy`` runs the kill rounds with the old in-place ``write_text``
+instead, which shows the torn files this test is meant to catch.
+
+``--wal`` adds services through the write-ahead log; after each kill the
+log is replayed (by opening and closing a manager) before the checks, so
+the test also covers torn log records and checkpoints cut short.
+
+``--shard-depth`` stores the client files in hashed subdirectories
+(``layout.ClientFileLayout``) instead of directly in the data directory.
+
+Usage:
+    python benchmarks/fault_injection.py [--rounds 20] [--threads 4] [--legacy] [--wal] [--shard-depth 2]
+"""
+
+import argparse
+import errno
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def client_names(threads: int):
+    return [f"Cliente Falla {index}" for index in range(threads)]
+
+
+# --- child process --------------------------------------------------------
+
+def client_files(data_dir: str):
+    """Every client file, whatever the directory layout."""
+    return sorted(Path(data_dir).rglob("*.txt"))
+
+
+def open_manager(kind: str, data_dir: str, wal: bool = False, checkpoint_seconds: int = 1, shard_depth: int = 0):
+    """Return (find, create, add service, services of, close) for the chosen manager."""
+    if kind == "spanish":
+        from axanet.cliente_manager import ClienteManager
+        from axanet.config import DatabaseConfig
+
+        # Short checkpoint interval so kills also land in the middle of checkpoints
+        config = DatabaseConfig(base_directory=data_dir, wal_enabled=wal,
+                                wal_checkpoint_interval_seconds=checkpoint_seconds, shard_depth=shard_depth)
+        gestor = ClienteManager(data_dir, config)
+        return (gestor.buscar_cliente, gestor.crear_cliente, gestor.agregar_servicio_cliente,
+                lambda cliente: cliente.servicios, gestor.cerrar)
+
+    os.environ["AXANET_DATA_DIR"] = data_dir
+    os.environ["AXANET_WAL_ENABLED"] = "true" if wal else "false"
+    os.environ["AXANET_WAL_CHECKPOINT_SECONDS"] = str(checkpoint_seconds)
+    os.environ["AXANET_SHARD_DEPTH"] = str(shard_depth)
+    from axanet.config import config_manager
+    config_manager.reload_config()
+    from axanet.services import ClientManager
+
+    manager = ClientManager()
+    return (manager.find_client, manager.create_client, manager.update_client,
+            lambda client: client.services, manager.close)
+
+
+def run_child(kind: str, data_dir: str, threads: int, legacy: bool, wal: bool, shard_depth: int) -> None:
+    """Write until killed, printing "name<TAB>services" after every completed write."""
+    if legacy:
+        from axanet import storage
+
+        def write_in_place(self, path, content):
+            Path(path).write_text(content, encoding=self.encoding)
+
+        storage.GroupCommitter.write = write_in_place
+
+    find, create, add_service, services_of, _ = open_manager(kind, data_dir, wal, shard_depth=shard_depth)
+    output = threading.Lock()
+
+    def writer(name: str) -> None:
+        client = find(name)
+        if client is None:
+            client = create(name, "5512345678", "falla@example.com", "Servicio 0")
+        count = len(services_of(client))
+        while True:
+            add_service(name, f"Servicio {count}")
+            count += 1
+            with output:
+                sys.stdout.write(f"{name}\t{count}\n")
+                sys.stdout.flush()
+
+    for name in client_names(threads):
+        threading.Thread(target=writer, args=(name,), daemon=True).start()
+    threading.Event().wait()
+
+
+# --- checks ---------------------------------------------------------------
+
+def replay(kind: str, data_dir: str) -> None:
+    """Replay the write-ahead log into the client files from a fresh process."""
+    subprocess.run([sys.executable, __file__, "--replay", kind, data_dir], check=True)
+
+
+def check_file(kind: str, path: Path):
+    """Return (client name, service count) or raise ValueError if the file is torn."""
+    from axanet.modelos import Cliente
+    from axanet.models import Client
+
+    content = path.read_text(encoding="utf-8")
+    try:
+        if kind == "spanish":
+            client = Cliente.desde_archivo(content)
+            name, services, round_trip = client.nombre, [s.descripcion for s in client.servicios], client.a_formato_archivo()
+        else:
+            client = Client.from_file_content(content)
+            name, services, round_trip = client.name, [s.description for s in client.services], client.to_file_format()
+    except Exception as e:
+        raise ValueError(f"{path.name}: does not parse ({e}); {len(content)} chars")
+    if round_trip != content:
+        raise ValueError(f"{path.name}: does not round-trip ({len(content)} chars on disk, {len(round_trip)} expected)")
+    if services != [f"Servicio {index}" for index in range(len(services))]:
+        raise ValueError(f"{path.name}: services are not consecutive")
+    return name, len(services)
+
+
+def kill_rounds(kind: str, data_dir: str, args) -> bool:
+    torn = []
+    lost = []
+    writes = 0
+    command = [sys.executable, __file__, "--child", kind, data_dir, "--threads", str(args.threads),
+               "--shard-depth", str(args.shard_depth)]
+    if args.legacy:
+        command.append("--legacy")
+    if args.wal:
+        command.append("--wal")
+
+    for round_number in range(args.rounds):
+        acknowledged = {}
+        acknowledgements = [0]
+        child = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+
+        def read_acks():
+            for line in child.stdout:
+                name, count = line.rstrip("\n").split("\t")
+                acknowledged[name] = int(count)
+                acknowledgements[0] += 1
+
+        reader = threading.Thread(target=read_acks)
+        reader.start()
+        time.sleep(random.uniform(args.min_delay, args.max_delay))
+        child.send_signal(signal.SIGKILL)
+        child.wait()
+        reader.join()
+        writes += acknowledgements[0]
+        if args.wal:
+            replay(kind, data_dir)
+
+        found = {}
+        for path in client_files(data_dir):
+            try:
+                name, count = check_file(kind, path)
+                found[name] = count
+            except ValueError as e:
+                torn.append(f"round {round_number}: {e}")
+                path.unlink()
+        for name, count in acknowledged.items():
+            if found.get(name, 0) < count:
+                lost.append(f"round {round_number}: {name} has {found.get(name, 0)} services, {count} were written")
+
+    temp_files = len(list(Path(data_dir).rglob(".*.tmp")))
+    ok = not torn and not lost
+    print(f"{kind} kill: {args.rounds} rounds, {writes:,} acknowledged writes -> {'OK' if ok else 'FAILED'}")
+    print(f"  torn files: {len(torn)}, lost writes: {len(lost)}, leftover temporary files: {temp_files}")
+    for problem in (torn + lost)[:10]:
+        print(f"  {problem}")
+    return ok
+
+
+def error_round(kind: str, data_dir: str, wal: bool, shard_depth: int) -> bool:
+    """Make os.write fail halfway through an update and check nothing is torn."""
+    _, create, add_service, _, close = open_manager(kind, data_dir, wal, shard_depth=shard_depth)
+    name = "Cliente Error"
+    create(name, "5512345678", "error@example.com", "Servicio 0")
+    for index in range(1, 50):
+        add_service(name, f"Servicio {index}")
+    close()
+    path = next(path for path in client_files(data_dir) if check_file(kind, path)[0] == name)
+    before = path.read_bytes()
+
+    # No background checkpoints: with the log, the files must come from replay alone
+    _, _, add_service, _, close = open_manager(kind, data_dir, wal, checkpoint_seconds=0, shard_depth=shard_depth)
+    real_write = os.write
+    calls = []
+
+    def failing_write(fd, data):
+        calls.append(fd)
+        if len(calls) == 1:
+            return real_write(fd, bytes(data)[:len(data) // 2])
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+    os.write = failing_write
+    try:
+        add_service(name, "Servicio 50")
+        raised = False
+    except Exception:
+        raised = True
+    finally:
+        os.write = real_write
+    unchanged = path.read_bytes() == before
+
+    # The same service again: later writes (and, with the log, its replay) must still work
+    add_service(name, "Servicio 50")
+    if wal:
+        # As if the process crashed here: the records are only in the log
+        replay(kind, data_dir)
+    else:
+        close()
+    try:
+        services = check_file(kind, path)[1]
+    except ValueError as e:
+        print(f"  {e}")
+        services = None
+    temp_files = list(Path(data_dir).rglob(".*.tmp"))
+    ok = raised and unchanged and services == 51 and not temp_files and len(calls) >= 2
+    print(f"{kind} error: update raised {raised}, file unchanged {unchanged}, services after retry {services}, "
+          f"temporary files left {len(temp_files)} -> {'OK' if ok else 'FAILED'}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20, help="Kill rounds per manager")
+    parser.add_argument("--threads", type=int, default=4, help="Writer threads (one client each) in the child")
+    parser.add_argument("--min-delay", type=float, default=0.3, help="Shortest time before the kill (s)")
+    parser.add_argument("--max-delay", type=float, default=1.0, help="Longest time before the kill (s)")
+    parser.add_argument("--legacy", action="store_true", help="Write files in place like the old code")
+    parser.add_argument("--wal", action="store_true", help="Add services through the write-ahead log")
+    parser.add_argument("--shard-depth", type=int, default=0, help="Hashed directory levels for client files")
+    parser.add_argument("--child", nargs=2, metavar=("KIND", "DIR"), help=argparse.SUPPRESS)
+    parser.add_argument("--replay", nargs=2, metavar=("KIND", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.replay:
+        open_manager(args.replay[0], args.replay[1], wal=True)[-1]()
+        return
+    if args.child:
+        run_child(args.child[0], args.child[1], args.threads, args.legacy, args.wal, args.shard_depth)
+        return
+
+    results = []
+    # The two managers use different file formats, so each gets its own directory
+    for kind in ("spanish", "english"):
+        with tempfile.TemporaryDirectory() as data_dir:
+            results.append(kill_rounds(kind, data_dir, args))
+        if not args.legacy:
+            with tempfile.TemporaryDirectory() as data_dir:
+                results.append(error_round(kind, data_dir, args.wal, args.shard_depth))
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Concurrency Stress Test
+=======================
+
+Runs many writer threads against ``ClienteManager`` and
+``services.ClientManager`` at the same time and checks that no update is
+lost:
+
+- every thread adds services to a small set of shared ("hot") clients,
+  which is where read-modify-write races show up. The cache is smaller
+  than the hot set, so clients keep being evicted and read back from disk
+  while other threads change them
+- all threads race to create the same new clients; exactly one must win
+- every thread also creates, updates and deletes clients of its own
+- readers look clients up in a loop while the writers run (pausing 1 ms
+  between rounds; busy-looping readers would only measure the GIL)
+- listers walk the whole store in a loop (also pausing), loading every
+  client not in the cache in parallel. A walk that overlaps an update must not put the
+  stale copy it read back in the cache, nor bring back a deleted client
+
+At the end each hot client must have exactly one service per successful
+add, both in memory and in the files read back by a fresh manager.
+
+``--wal`` adds services through the write-ahead log, with checkpoints
+every ``--checkpoint-records`` records so they run during the test.
+
+``--watch`` runs the change watcher during the test; every change it sees
+is the manager's own, so it must refresh nothing.
+
+``--migrate-to N`` starts the data directory flat and moves it to shard
+depth N in the background while the writers run (online migration).
+
+Usage:
+    python benchmarks/stress_concurrency.py [--threads 16] [--operations 200] [--hot 4] [--listers 2] [--cache-capacity 2] [--wal] [--watch] [--migrate-to 2]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def run_threads(count: int, target, background=()) -> float:
+    """Start ``count`` writer threads and the ``background`` loops together; return the writers' wall time."""
+    stop = threading.Event()
+    start = threading.Barrier(count + len(background) + 1)
+    errors = []
+
+    def wrap(function, *args):
+        try:
+            start.wait()
+            function(*args)
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=wrap, args=(target, index)) for index in range(count)]
+    reader_threads = [threading.Thread(target=wrap, args=(loop, stop)) for loop in background]
+    for thread in writers + reader_threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+def stress_cliente_manager(data_dir: str, args) -> bool:
+    from axanet.cliente_manager import ClienteManager
+    from axanet.config import DatabaseConfig
+    from axanet.excepciones import ClienteExisteError
+
+    config = DatabaseConfig(base_directory=data_dir, cache_capacity=args.cache_capacity,
+                            wal_enabled=args.wal, wal_checkpoint_records=args.checkpoint_records,
+                            watch_enabled=args.watch)
+    gestor = ClienteManager(data_dir, config)
+    hot = [f"Cliente Compartido {n}" for n in range(args.hot)]
+    for nombre in hot:
+        gestor.crear_cliente(nombre, "5512345678", "hot@example.com", "Alta")
+    if args.migrate_to:
+        gestor.migrar_directorio(args.migrate_to, en_segundo_plano=True)
+    added = [0] * args.threads
+    won = [0] * args.threads
+
+    def writer(index: int) -> None:
+        propio = f"Cliente Hilo {index}"
+        for operation in range(args.operations):
+            gestor.agregar_servicio_cliente(hot[operation % len(hot)], f"Servicio {index}-{operation}")
+            added[index] += 1
+            if operation % 10 == 0:
+                try:
+                    gestor.crear_cliente(f"Cliente Disputado {operation}", "5512345678", "d@example.com", "Alta")
+                    won[index] += 1
+                except ClienteExisteError:
+                    pass
+            if operation % 20 == 0:
+                gestor.crear_cliente(propio, "5512345678", f"h{index}@example.com", "Alta")
+                gestor.agregar_servicio_cliente(propio, "Extra")
+                gestor.eliminar_cliente(propio)
+
+    def reader(stop: threading.Event) -> None:
+        while not stop.is_set():
+            for nombre in hot:
+                gestor.obtener_cliente(nombre)
+            time.sleep(0.001)
+
+    def lister(stop: threading.Event) -> None:
+        while not stop.is_set():
+            for _ in gestor._iterar_todos_clientes():
+                pass
+            time.sleep(0.001)
+
+    elapsed = run_threads(args.threads, writer, [reader] * args.readers + [lister] * args.listers)
+    expected = 1 + sum(added) // len(hot)
+    in_memory = [len(gestor.obtener_cliente(nombre).servicios) for nombre in hot]
+    watcher = gestor.obtener_estadisticas_observador()
+    gestor.cerrar()
+    reopened = ClienteManager(data_dir, config)
+    on_disk = [len(reopened.obtener_cliente(nombre).servicios) for nombre in hot]
+    leftovers = [f"Cliente Hilo {index}" for index in range(args.threads)
+                 if reopened.buscar_cliente(f"Cliente Hilo {index}") is not None]
+    reopened.cerrar()
+    return report("ClienteManager", elapsed, sum(added), expected, in_memory, on_disk, leftovers, sum(won), watcher, args)
+
+
+def stress_client_manager(data_dir: str, args) -> bool:
+    os.environ["AXANET_DATA_DIR"] = data_dir
+    os.environ["AXANET_CACHE_CAPACITY"] = str(args.cache_capacity)
+    os.environ["AXANET_WAL_ENABLED"] = str(args.wal)
+    os.environ["AXANET_WAL_CHECKPOINT_RECORDS"] = str(args.checkpoint_records)
+    os.environ["AXANET_WATCH_ENABLED"] = str(args.watch)
+    from axanet.config import config_manager
+    config_manager.reload_config()
+    from axanet.exceptions import ClientExistsError
+    from axanet.services import ClientManager
+
+    manager = ClientManager()
+    hot = [f"Shared Client {n}" for n in range(args.hot)]
+    for name in hot:
+        manager.create_client(name, "5512345678", "hot@example.com", "Setup")
+    if args.migrate_to:
+        manager.migrate_layout(args.migrate_to, background=True)
+    added = [0] * args.threads
+    won = [0] * args.threads
+
+    def writer(index: int) -> None:
+        own = f"Thread Client {index}"
+        for operation in range(args.operations):
+            manager.update_client(hot[operation % len(hot)], f"Service {index}-{operation}")
+            added[index] += 1
+            if operation % 10 == 0:
+                try:
+                    manager.create_client(f"Contested Client {operation}", "5512345678", "d@example.com", "Setup")
+                    won[index] += 1
+                except ClientExistsError:
+                    pass
+            if operation % 20 == 0:
+                manager.create_client(own, "5512345678", f"t{index}@example.com", "Setup")
+                manager.update_client(own, "Extra")
+                manager.delete_client(own)
+
+    def reader(stop: threading.Event) -> None:
+        while not stop.is_set():
+            for name in hot:
+                manager.get_client(name)
+            time.sleep(0.001)
+
+    def lister(stop: threading.Event) -> None:
+        while not stop.is_set():
+            for _ in manager._iter_clients():
+                pass
+            time.sleep(0.001)
+
+    elapsed = run_threads(args.threads, writer, [reader] * args.readers + [lister] * args.listers)
+    expected = 1 + sum(added) // len(hot)
+    in_memory = [len(manager.get_client(name).services) for name in hot]
+    watcher = manager.get_watcher_statistics()
+    manager.close()
+    reopened = ClientManager()
+    on_disk = [len(reopened.get_client(name).services) for name in hot]
+    leftovers = [f"Thread Client {index}" for index in range(args.threads)
+                 if reopened.client_exists(f"Thread Client {index}")]
+    reopened.close()
+    return report("ClientManager", elapsed, sum(added), expected, in_memory, on_disk, leftovers, sum(won), watcher, args)
+
+
+def report(label, elapsed, updates, expected, in_memory, on_disk, leftovers, creates_won, watcher, args) -> bool:
+    contested = (args.operations + 9) // 10
+    ok = all(count == expected for count in in_memory + on_disk) and not leftovers and creates_won == contested
+    # A WAL checkpoint rewrites files itself, which the watcher may reload once
+    ok = ok and (not watcher or args.wal or watcher["invalidations"] == 0) and not watcher.get("errors")
+    print(f"{label}: {updates} updates in {elapsed:.2f} s ({updates / elapsed:,.0f}/s) -> {'OK' if ok else 'FAILED'}")
+    print(f"  services per hot client: expected {expected}, memory {in_memory}, disk {on_disk}")
+    print(f"  contested creates won: {creates_won} (expected {contested})")
+    if leftovers:
+        print(f"  clients that should have been deleted: {leftovers}")
+    if watcher:
+        print(f"  watcher: {watcher}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16, help="Writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads")
+    parser.add_argument("--listers", type=int, default=2, help="Threads walking every client")
+    parser.add_argument("--operations", type=int, default=200, help="Updates per writer thread")
+    parser.add_argument("--hot", type=int, default=4, help="Clients shared by every writer")
+    parser.add_argument("--cache-capacity", type=int, default=2, help="Cache size (0 = unbounded)")
+    parser.add_argument("--wal", action="store_true", help="Add services through the write-ahead log")
+    parser.add_argument("--checkpoint-records", type=int, default=200, help="Pending WAL records per checkpoint")
+    parser.add_argument("--watch", action="store_true", help="Run the change watcher during the test")
+    parser.add_argument("--migrate-to", type=int, default=0, help="Shard depth to migrate to while writers run")
+    args = parser.parse_args()
+    if args.operations % args.hot:
+        parser.error("--operations must be a multiple of --hot")
+
+    # The two managers use different file formats, so each gets its own directory
+    with tempfile.TemporaryDirectory() as spanish_dir, tempfile.TemporaryDirectory() as english_dir:
+        results = [stress_cliente_manager(spanish_dir, args), stress_client_manager(english_dir, args)]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
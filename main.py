@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import argparse
 import sys
 import os
 from pathlib import Path
@@ -7,9 +8,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from axanet.cliente_manager import ClienteManager
+from axanet.config import DatabaseConfig
+from axanet.exporter import export_clients
+from axanet.importer import import_file
 from axanet.excepciones import (
     ClienteNoEncontradoError, 
     ClienteExisteError,
+    ErrorArchivo,
     ErrorValidacion
 )
 
@@ -260,7 +265,138 @@ class AplicacionAxanet:
                 print("💡 Intente nuevamente o contacte al soporte técnico")
 
 
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Sistema de Gestión de Clientes Axanet. Sin comando se abre el menú interactivo."
+    )
+    subcomandos = parser.add_subparsers(dest="comando")
+    
+    importar = subcomandos.add_parser("importar", help="Importar clientes o servicios desde CSV o JSONL")
+    importar.add_argument("archivo", help="Archivo CSV (con encabezados) o JSONL")
+    importar.add_argument("--formato", choices=["csv", "jsonl"], help="Formato del archivo (por defecto según la extensión)")
+    importar.add_argument("--modo", choices=["clientes", "servicios"], default="clientes",
+                          help="clientes: nombre, telefono, email, servicio; servicios: nombre, servicio")
+    importar.add_argument("--lote", type=int, default=1000, help="Filas escritas por lote (default: 1000)")
+    importar.add_argument("--directorio", default="axanet_clients_data", help="Directorio de datos")
+    
+    exportar = subcomandos.add_parser("exportar", help="Exportar todos los clientes a CSV, JSONL o formato columnar")
+    exportar.add_argument("archivo", help="Archivo de salida (.csv, .jsonl o .axcol)")
+    exportar.add_argument("--formato", choices=["csv", "jsonl", "columnar"], help="Formato de salida (por defecto según la extensión)")
+    exportar.add_argument("--por-servicio", action="store_true", help="Una fila por servicio en lugar de una por cliente")
+    exportar.add_argument("--despues-de", help="Cursor: exportar solo clientes cuyo nombre normalizado sea mayor")
+    exportar.add_argument("--punto-control", help="Archivo donde se guarda el cursor para poder reanudar")
+    exportar.add_argument("--reanudar", action="store_true", help="Continuar desde el último punto de control")
+    exportar.add_argument("--directorio", default="axanet_clients_data", help="Directorio de datos")
+    
+    migrar = subcomandos.add_parser("migrar-directorio",
+                                    help="Repartir los archivos de clientes en subdirectorios por hash (o volver al directorio plano)")
+    migrar.add_argument("--profundidad", type=int, required=True,
+                        help="Niveles de subdirectorios: 0 = plano, 2 = ab/cd/<nombre>.txt")
+    migrar.add_argument("--directorio", default="axanet_clients_data", help="Directorio de datos")
+    
+    return parser
+
+
+def importar_archivo(argumentos) -> int:
+    ruta = Path(argumentos.archivo)
+    if not ruta.is_file():
+        print(f"No existe el archivo: {ruta}", file=sys.stderr)
+        return 1
+    
+    # Cache acotada al tamaño del lote para que la memoria no crezca con el archivo
+    configuracion = DatabaseConfig(base_directory=argumentos.directorio, cache_capacity=argumentos.lote)
+    gestor = ClienteManager(argumentos.directorio, configuracion)
+    
+    def mostrar_error(linea, mensaje):
+        print(f"  Línea {linea}: {mensaje}", file=sys.stderr)
+    
+    def mostrar_progreso(reporte):
+        print(
+            f"  {reporte.rows_read} filas | {reporte.rows_per_second:,.0f} filas/s | "
+            f"escritas: {reporte.written} | duplicadas: {reporte.duplicates} | errores: {reporte.errors}",
+            file=sys.stderr
+        )
+    
+    try:
+        reporte = import_file(
+            gestor,
+            ruta,
+            file_format=argumentos.formato,
+            mode="clients" if argumentos.modo == "clientes" else "services",
+            batch_size=argumentos.lote,
+            on_error=mostrar_error,
+            on_progress=mostrar_progreso
+        )
+    finally:
+        gestor.cerrar()
+    
+    print(f"Importación terminada en {reporte.elapsed_seconds:.1f} s: {reporte.written} escritas, "
+          f"{reporte.duplicates} duplicadas, {reporte.errors} errores")
+    return 0 if reporte.errors == 0 else 1
+
+
+def exportar_archivo(argumentos) -> int:
+    if argumentos.reanudar and not argumentos.punto_control:
+        print("--reanudar requiere --punto-control", file=sys.stderr)
+        return 1
+    
+    gestor = ClienteManager(argumentos.directorio)
+    
+    def mostrar_progreso(reporte):
+        print(
+            f"  {reporte.clients} clientes | {reporte.rows_per_second:,.0f} filas/s | cursor: {reporte.cursor}",
+            file=sys.stderr
+        )
+    
+    try:
+        reporte = export_clients(
+            gestor,
+            Path(argumentos.archivo),
+            file_format=argumentos.formato,
+            explode=argumentos.por_servicio,
+            after=argumentos.despues_de,
+            checkpoint_path=Path(argumentos.punto_control) if argumentos.punto_control else None,
+            resume=argumentos.reanudar,
+            on_progress=mostrar_progreso
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        gestor.cerrar()
+    
+    print(f"Exportación terminada en {reporte.elapsed_seconds:.1f} s: {reporte.rows} filas, "
+          f"último cursor: {reporte.cursor}")
+    return 0
+
+
+def migrar_directorio(argumentos) -> int:
+    # Una aplicación en marcha puede migrar sin detenerse con ClienteManager.migrar_directorio()
+    gestor = ClienteManager(argumentos.directorio)
+    
+    def mostrar_progreso(movidos, total):
+        print(f"  {movidos}/{total} archivos movidos", file=sys.stderr)
+    
+    try:
+        movidos = gestor.migrar_directorio(argumentos.profundidad, al_avanzar=mostrar_progreso)
+    except (ErrorValidacion, ErrorArchivo) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        gestor.cerrar()
+    
+    print(f"Migración terminada: {movidos} archivos movidos a profundidad {argumentos.profundidad}")
+    return 0
+
+
 def main():
+    argumentos = crear_parser().parse_args()
+    if argumentos.comando == "importar":
+        sys.exit(importar_archivo(argumentos))
+    if argumentos.comando == "exportar":
+        sys.exit(exportar_archivo(argumentos))
+    if argumentos.comando == "migrar-directorio":
+        sys.exit(migrar_directorio(argumentos))
 
     try:
         aplicacion = AplicacionAxanet()
@@ -0,0 +1,220 @@
+"""
+Asyncio Client Manager for Axanet Client Manager
+================================================
+
+This module lets an asyncio application (for example a web service) use
+the client database without blocking its event loop.
+
+Classes:
+--------
+- AsyncClientManager: ``async`` version of ``services.ClientManager``
+
+Educational Notes for Students:
+-------------------------------
+1. An event loop runs every request on one thread; a single blocking
+   ``read_text`` or ``fsync`` stalls all of them
+2. ``loop.run_in_executor`` moves blocking calls to a thread pool and gives
+   back an awaitable, so the loop keeps serving other requests meanwhile
+3. The pool has a fixed number of threads and a semaphore limits how many
+   jobs wait for it, so a burst of requests queues as cheap coroutines
+   instead of as an unbounded backlog of executor jobs
+4. When many requests ask for the same client at once, only the first one
+   reads the file; the rest await the same future ("request coalescing")
+5. Cache hits are answered directly on the loop: a dictionary lookup is
+   cheaper than a trip to another thread
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import get_config
+from .exceptions import ClientNotFoundError
+from .models import Client
+from .normalization import normalize_whitespace
+from .services import ClientManager
+
+
+class AsyncClientManager:
+    """
+    Asyncio front end for ``ClientManager``.
+
+    Every blocking operation runs on a bounded thread pool. Reads of the
+    same client that overlap in time share a single load.
+
+    Args:
+        manager (ClientManager): Manager to wrap (see ``open`` to build one
+            without blocking)
+        max_workers (int, optional): Pool size; defaults to
+            ``DatabaseConfig.async_workers``
+
+    Example:
+        async with await AsyncClientManager.open() as clients:
+            client = await clients.get_client("Ana García")
+
+    Educational Notes:
+        - Writes run side by side on the pool; ``ClientManager`` serializes
+          the ones that touch the same client with its striped locks
+        - A waiting reader is protected with ``asyncio.shield``: if one
+          request is cancelled, the shared load keeps going for the others
+    """
+
+    def __init__(self, manager: ClientManager, max_workers: Optional[int] = None):
+        """Initialize the async manager around an existing ``ClientManager``."""
+        if max_workers is None:
+            max_workers = get_config().database.async_workers
+        if max_workers <= 0:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self._manager = manager
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="axanet-async")
+        self._slots = asyncio.Semaphore(max_workers)
+        self._pending_reads: Dict[str, asyncio.Future] = {}
+        self._reads = 0
+        self._coalesced_reads = 0
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    async def open(cls, max_workers: Optional[int] = None) -> 'AsyncClientManager':
+        """
+        Build a ``ClientManager`` on a worker thread and wrap it.
+
+        Returns:
+            AsyncClientManager: Ready-to-use manager
+
+        Educational Note:
+            Loading the cache at startup reads every client file, so even
+            construction is moved off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        manager = await loop.run_in_executor(None, ClientManager)
+        return cls(manager, max_workers)
+
+    @property
+    def manager(self) -> ClientManager:
+        """The wrapped synchronous manager."""
+        return self._manager
+
+    async def _run(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call on the pool, waiting for a free slot first."""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def create_client(self, name: str, phone: str, email: str, first_service: str) -> Client:
+        """
+        Create a new client with initial service.
+
+        Raises:
+            ClientExistsError: If client already exists
+            ValidationError: If client data is invalid
+            FileOperationError: If file operations fail
+        """
+        return await self._run(self._manager.create_client, name, phone, email, first_service)
+
+    async def find_client(self, name: str) -> Optional[Client]:
+        """
+        Get a client by name, or None if it does not exist.
+
+        Args:
+            name (str): Client name (original or normalized)
+
+        Returns:
+            Optional[Client]: Client instance, or None
+        """
+        client = self._manager.find_cached_client(name)
+        if client is not None:
+            return client
+
+        normalized_name = normalize_whitespace(name)
+        pending = self._pending_reads.get(normalized_name)
+        if pending is None:
+            pending = asyncio.ensure_future(self._run(self._manager.read_client, normalized_name))
+            self._pending_reads[normalized_name] = pending
+            pending.add_done_callback(functools.partial(self._forget_read, normalized_name))
+            self._reads += 1
+        else:
+            self._coalesced_reads += 1
+        return await asyncio.shield(pending)
+
+    def _forget_read(self, normalized_name: str, future: asyncio.Future) -> None:
+        if self._pending_reads.get(normalized_name) is future:
+            del self._pending_reads[normalized_name]
+
+    async def get_client(self, name: str) -> Client:
+        """
+        Get client by name.
+
+        Raises:
+            ClientNotFoundError: If client doesn't exist
+        """
+        client = await self.find_client(name)
+        if client is None:
+            raise ClientNotFoundError(name)
+        return client
+
+    async def update_client(self, name: str, new_service: str) -> Client:
+        """
+        Add a new service to an existing client.
+
+        Raises:
+            ClientNotFoundError: If client doesn't exist
+            ValidationError: If service description is invalid
+            FileOperationError: If file operations fail
+        """
+        return await self._run(self._manager.update_client, name, new_service)
+
+    async def delete_client(self, name: str) -> bool:
+        """
+        Delete a client.
+
+        Raises:
+            ClientNotFoundError: If client doesn't exist
+            FileOperationError: If file operations fail
+        """
+        return await self._run(self._manager.delete_client, name)
+
+    async def search_clients(self, query: str, offset: int = 0, limit: Optional[int] = None) -> List[Client]:
+        """Search clients by name, email, or phone (see ``ClientManager.search_clients``)."""
+        return await self._run(self._manager.search_clients, query, offset, limit)
+
+    async def get_all_clients(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[Client]:
+        """Get all clients, or one page of them, sorted by name."""
+        return await self._run(self._manager.get_all_clients, after, limit)
+
+    async def client_exists(self, name: str) -> bool:
+        """Check if a client exists (answered from memory)."""
+        return self._manager.client_exists(name)
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get usage statistics (see ``ClientManager.get_statistics``)."""
+        return await self._run(self._manager.get_statistics)
+
+    def get_read_statistics(self) -> Dict[str, int]:
+        """
+        Get read coalescing counters.
+
+        Returns:
+            Dict[str, int]: ``reads`` sent to the pool, ``coalesced`` reads
+            that joined one already in flight, and ``in_flight`` reads
+        """
+        return {
+            "reads": self._reads,
+            "coalesced": self._coalesced_reads,
+            "in_flight": len(self._pending_reads),
+        }
+
+    async def close(self) -> None:
+        """Wait for running operations, stop the pool and close the wrapped manager."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self._executor.shutdown, wait=True))
+        await loop.run_in_executor(None, self._manager.close)
+        self.logger.info("AsyncClientManager closed")
+
+    async def __aenter__(self) -> 'AsyncClientManager':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
@@ -0,0 +1,440 @@
+"""
+Bounded Client Caches for Axanet Client Manager
+===============================================
+
+This module provides the in-memory caches used by ``ClienteManager`` and
+``ClientManager``. Both caches behave like a small dictionary, but they can
+be limited to a fixed number of entries and evict the least useful client
+when full. Evicted clients are simply read from disk again on the next miss.
+
+Classes:
+--------
+- LRUCache: Evicts the least recently used entry
+- ARCCache: Adaptive Replacement Cache, balances recency and frequency
+- NegativeCache: Remembers for a while which names were not found
+
+Functions:
+----------
+- create_cache: Build the cache selected in ``DatabaseConfig``
+
+Educational Notes for Students:
+-------------------------------
+1. An unbounded cache is a memory leak with good intentions
+2. LRU is simple: every access moves the key to the "recent" end
+3. A single full listing can push every hot client out of an LRU cache
+4. ARC keeps "seen once" and "seen twice" lists plus ghost lists of evicted
+   keys, and adapts the split between them; one scan cannot flush it
+5. Hit, miss and eviction counters tell you whether the capacity is right
+6. LRU lookups run without the lock, so readers never wait for a writer;
+   an unbounded cache does not even need to track recency
+7. Caching "not found" answers saves the repeated misses a cache of
+   clients cannot help with. Such an entry goes stale the moment the
+   client is created, so creating must invalidate it, and a TTL bounds how
+   long a change nobody announced (another process) stays hidden
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+_MISSING = object()
+
+
+class _BaseCache:
+    """Shared locking and statistics for the cache implementations."""
+
+    def __init__(self, capacity: Optional[int]):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("Cache capacity must be positive (or None for unbounded)")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.put(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        if self.pop(key, _MISSING) is _MISSING:
+            raise KeyError(key)
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        """Insert ``value`` unless the key is already cached; return the cached value."""
+        with self._lock:
+            current = self.peek(key, _MISSING)
+            if current is not _MISSING:
+                return current
+            self.put(key, value)
+            return value
+
+    def is_full(self) -> bool:
+        """Check whether the next insertion of a new key would evict another one."""
+        return self.capacity is not None and len(self) >= self.capacity
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict[str, Any]: hits, misses, evictions, size, capacity and hit_ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+            "capacity": self.capacity,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def reset_stats(self) -> None:
+        """Reset the hit, miss and eviction counters."""
+        self.hits = self.misses = self.evictions = 0
+
+
+class LRUCache(_BaseCache):
+    """
+    Least-recently-used cache backed by an ``OrderedDict``.
+
+    Args:
+        capacity (int, optional): Maximum number of entries; None means unbounded
+
+    Educational Note:
+        ``OrderedDict.move_to_end`` and ``popitem(last=False)`` are both O(1),
+        which makes an LRU cache a few lines of code in Python.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__(capacity)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value (counting a hit or a miss) or ``default``.
+
+        Educational Note:
+            Reads do not take the lock. ``OrderedDict.get`` and
+            ``move_to_end`` each run as one step under the GIL, and a key
+            removed between the two is simply not moved. The hit and miss
+            counters may drop an increment under heavy contention.
+        """
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        if self.capacity is not None:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                pass
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value without touching recency or counters."""
+        return self._data.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace an entry, evicting the LRU entry if needed."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = value
+            if self.capacity is not None:
+                while len(self._data) > self.capacity:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value (no eviction is counted)."""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._data.keys())
+
+    def values(self) -> List[Any]:
+        with self._lock:
+            return list(self._data.values())
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class ARCCache(_BaseCache):
+    """
+    Adaptive Replacement Cache (Megiddo & Modha).
+
+    Resident entries live in T1 (seen once recently) or T2 (seen at least
+    twice). B1 and B2 remember the keys recently evicted from T1 and T2
+    without their values. A miss that hits a ghost list tells the cache
+    which side was too small, and the target size ``p`` of T1 moves
+    accordingly.
+
+    Args:
+        capacity (int): Maximum number of resident entries
+    """
+
+    def __init__(self, capacity: int):
+        if capacity is None:
+            raise ValueError("ARC cache needs a bounded capacity")
+        super().__init__(capacity)
+        self._t1: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._t2: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._b1: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._b2: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._p = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (counting a hit or a miss) or ``default``."""
+        with self._lock:
+            if key in self._t1:
+                value = self._t1.pop(key)
+                self._t2[key] = value
+            elif key in self._t2:
+                value = self._t2[key]
+                self._t2.move_to_end(key)
+            else:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value without touching the lists or counters."""
+        value = self._t1.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._t2.get(key, default)
+        return value
+
+    def _replace(self, key_in_b2: bool) -> None:
+        t1_over_target = (key_in_b2 and len(self._t1) == self._p) or len(self._t1) > self._p
+        if self._t1 and (t1_over_target or not self._t2):
+            old_key, _ = self._t1.popitem(last=False)
+            self._b1[old_key] = None
+        else:
+            old_key, _ = self._t2.popitem(last=False)
+            self._b2[old_key] = None
+        self.evictions += 1
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or replace an entry following the ARC admission rules."""
+        with self._lock:
+            capacity = self.capacity
+            if key in self._t1:
+                self._t1[key] = value
+                return
+            if key in self._t2:
+                self._t2[key] = value
+                return
+
+            if key in self._b1:
+                self._p = min(capacity, self._p + max(len(self._b2) // len(self._b1), 1))
+                del self._b1[key]
+                if len(self._t1) + len(self._t2) >= capacity:
+                    self._replace(False)
+                self._t2[key] = value
+                return
+
+            if key in self._b2:
+                self._p = max(0, self._p - max(len(self._b1) // len(self._b2), 1))
+                del self._b2[key]
+                if len(self._t1) + len(self._t2) >= capacity:
+                    self._replace(True)
+                self._t2[key] = value
+                return
+
+            l1 = len(self._t1) + len(self._b1)
+            total = l1 + len(self._t2) + len(self._b2)
+            if l1 >= capacity:
+                if len(self._t1) < capacity:
+                    self._b1.popitem(last=False)
+                    self._replace(False)
+                else:
+                    self._t1.popitem(last=False)
+                    self.evictions += 1
+            elif total >= capacity:
+                if total >= 2 * capacity:
+                    self._b2.popitem(last=False)
+                if len(self._t1) + len(self._t2) >= capacity:
+                    self._replace(False)
+            self._t1[key] = value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry (and any ghost of it) and return its value."""
+        with self._lock:
+            self._b1.pop(key, None)
+            self._b2.pop(key, None)
+            value = self._t1.pop(key, _MISSING)
+            if value is _MISSING:
+                value = self._t2.pop(key, default)
+            return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._t1 or key in self._t2
+
+    def __len__(self) -> int:
+        return len(self._t1) + len(self._t2)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._t1.keys()) + list(self._t2.keys())
+
+    def values(self) -> List[Any]:
+        with self._lock:
+            return list(self._t1.values()) + list(self._t2.values())
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        with self._lock:
+            return list(self._t1.items()) + list(self._t2.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._t1.clear()
+            self._t2.clear()
+            self._b1.clear()
+            self._b2.clear()
+            self._p = 0
+
+
+class NegativeCache:
+    """
+    Names recently looked up and not found, each forgotten after a TTL.
+
+    Args:
+        ttl_seconds (float): How long a "not found" answer is trusted
+        capacity (int): Maximum number of names remembered; the oldest
+            entries are dropped first
+
+    Example:
+        absent = NegativeCache(ttl_seconds=5.0)
+        if name not in absent:
+            ...  # look on disk, then absent.add(name) if missing
+
+    Educational Note:
+        Every entry lives for the same TTL, so insertion order is also
+        expiry order: expired entries are always at the front of the
+        ordered dictionary and are trimmed from there.
+    """
+
+    def __init__(self, ttl_seconds: float, capacity: int = 10000):
+        if ttl_seconds <= 0:
+            raise ValueError("Negative cache TTL must be positive")
+        if capacity <= 0:
+            raise ValueError("Negative cache capacity must be positive")
+        self.ttl_seconds = ttl_seconds
+        self.capacity = capacity
+        self._expiry: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires = self._expiry.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                self.hits += 1
+                return True
+            with self._lock:
+                if self._expiry.get(key) == expires:
+                    del self._expiry[key]
+                    self.expirations += 1
+        self.misses += 1
+        return False
+
+    def add(self, key: Hashable) -> None:
+        """Remember that ``key`` was not found."""
+        now = time.monotonic()
+        with self._lock:
+            self._expiry.pop(key, None)
+            self._expiry[key] = now + self.ttl_seconds
+            while self._expiry:
+                oldest, expires = next(iter(self._expiry.items()))
+                if expires > now and len(self._expiry) <= self.capacity:
+                    break
+                del self._expiry[oldest]
+                if expires > now:
+                    self.evictions += 1
+                else:
+                    self.expirations += 1
+
+    def discard(self, key: Hashable) -> None:
+        """Forget ``key`` (it has just been created)."""
+        with self._lock:
+            if self._expiry.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get negative cache counters.
+
+        Returns:
+            Dict[str, Any]: hits (disk probes saved), misses, invalidations
+            (names created since), expirations, evictions, size, capacity
+            and ttl_seconds
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "size": len(self),
+            "capacity": self.capacity,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+def create_cache(capacity: int = 0, policy: str = "lru") -> _BaseCache:
+    """
+    Build a client cache.
+
+    Args:
+        capacity (int): Maximum number of clients; 0 means unbounded
+        policy (str): "lru" or "arc" (ARC needs a positive capacity)
+
+    Returns:
+        LRUCache or ARCCache: The configured cache
+
+    Raises:
+        ValueError: If the policy is unknown
+    """
+    if policy not in ("lru", "arc"):
+        raise ValueError(f"Unknown cache policy: {policy}")
+    if capacity <= 0:
+        return LRUCache(None)
+    if policy == "arc":
+        return ARCCache(capacity)
+    return LRUCache(capacity)
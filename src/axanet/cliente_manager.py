@@ -1,8 +1,25 @@
 import os
+import threading
+from bisect import bisect_right
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+from .cache import NegativeCache, create_cache
+from .config import DatabaseConfig
+from .indexes import SortedNameIndex
+from .keyindex import KeyIndex
+from .layout import MAX_SHARD_DEPTH, ClientFileLayout
+from .loader import LoaderPool, iter_load
+from .locks import StripedLock
+from .metrics import MetricsExporter, MetricsRegistry, instrument_methods
 from .modelos import Cliente, Servicio
+from .normalization import normalize_accented
+from .snapshot import load_fresh_records, write_snapshot
+from .stats import RunningStatistics
+from .storage import GroupCommitter, LogStorage, remove_stale_temp_files, write_files_durably
+from .wal import WriteAheadLog
+from .watcher import DirectoryWatcher, FileVersions
 from .excepciones import (
     ClienteError,
     ClienteNoEncontradoError,
@@ -13,12 +30,100 @@ from .excepciones import (
 
 
 class ClienteManager:
+    
+    # Operaciones que se miden con metrics_enabled
+    _OPERACIONES_MEDIDAS = (
+        "crear_cliente", "crear_clientes_lote", "buscar_cliente", "obtener_cliente",
+        "listar_todos_clientes", "agregar_servicio_cliente", "agregar_servicios_lote",
+        "eliminar_cliente", "obtener_estadisticas"
+    )
+    _OPERACIONES_ARCHIVO_MEDIDAS = (
+        "_leer_contenido_cliente", "_guardar_cliente_en_archivo", "_guardar_servicio_agregado",
+        "_guardar_clientes_en_lote", "_eliminar_archivo_cliente", "_existe_en_disco",
+        "_listar_nombres_normalizados"
+    )
 
-    def __init__(self, directorio_datos: str = "axanet_clients_data"):
+    def __init__(self, directorio_datos: str = "axanet_clients_data",
+                 configuracion: Optional[DatabaseConfig] = None):
 
-        self._cache_clientes: Dict[str, Cliente] = {}
         self.directorio_datos = Path(directorio_datos)
+        self.configuracion = configuracion or DatabaseConfig(base_directory=directorio_datos)
+        self._cache_clientes = create_cache(
+            self.configuracion.cache_capacity,
+            self.configuracion.cache_policy
+        )
+        # Nombres buscados y no encontrados: una ráfaga de búsquedas del mismo
+        # nombre inexistente no vuelve al disco hasta que vence el TTL
+        self._ausentes: Optional[NegativeCache] = None
+        if self.configuracion.negative_cache_ttl_seconds > 0:
+            self._ausentes = NegativeCache(
+                self.configuracion.negative_cache_ttl_seconds,
+                self.configuracion.negative_cache_capacity
+            )
+        # Con trust_stored_data los archivos propios se leen sin volver a validar
+        self._parsear_cliente = partial(Cliente.desde_archivo, confiar=self.configuracion.trust_stored_data)
+        # Un candado por franja de nombres: las escrituras del mismo cliente se
+        # serializan y las de clientes distintos corren en paralelo
+        self._bloqueos = StripedLock(self.configuracion.lock_stripes)
+        self._estadisticas: Optional[RunningStatistics] = None
+        self._indice_nombres: Optional[SortedNameIndex] = None
+        # Hilos (y procesos) de lectura en paralelo: se crean la primera vez y
+        # los comparten todas las cargas, incluidas las ventanas de 1024 claves
+        self._cargador = LoaderPool(
+            self.configuracion.loader_workers,
+            self.configuracion.loader_use_processes
+        )
         self._crear_directorio_datos()
+        self._almacen_log: Optional[LogStorage] = None
+        # Dónde vive cada archivo de cliente: plano o repartido en subdirectorios por hash
+        self._disposicion = ClientFileLayout(self.directorio_datos, ".txt")
+        if self.configuracion.storage_backend == "log":
+            self._abrir_almacen_log()
+        else:
+            self._abrir_disposicion()
+            # Temporales de escrituras que un fallo dejó a medias
+            for directorio in self._disposicion.directories():
+                remove_stale_temp_files(directorio)
+        # Con watch_enabled se recuerda la versión de cada archivo escrito o leído,
+        # para distinguir los cambios propios de los de otros procesos
+        self._versiones: Optional[FileVersions] = None
+        if self._almacen_log is None and self.configuracion.watch_enabled:
+            self._versiones = FileVersions(self._disposicion)
+        # Nombres guardados en memoria: un cliente que ya existe se reconoce sin tocar
+        # el disco. Solo con el observador, que avisa de lo que borran otros procesos
+        self._indice_claves: Optional[KeyIndex] = None
+        if self._versiones is not None and self.configuracion.existence_index != "none":
+            self._indice_claves = KeyIndex(
+                self._disposicion.names,
+                self._disposicion.exists,
+                self.configuracion.existence_index,
+                self.configuracion.bloom_false_positive_rate
+            )
+        # Cada archivo se reemplaza completo; las escrituras simultáneas comparten el fsync
+        self._confirmador = GroupCommitter(encoding='utf-8', sync=self.configuracion.durable_writes)
+        # Con wal_enabled un servicio nuevo es un registro en el WAL, no una reescritura
+        self._wal: Optional[WriteAheadLog] = None
+        if self._almacen_log is None and self.configuracion.wal_enabled:
+            self._abrir_wal()
+        self._detener_instantaneas = threading.Event()
+        self._hilo_instantaneas: Optional[threading.Thread] = None
+        if self._instantaneas_habilitadas():
+            self._restaurar_instantanea()
+            if self.configuracion.snapshot_interval_seconds > 0:
+                self._iniciar_instantaneas_periodicas()
+        # Una migración de directorio interrumpida continúa en segundo plano
+        self._detener_migracion = threading.Event()
+        self._hilo_migracion: Optional[threading.Thread] = None
+        if self._disposicion.migrating:
+            self._iniciar_migracion()
+        self._observador: Optional[DirectoryWatcher] = None
+        if self._versiones is not None:
+            self._abrir_observador()
+        # Al final, para no medir la carga inicial; sin metrics_enabled no se envuelve nada
+        self.metricas: Optional[MetricsRegistry] = None
+        self._exportador_metricas: Optional[MetricsExporter] = None
+        if self.configuracion.metrics_enabled:
+            self._iniciar_metricas()
     
     def _crear_directorio_datos(self):
         try:
@@ -30,24 +135,141 @@ class ClienteManager:
                 motivo=str(e)
             )
     
+    def _abrir_almacen_log(self):
+        try:
+            self._almacen_log = LogStorage.from_config(self.configuracion, self.directorio_datos)
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="abrir",
+                nombre_archivo=str(self.directorio_datos),
+                motivo=str(e)
+            )
+    
+    def _abrir_disposicion(self):
+        try:
+            self._disposicion = ClientFileLayout.open(self.directorio_datos, ".txt", self.configuracion.shard_depth)
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="abrir",
+                nombre_archivo=str(self.directorio_datos),
+                motivo=str(e)
+            )
+    
+    def _abrir_observador(self):
+        try:
+            self._observador = DirectoryWatcher(
+                self._disposicion,
+                self._archivo_cambiado,
+                self._refrescar_cache,
+                self.configuracion.watch_backend,
+                self.configuracion.watch_poll_interval_seconds
+            )
+        except OSError as e:
+            raise ErrorArchivo(
+                operacion="observar",
+                nombre_archivo=str(self.directorio_datos),
+                motivo=str(e)
+            )
+    
+    def _iniciar_metricas(self):
+        self.metricas = MetricsRegistry()
+        instrument_methods(self.metricas, self, self._OPERACIONES_MEDIDAS, "cliente_manager")
+        instrument_methods(self.metricas, self, self._OPERACIONES_ARCHIVO_MEDIDAS, "archivos")
+        self.metricas.register_collector("cache", self.obtener_estadisticas_cache)
+        self.metricas.register_collector("negative_cache", self.obtener_estadisticas_cache_negativa)
+        self.metricas.register_collector("existence_index", self.obtener_estadisticas_indice_claves)
+        self.metricas.register_collector("watcher", self.obtener_estadisticas_observador)
+        if not (self.configuracion.metrics_file or self.configuracion.metrics_port):
+            return
+        try:
+            self._exportador_metricas = MetricsExporter(
+                self.metricas,
+                Path(self.configuracion.metrics_file) if self.configuracion.metrics_file else None,
+                self.configuracion.metrics_format,
+                self.configuracion.metrics_interval_seconds,
+                self.configuracion.metrics_port
+            )
+        except OSError as e:
+            raise ErrorArchivo(
+                operacion="publicar métricas",
+                nombre_archivo=f"127.0.0.1:{self.configuracion.metrics_port}",
+                motivo=str(e)
+            )
+    
+    def _abrir_wal(self):
+        try:
+            self._wal = WriteAheadLog.from_config(
+                self.configuracion,
+                self.directorio_datos,
+                self._obtener_ruta_archivo,
+                self._aplicar_servicios_registrados,
+                self._bloqueos,
+                locate=self._disposicion.locate,
+                versions=self._versiones
+            )
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="abrir",
+                nombre_archivo=str(self.directorio_datos),
+                motivo=str(e)
+            )
+    
+    @staticmethod
+    def _aplicar_servicios_registrados(contenido: str, registros: List[Tuple[int, str]]) -> str:
+        # Solo se agregan las posiciones que el archivo todavía no tiene. Se
+        # cuentan sin parsear: al leer, quien llama parsea el resultado
+        cantidad = Cliente.contar_servicios_archivo(contenido)
+        lineas = [linea for posicion, linea in registros if posicion >= cantidad]
+        if not lineas:
+            return contenido
+        return "\n".join([contenido, *lineas])
+    
     def _obtener_ruta_archivo(self, nombre_normalizado: str) -> Path:
-        nombre_archivo = f"{nombre_normalizado}.txt"
-        return self.directorio_datos / nombre_archivo
-    def _cargar_cliente_desde_archivo(self, nombre_normalizado: str) -> Cliente:
-        ruta_archivo = self._obtener_ruta_archivo(nombre_normalizado)
-        if not ruta_archivo.exists():
+        return self._disposicion.path_for(nombre_normalizado)
+    def _existe_en_disco(self, nombre_normalizado: str) -> bool:
+        if self._almacen_log is not None:
+            return self._almacen_log.exists(nombre_normalizado)
+        if self._indice_claves is not None:
+            return self._indice_claves.contains(nombre_normalizado)
+        return self._disposicion.exists(nombre_normalizado)
+    
+    def _listar_nombres_normalizados(self) -> List[str]:
+        if self._almacen_log is not None:
+            return self._almacen_log.keys()
+        if not self.directorio_datos.exists():
+            return []
+        return self._disposicion.names()
+    
+    def _leer_contenido_cliente(self, nombre_normalizado: str) -> str:
+        if self._almacen_log is not None:
+            contenido = self._almacen_log.read(nombre_normalizado)
+            if contenido is None:
+                nombre_original = nombre_normalizado.replace('_', ' ').title()
+                raise ClienteNoEncontradoError(nombre_original)
+            return contenido
+        if self._wal is not None:
+            return self._wal.read(nombre_normalizado, self._leer_archivo_cliente)
+        return self._leer_archivo_cliente(nombre_normalizado)
+    
+    def _leer_archivo_cliente(self, nombre_normalizado: str) -> str:
+        if self._versiones is not None:
+            self._versiones.remember(nombre_normalizado)
+        try:
+            return self._disposicion.read_text(nombre_normalizado, encoding='utf-8')
+        except FileNotFoundError:
             nombre_original = nombre_normalizado.replace('_', ' ').title()
             raise ClienteNoEncontradoError(nombre_original)
-        
+    
+    def _cargar_cliente_desde_archivo(self, nombre_normalizado: str) -> Cliente:
+        contenido = self._leer_contenido_cliente(nombre_normalizado)
         try:
-            contenido = ruta_archivo.read_text(encoding='utf-8')
-            cliente = Cliente.desde_archivo(contenido)
+            cliente = self._parsear_cliente(contenido)
             return cliente
             
         except Exception as e:
             raise ErrorArchivo(
                 operacion="leer",
-                nombre_archivo=str(ruta_archivo),
+                nombre_archivo=str(self._obtener_ruta_archivo(nombre_normalizado)),
                 motivo=str(e)
             )
     
@@ -56,7 +278,16 @@ class ClienteManager:
         
         try:
             contenido = cliente.a_formato_archivo()
-            ruta_archivo.write_text(contenido, encoding='utf-8')
+            if self._almacen_log is not None:
+                self._almacen_log.write(cliente.nombre_normalizado, contenido)
+            else:
+                self._confirmador.write(ruta_archivo, contenido)
+                if self._versiones is not None:
+                    self._versiones.remember(cliente.nombre_normalizado)
+                if self._indice_claves is not None:
+                    self._indice_claves.add(cliente.nombre_normalizado)
+            # Ya escrito: una carga en paralelo que leyó antes el archivo sabrá que quedó vieja
+            self._bloqueos.bump(cliente.nombre_normalizado)
             
         except Exception as e:
             raise ErrorArchivo(
@@ -65,12 +296,81 @@ class ClienteManager:
                 motivo=str(e)
             )
     
+    def _guardar_servicio_agregado(self, cliente: Cliente):
+        if self._wal is None:
+            self._guardar_cliente_en_archivo(cliente)
+            return
+        
+        try:
+            self._wal.append_service(
+                cliente.nombre_normalizado,
+                len(cliente.servicios) - 1,
+                f"- {cliente.servicios[-1]}"
+            )
+            self._bloqueos.bump(cliente.nombre_normalizado)
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="escribir",
+                nombre_archivo=str(self._obtener_ruta_archivo(cliente.nombre_normalizado)),
+                motivo=str(e)
+            )
+    
+    def _guardar_clientes_en_lote(self, clientes: List[Cliente]) -> Dict[str, str]:
+        if not clientes:
+            return {}
+        if self._almacen_log is not None:
+            try:
+                self._almacen_log.write_many(
+                    (cliente.nombre_normalizado, cliente.a_formato_archivo()) for cliente in clientes
+                )
+                for cliente in clientes:
+                    self._bloqueos.bump(cliente.nombre_normalizado)
+                return {}
+            except Exception as e:
+                error = str(ErrorArchivo(
+                    operacion="escribir",
+                    nombre_archivo=str(self.directorio_datos),
+                    motivo=str(e)
+                ))
+                return {cliente.nombre_normalizado: error for cliente in clientes}
+        
+        rutas = {self._obtener_ruta_archivo(cliente.nombre_normalizado): cliente for cliente in clientes}
+        fallos = write_files_durably(
+            ((ruta, cliente.a_formato_archivo()) for ruta, cliente in rutas.items()),
+            encoding='utf-8',
+            sync=self.configuracion.durable_writes
+        )
+        for ruta, cliente in rutas.items():
+            if ruta not in fallos:
+                self._bloqueos.bump(cliente.nombre_normalizado)
+                if self._versiones is not None:
+                    self._versiones.remember(cliente.nombre_normalizado)
+                if self._indice_claves is not None:
+                    self._indice_claves.add(cliente.nombre_normalizado)
+        return {
+            rutas[ruta].nombre_normalizado: str(ErrorArchivo(
+                operacion="escribir",
+                nombre_archivo=str(ruta),
+                motivo=str(e)
+            ))
+            for ruta, e in fallos.items()
+        }
+    
     def _eliminar_archivo_cliente(self, nombre_normalizado: str):
         ruta_archivo = self._obtener_ruta_archivo(nombre_normalizado)
         
         try:
-            if ruta_archivo.exists():
-                ruta_archivo.unlink()
+            if self._almacen_log is not None:
+                self._almacen_log.delete(nombre_normalizado)
+            else:
+                self._disposicion.remove(nombre_normalizado)
+                if self._versiones is not None:
+                    self._versiones.forget(nombre_normalizado)
+                if self._indice_claves is not None:
+                    self._indice_claves.discard(nombre_normalizado)
+            self._bloqueos.bump(nombre_normalizado)
+            if self._wal is not None:
+                self._wal.clear(nombre_normalizado)
             
         except Exception as e:
             raise ErrorArchivo(
@@ -79,95 +379,616 @@ class ClienteManager:
                 motivo=str(e)
             )
     
-    def _cargar_todos_clientes_a_cache(self):
-        if not self.directorio_datos.exists():
-            return
-        archivos_clientes = list(self.directorio_datos.glob("*.txt"))
-        
-        for archivo in archivos_clientes:
-            nombre_normalizado = archivo.stem
-            if nombre_normalizado not in self._cache_clientes:
+    def _obtener_cliente_cargado(self, nombre_normalizado: str) -> Optional[Cliente]:
+        cliente = self._cache_clientes.peek(nombre_normalizado)
+        if cliente is None:
+            try:
+                cliente = self._cargar_en_cache(nombre_normalizado)
+            except Exception as e:
+                print(f"⚠️  Advertencia: No se pudo cargar {nombre_normalizado}: {e}")
+                return None
+        return cliente
+    
+    def _cargar_en_cache(self, nombre_normalizado: str) -> Cliente:
+        # La carga se hace con el candado del cliente: así no puede volver a la
+        # cache un cliente que otro hilo está eliminando en ese momento
+        with self._bloqueos.hold(nombre_normalizado):
+            cliente = self._cache_clientes.peek(nombre_normalizado)
+            if cliente is None:
                 try:
                     cliente = self._cargar_cliente_desde_archivo(nombre_normalizado)
-                    self._cache_clientes[nombre_normalizado] = cliente
-                except Exception as e:
-                    print(f"⚠️  Advertencia: No se pudo cargar {archivo}: {e}")
+                except ClienteNoEncontradoError:
+                    # Con el candado tomado: un crear_cliente simultáneo no puede quedar oculto
+                    if self._ausentes is not None:
+                        self._ausentes.add(nombre_normalizado)
+                    raise
+                self._cache_clientes[nombre_normalizado] = cliente
+            return cliente
+    
+    def _cargar_clientes_en_paralelo(self, nombres_normalizados: List[str]) -> Iterator[Cliente]:
+        # Escrituras contadas antes de leer: lo escrito después se vuelve a leer
+        generaciones = self._bloqueos.generations()
+        resultados = iter_load(
+            nombres_normalizados,
+            read_content=self._leer_contenido_cliente,
+            parse_content=self._parsear_cliente,
+            pool=self._cargador
+        )
+        for nombre_normalizado, cliente, error in resultados:
+            if error is not None:
+                print(f"⚠️  Advertencia: No se pudo cargar {nombre_normalizado}: {error}")
+                continue
+            cliente = self._guardar_cliente_cargado(nombre_normalizado, cliente, generaciones)
+            if cliente is not None:
+                yield cliente
+    
+    def _guardar_cliente_cargado(self, nombre_normalizado: str, cliente: Cliente,
+                                 generaciones: List[int]) -> Optional[Cliente]:
+        # La lectura se hizo sin candado: lo que haya en la cache es más nuevo,
+        # un cliente eliminado no debe volver y uno escrito después de leerlo
+        # (y ya expulsado de la cache) se vuelve a leer
+        with self._bloqueos.hold(nombre_normalizado):
+            actual = self._cache_clientes.peek(nombre_normalizado)
+            if actual is not None:
+                return actual
+            if not self._existe_en_disco(nombre_normalizado):
+                return None
+            if self._bloqueos.changed_since(nombre_normalizado, generaciones):
+                try:
+                    cliente = self._cargar_cliente_desde_archivo(nombre_normalizado)
+                except ClienteNoEncontradoError:
+                    return None
+            self._cache_clientes[nombre_normalizado] = cliente
+            return cliente
+    
+    def _iterar_todos_clientes(self) -> Iterator[Cliente]:
+        faltantes = []
+        for nombre_normalizado in self._listar_nombres_normalizados():
+            cliente = self._cache_clientes.peek(nombre_normalizado)
+            if cliente is None:
+                faltantes.append(nombre_normalizado)
+            else:
+                yield cliente
+        yield from self._cargar_clientes_en_paralelo(faltantes)
+    
+    def iterar_clientes_por_clave(self, despues_de: Optional[str] = None,
+                                  tamano_ventana: int = 1024) -> Iterator[Tuple[str, Cliente]]:
+        claves = sorted(self._listar_nombres_normalizados())
+        if despues_de is not None:
+            claves = claves[bisect_right(claves, despues_de):]
+        
+        # Recorre la base en orden de nombre_normalizado sin llenar la cache:
+        # cada ventana se lee en paralelo y se entrega ordenada
+        for inicio in range(0, len(claves), tamano_ventana):
+            ventana = claves[inicio:inicio + tamano_ventana]
+            cargados: Dict[str, Cliente] = {}
+            faltantes = []
+            for nombre_normalizado in ventana:
+                cliente = self._cache_clientes.peek(nombre_normalizado)
+                if cliente is None:
+                    faltantes.append(nombre_normalizado)
+                else:
+                    cargados[nombre_normalizado] = cliente
+            resultados = iter_load(
+                faltantes,
+                read_content=self._leer_contenido_cliente,
+                parse_content=self._parsear_cliente,
+                pool=self._cargador
+            )
+            for nombre_normalizado, cliente, error in resultados:
+                if error is not None:
+                    print(f"⚠️  Advertencia: No se pudo cargar {nombre_normalizado}: {error}")
+                    continue
+                cargados[nombre_normalizado] = cliente
+            for nombre_normalizado in ventana:
+                cliente = cargados.get(nombre_normalizado)
+                if cliente is not None:
+                    yield nombre_normalizado, cliente
+    
+    def _obtener_indice_nombres(self) -> SortedNameIndex:
+        if self._indice_nombres is not None:
+            return self._indice_nombres
+        indice = SortedNameIndex()
+        for cliente in self._iterar_todos_clientes():
+            indice.add(cliente.nombre_normalizado, cliente.nombre)
+        # Sin observador no se guarda: el próximo listado vuelve a recorrer el
+        # directorio y ve los clientes que otros procesos crearon o borraron
+        if self._agregados_al_dia():
+            self._indice_nombres = indice
+        return indice
     
     def crear_cliente(self, nombre: str, telefono: str, email: str, primer_servicio: str) -> Cliente:
         cliente = Cliente(nombre=nombre, telefono=telefono, email=email)
-        if cliente.nombre_normalizado in self._cache_clientes:
-            raise ClienteExisteError(cliente.nombre)
-        
-        ruta_archivo = self._obtener_ruta_archivo(cliente.nombre_normalizado)
-        if ruta_archivo.exists():
-            raise ClienteExisteError(cliente.nombre)
+        with self._bloqueos.hold(cliente.nombre_normalizado):
+            if cliente.nombre_normalizado in self._cache_clientes:
+                raise ClienteExisteError(cliente.nombre)
+            
+            if self._existe_en_disco(cliente.nombre_normalizado):
+                raise ClienteExisteError(cliente.nombre)
+            
+            cliente.id_cliente = cliente.generar_id_cliente()
+            
+            cliente.agregar_servicio(primer_servicio)
+            
+            self._guardar_cliente_en_archivo(cliente)
+            self._registrar_cliente_nuevo(cliente)
         
-        cliente.id_cliente = cliente.generar_id_cliente()
+        return cliente
+    
+    def _registrar_cliente_nuevo(self, cliente: Cliente):
+        self._cache_clientes[cliente.nombre_normalizado] = cliente
+        if self._ausentes is not None:
+            self._ausentes.discard(cliente.nombre_normalizado)
+        if self._estadisticas is not None:
+            self._estadisticas.add_client(self._dias_servicios(cliente))
+        if self._indice_nombres is not None:
+            self._indice_nombres.add(cliente.nombre_normalizado, cliente.nombre)
+    
+    @staticmethod
+    def _campos_fila(fila: Union[Dict[str, str], Sequence[str]], campos: Sequence[str]) -> List[str]:
+        if isinstance(fila, dict):
+            return [fila.get(campo) or "" for campo in campos]
+        valores = list(fila)
+        if len(valores) != len(campos):
+            raise ValueError(f"Se esperaban {len(campos)} valores ({', '.join(campos)}), se recibieron {len(valores)}")
+        return valores
+    
+    def crear_clientes_lote(self, filas: Iterable[Union[Cliente, Dict[str, str], Sequence[str]]]) -> List[Dict[str, Any]]:
+        resultados: List[Dict[str, Any]] = []
+        validos: List[Tuple[Dict[str, Any], Cliente, Optional[str]]] = []
         
-        cliente.agregar_servicio(primer_servicio)
+        # Primero se validan las filas sin candados; luego se toman los
+        # candados de todos los clientes del lote para comprobar y escribir
+        for indice, fila in enumerate(filas):
+            resultado = {"indice": indice, "nombre": None, "exito": False, "cliente": None, "error": None}
+            resultados.append(resultado)
+            try:
+                if isinstance(fila, Cliente):
+                    cliente = fila
+                    primer_servicio = None
+                    resultado["nombre"] = cliente.nombre
+                else:
+                    nombre, telefono, email, primer_servicio = self._campos_fila(
+                        fila, ("nombre", "telefono", "email", "primer_servicio")
+                    )
+                    resultado["nombre"] = nombre
+                    cliente = Cliente(nombre=nombre, telefono=telefono, email=email)
+            except Exception as e:
+                resultado["error"] = str(e)
+                continue
+            validos.append((resultado, cliente, primer_servicio))
         
-        self._guardar_cliente_en_archivo(cliente)
-
-        self._cache_clientes[cliente.nombre_normalizado] = cliente
+        with self._bloqueos.hold(*(cliente.nombre_normalizado for _, cliente, _ in validos)):
+            nuevos: Dict[str, Cliente] = {}
+            for resultado, cliente, primer_servicio in validos:
+                try:
+                    nombre_normalizado = cliente.nombre_normalizado
+                    if (nombre_normalizado in nuevos or nombre_normalizado in self._cache_clientes
+                            or self._existe_en_disco(nombre_normalizado)):
+                        raise ClienteExisteError(cliente.nombre)
+                    if not cliente.id_cliente:
+                        cliente.id_cliente = cliente.generar_id_cliente()
+                    if primer_servicio is not None:
+                        cliente.agregar_servicio(primer_servicio)
+                except Exception as e:
+                    resultado["error"] = str(e)
+                    continue
+                nuevos[nombre_normalizado] = cliente
+                resultado["cliente"] = cliente
+            
+            errores = self._guardar_clientes_en_lote(list(nuevos.values()))
+            
+            for resultado in resultados:
+                cliente = resultado["cliente"]
+                if cliente is None:
+                    continue
+                error = errores.get(cliente.nombre_normalizado)
+                if error is not None:
+                    resultado["cliente"] = None
+                    resultado["error"] = error
+                    continue
+                resultado["exito"] = True
+                self._registrar_cliente_nuevo(cliente)
         
-        return cliente
+        return resultados
     
-    def obtener_cliente(self, nombre: str) -> Cliente:
-        cliente_temp = Cliente(nombre=nombre, telefono="0000000000", email="temp@temp.com")
-        nombre_normalizado = cliente_temp.nombre_normalizado
-        
-        if nombre_normalizado in self._cache_clientes:
-            print(f"Cliente encontrado): '{nombre_normalizado}'")
-            return self._cache_clientes[nombre_normalizado]
+    def buscar_cliente(self, nombre: str) -> Optional[Cliente]:
+        # Camino rápido: la clave sale de la cache de normalización, sin crear
+        # ni validar un Cliente, y un cliente inexistente devuelve None
+        # Un acierto de cache no toma ningún candado
+        nombre_normalizado = normalize_accented(nombre)
+        cliente = self._cache_clientes.get(nombre_normalizado)
+        if cliente is not None:
+            return cliente
+        if self._ausentes is not None and nombre_normalizado in self._ausentes:
+            return None
         
         try:
-            cliente = self._cargar_cliente_desde_archivo(nombre_normalizado)
-            self._cache_clientes[nombre_normalizado] = cliente
-            return cliente
-            
+            return self._cargar_en_cache(nombre_normalizado)
         except ClienteNoEncontradoError:
+            return None
+    
+    def obtener_cliente(self, nombre: str) -> Cliente:
+        cliente = self.buscar_cliente(nombre)
+        if cliente is None:
             raise ClienteNoEncontradoError(nombre)
+        return cliente
+    
+    def iterar_clientes_ordenados(self, despues_de: Optional[str] = None,
+                                  limite: Optional[int] = None) -> Iterator[Cliente]:
+        for nombre_normalizado in self._obtener_indice_nombres().iter_keys(despues_de, limite):
+            cliente = self._obtener_cliente_cargado(nombre_normalizado)
+            if cliente is not None:
+                yield cliente
     
-    def listar_todos_clientes(self) -> List[Cliente]:
-        self._cargar_todos_clientes_a_cache()
-        clientes = list(self._cache_clientes.values())
-        clientes.sort(key=lambda c: c.nombre)
+    def listar_todos_clientes(self, despues_de: Optional[str] = None,
+                              limite: Optional[int] = None) -> List[Cliente]:
+        clientes = list(self.iterar_clientes_ordenados(despues_de, limite))
         
         print(f"Clientes en tabla: {len(self._cache_clientes)}")
         
         return clientes
     
     def agregar_servicio_cliente(self, nombre: str, descripcion_servicio: str) -> Cliente:
-        cliente = self.obtener_cliente(nombre)
-        cliente.agregar_servicio(descripcion_servicio)
-        self._guardar_cliente_en_archivo(cliente)
-        self._cache_clientes[cliente.nombre_normalizado] = cliente
+        # Leer, agregar y escribir con el candado del cliente: otro hilo que
+        # agregue un servicio al mismo cliente espera y no pisa este
+        with self._bloqueos.hold(normalize_accented(nombre)):
+            cliente = self.obtener_cliente(nombre)
+            cliente.agregar_servicio(descripcion_servicio)
+            try:
+                self._guardar_servicio_agregado(cliente)
+            except ErrorArchivo:
+                del cliente.servicios[-1]
+                raise
+            self._cache_clientes[cliente.nombre_normalizado] = cliente
+            if self._estadisticas is not None:
+                self._estadisticas.add_service(cliente.servicios[-1].fecha_solicitud[:10])
         return cliente
     
+    def agregar_servicios_lote(self, filas: Iterable[Union[Dict[str, str], Sequence[str]]]) -> List[Dict[str, Any]]:
+        resultados: List[Dict[str, Any]] = []
+        validos: List[Tuple[Dict[str, Any], str, str, str]] = []
+        
+        for indice, fila in enumerate(filas):
+            resultado = {"indice": indice, "nombre": None, "exito": False, "cliente": None, "error": None}
+            resultados.append(resultado)
+            try:
+                nombre, descripcion = self._campos_fila(fila, ("nombre", "descripcion"))
+            except Exception as e:
+                resultado["error"] = str(e)
+                continue
+            resultado["nombre"] = nombre
+            validos.append((resultado, nombre, normalizar_nombre(nombre), descripcion))
+        
+        with self._bloqueos.hold(*(nombre_normalizado for _, _, nombre_normalizado, _ in validos)):
+            modificados: Dict[str, Cliente] = {}
+            agregados: Dict[str, int] = {}
+            for resultado, nombre, nombre_normalizado, descripcion in validos:
+                try:
+                    cliente = modificados.get(nombre_normalizado)
+                    if cliente is None:
+                        cliente = self._cache_clientes.peek(nombre_normalizado)
+                    if cliente is None:
+                        try:
+                            cliente = self._cargar_cliente_desde_archivo(nombre_normalizado)
+                        except ClienteNoEncontradoError:
+                            raise ClienteNoEncontradoError(nombre)
+                    cliente.agregar_servicio(descripcion)
+                except Exception as e:
+                    resultado["error"] = str(e)
+                    continue
+                modificados[nombre_normalizado] = cliente
+                agregados[nombre_normalizado] = agregados.get(nombre_normalizado, 0) + 1
+                resultado["cliente"] = cliente
+            
+            errores = self._guardar_clientes_en_lote(list(modificados.values()))
+            
+            for nombre_normalizado, cantidad in agregados.items():
+                cliente = modificados[nombre_normalizado]
+                if nombre_normalizado in errores:
+                    del cliente.servicios[-cantidad:]
+                    continue
+                self._cache_clientes[nombre_normalizado] = cliente
+                if self._estadisticas is not None:
+                    for dia in self._dias_servicios(cliente)[-cantidad:]:
+                        self._estadisticas.add_service(dia)
+        
+        for resultado in resultados:
+            cliente = resultado["cliente"]
+            if cliente is None:
+                continue
+            error = errores.get(cliente.nombre_normalizado)
+            if error is not None:
+                resultado["cliente"] = None
+                resultado["error"] = error
+            else:
+                resultado["exito"] = True
+        
+        return resultados
+    
     def eliminar_cliente(self, nombre: str) -> bool:
-        cliente = self.obtener_cliente(nombre)
-        self._eliminar_archivo_cliente(cliente.nombre_normalizado)
-        if cliente.nombre_normalizado in self._cache_clientes:
-            del self._cache_clientes[cliente.nombre_normalizado]
+        # Todo con el candado: si no, un cliente recreado con el mismo nombre
+        # podría perder su entrada en el índice y en las estadísticas
+        with self._bloqueos.hold(normalize_accented(nombre)):
+            cliente = self.obtener_cliente(nombre)
+            self._eliminar_archivo_cliente(cliente.nombre_normalizado)
+            self._cache_clientes.pop(cliente.nombre_normalizado)
+            if self._estadisticas is not None:
+                self._estadisticas.remove_client(self._dias_servicios(cliente))
+            if self._indice_nombres is not None:
+                self._indice_nombres.remove(cliente.nombre_normalizado)
         return True
     
-    def obtener_estadisticas(self) -> Dict[str, Union[int, float]]:
-        self._cargar_todos_clientes_a_cache()
-        total_clientes = len(self._cache_clientes)
+    @staticmethod
+    def _dias_servicios(cliente: Cliente) -> List[str]:
+        return [servicio.fecha_solicitud[:10] for servicio in cliente.servicios]
+    
+    def _calcular_estadisticas(self) -> RunningStatistics:
+        return RunningStatistics.from_service_days(
+            self._dias_servicios(cliente) for cliente in self._iterar_todos_clientes()
+        )
+    
+    def _agregados_al_dia(self) -> bool:
+        # Lo que se calcula recorriendo todos los clientes solo se guarda entre
+        # llamadas si se enteran de los cambios de otros procesos: con el
+        # observador, o con el almacén de log, que no comparte su directorio
+        return self._versiones is not None or self._almacen_log is not None
+    
+    def obtener_estadisticas(self, verificar: bool = False) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        if not self._agregados_al_dia():
+            estadisticas = self._calcular_estadisticas()
+        else:
+            if self._estadisticas is None:
+                self._estadisticas = self._calcular_estadisticas()
+            elif verificar:
+                recalculadas = self._calcular_estadisticas()
+                diferencias = self._estadisticas.differences(recalculadas)
+                if diferencias:
+                    print(f"⚠️  Advertencia: estadísticas desincronizadas, se recalculan: {diferencias}")
+                    self._estadisticas = recalculadas
+            estadisticas = self._estadisticas
+        total_clientes, total_servicios, servicios_por_dia = estadisticas.snapshot()
         if total_clientes == 0:
             return {
                 "total_clientes": 0,
                 "total_servicios": 0,
-                "promedio_servicios": 0.0
+                "promedio_servicios": 0.0,
+                "servicios_por_dia": {}
             }
-        total_servicios = sum(len(cliente.servicios) for cliente in self._cache_clientes.values())
         promedio_servicios = total_servicios / total_clientes if total_clientes > 0 else 0
         return {
             "total_clientes": total_clientes,
             "total_servicios": total_servicios,
-            "promedio_servicios": promedio_servicios
+            "promedio_servicios": promedio_servicios,
+            "servicios_por_dia": servicios_por_dia
         }
     
+    def obtener_estadisticas_cache(self) -> Dict[str, Any]:
+        return self._cache_clientes.stats()
+    
+    def obtener_estadisticas_observador(self) -> Dict[str, Any]:
+        if self._observador is None:
+            return {}
+        return self._observador.stats()
+    
+    def obtener_metricas(self) -> Dict[str, Any]:
+        if self.metricas is None:
+            return {}
+        return self.metricas.to_dict()
+    
+    def obtener_estadisticas_cache_negativa(self) -> Dict[str, Any]:
+        if self._ausentes is None:
+            return {}
+        return self._ausentes.stats()
+    
+    def obtener_estadisticas_indice_claves(self) -> Dict[str, Any]:
+        if self._indice_claves is None:
+            return {}
+        return self._indice_claves.stats()
+    
+    def _archivo_cambiado(self, nombre_normalizado: str) -> bool:
+        # Otro proceso cambió, creó o borró el archivo: solo se actualiza ese cliente
+        with self._bloqueos.hold(nombre_normalizado):
+            if self._versiones.is_known(nombre_normalizado):
+                return False
+            self._bloqueos.bump(nombre_normalizado)
+            if self._ausentes is not None:
+                self._ausentes.discard(nombre_normalizado)
+            anterior = self._cache_clientes.peek(nombre_normalizado)
+            
+            if not self._disposicion.exists(nombre_normalizado):
+                self._versiones.forget(nombre_normalizado)
+                if self._indice_claves is not None:
+                    self._indice_claves.discard(nombre_normalizado)
+                self._cache_clientes.pop(nombre_normalizado)
+                self._descontar_cliente(nombre_normalizado, anterior)
+                return True
+            
+            if self._indice_claves is not None:
+                self._indice_claves.add(nombre_normalizado)
+            if anterior is None and self._estadisticas is None and self._indice_nombres is None:
+                # Nada en memoria depende de este archivo; se leerá al usarlo
+                self._versiones.remember(nombre_normalizado)
+                return True
+            
+            try:
+                cliente = self._parsear_cliente(self._leer_contenido_cliente(nombre_normalizado))
+            except Exception:
+                # Quizá se leyó a medio escribir: se descarta y el próximo evento lo recarga
+                self._cache_clientes.pop(nombre_normalizado)
+                self._estadisticas = None
+                raise
+            if anterior is not None:
+                self._cache_clientes[nombre_normalizado] = cliente
+            self._descontar_cliente(nombre_normalizado, anterior)
+            if self._estadisticas is not None:
+                self._estadisticas.add_client(self._dias_servicios(cliente))
+            if self._indice_nombres is not None:
+                self._indice_nombres.add(nombre_normalizado, cliente.nombre)
+            return True
+    
+    def _descontar_cliente(self, nombre_normalizado: str, anterior: Optional[Cliente]):
+        # Sin la versión anterior en cache no se sabe qué restar: se recalculan al usarlas
+        if self._estadisticas is not None:
+            if anterior is None:
+                self._estadisticas = None
+            else:
+                self._estadisticas.remove_client(self._dias_servicios(anterior))
+        if self._indice_nombres is not None:
+            self._indice_nombres.remove(nombre_normalizado)
+    
+    def _refrescar_cache(self):
+        # Se perdieron avisos de cambios: se descarta todo lo que está en memoria
+        self._cache_clientes.clear()
+        self._estadisticas = None
+        self._indice_nombres = None
+        if self._ausentes is not None:
+            self._ausentes.clear()
+        if self._indice_claves is not None:
+            self._indice_claves.reset()
+    
+    def _instantaneas_habilitadas(self) -> bool:
+        return self.configuracion.snapshot_enabled and self._almacen_log is None
+    
+    def _ruta_instantanea(self) -> Path:
+        return self.directorio_datos / self.configuracion.snapshot_file
+    
+    def _restaurar_instantanea(self):
+        vigentes, obsoletos = load_fresh_records(
+            self._ruta_instantanea(),
+            self._disposicion.locate,
+            limit=self._cache_clientes.capacity
+        )
+        for nombre_normalizado, campos, servicios in vigentes:
+            self._cache_clientes[nombre_normalizado] = Cliente.desde_campos_instantanea(campos, servicios)
+    
+    def guardar_instantanea(self) -> int:
+        if not self._instantaneas_habilitadas():
+            return 0
+        
+        def registros():
+            for nombre_normalizado, cliente in self._cache_clientes.items():
+                try:
+                    estado = os.stat(self._disposicion.locate(nombre_normalizado))
+                except OSError:
+                    continue
+                campos, servicios = cliente.a_campos_instantanea()
+                yield nombre_normalizado, campos, servicios, estado.st_mtime_ns, estado.st_size
+        
+        ruta_instantanea = self._ruta_instantanea()
+        try:
+            return write_snapshot(ruta_instantanea, registros(), sync=self.configuracion.durable_writes)
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="escribir",
+                nombre_archivo=str(ruta_instantanea),
+                motivo=str(e)
+            )
+    
+    def _iniciar_instantaneas_periodicas(self):
+        def ejecutar():
+            while not self._detener_instantaneas.wait(self.configuracion.snapshot_interval_seconds):
+                try:
+                    self.guardar_instantanea()
+                except Exception as e:
+                    print(f"⚠️  Advertencia: No se pudo guardar la instantánea: {e}")
+        
+        self._hilo_instantaneas = threading.Thread(target=ejecutar, name="axanet-instantanea", daemon=True)
+        self._hilo_instantaneas.start()
+    
+    def aplicar_wal(self) -> int:
+        if self._wal is None:
+            return 0
+        try:
+            return self._wal.checkpoint()
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="escribir",
+                nombre_archivo=str(self.directorio_datos),
+                motivo=str(e)
+            )
+    
+    def migrar_directorio(self, profundidad: int, en_segundo_plano: bool = False,
+                          al_avanzar: Optional[Callable[[int, int], None]] = None) -> int:
+        # Cambia la disposición en línea: las escrituras nuevas van ya a la
+        # ubicación nueva y los archivos existentes se mueven uno a uno
+        if self._almacen_log is not None:
+            raise ErrorValidacion("profundidad", "el almacenamiento 'log' no guarda un archivo por cliente")
+        if not 0 <= profundidad <= MAX_SHARD_DEPTH:
+            raise ErrorValidacion(
+                "profundidad",
+                f"debe estar entre 0 y {MAX_SHARD_DEPTH}",
+                str(profundidad)
+            )
+        self._detener_hilo_migracion()
+        try:
+            self._disposicion.start_migration(profundidad, self._bloqueos)
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="escribir",
+                nombre_archivo=str(self.directorio_datos),
+                motivo=str(e)
+            )
+        if en_segundo_plano:
+            self._iniciar_migracion()
+            return 0
+        return self._migrar_archivos(al_avanzar)
+    
+    def _migrar_archivos(self, al_avanzar: Optional[Callable[[int, int], None]] = None) -> int:
+        try:
+            return self._disposicion.migrate(
+                self._bloqueos,
+                al_avanzar,
+                stop=self._detener_migracion,
+                sync=self.configuracion.durable_writes
+            )
+        except Exception as e:
+            raise ErrorArchivo(
+                operacion="mover",
+                nombre_archivo=str(self.directorio_datos),
+                motivo=str(e)
+            )
+    
+    def _iniciar_migracion(self):
+        def ejecutar():
+            try:
+                self._migrar_archivos()
+            except Exception as e:
+                print(f"⚠️  Advertencia: La migración del directorio se detuvo: {e}")
+        
+        self._detener_migracion.clear()
+        self._hilo_migracion = threading.Thread(target=ejecutar, name="axanet-migracion", daemon=True)
+        self._hilo_migracion.start()
+    
+    def _detener_hilo_migracion(self):
+        # Lo que falte se retoma en el próximo inicio
+        if self._hilo_migracion is not None:
+            self._detener_migracion.set()
+            self._hilo_migracion.join()
+            self._hilo_migracion = None
+            self._detener_migracion.clear()
+    
+    def cerrar(self):
+        if self._observador is not None:
+            self._observador.close()
+            self._observador = None
+        self._detener_hilo_migracion()
+        if self._hilo_instantaneas is not None:
+            self._detener_instantaneas.set()
+            self._hilo_instantaneas.join()
+            self._hilo_instantaneas = None
+        # Primero se vuelcan los servicios del WAL para que la instantánea vea los archivos finales
+        self.aplicar_wal()
+        self.guardar_instantanea()
+        if self._almacen_log is not None:
+            self._almacen_log.close()
+        if self._wal is not None:
+            self._wal.close()
+        self._cargador.close()
+        if self._exportador_metricas is not None:
+            self._exportador_metricas.close()
+            self._exportador_metricas = None
+    
     def __str__(self):
         return f"ClienteManager(clientes_en_cache={len(self._cache_clientes)})"
     
@@ -175,12 +996,4 @@ class ClienteManager:
         return f"ClienteManager(cache_size={len(self._cache_clientes)}, directorio='{self.directorio_datos}')"
 
 def normalizar_nombre(nombre: str) -> str:
-    import re
-    try:
-        cliente_temp = Cliente(nombre=nombre, telefono="0000000000", email="temp@temp.com")
-        return cliente_temp.nombre_normalizado
-    except ErrorValidacion:
-        normalizado = nombre.lower().strip()
-        normalizado = normalizado.replace(' ', '_')
-        normalizado = re.sub(r'[^a-z0-9_]', '', normalizado)
-        return normalizado
\ No newline at end of file
+    return normalize_accented(nombre)
\ No newline at end of file
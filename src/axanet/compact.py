@@ -0,0 +1,214 @@
+"""
+Compact In-Memory Representation for Axanet Client Manager
+==========================================================
+
+This module holds the building blocks that keep cached clients small:
+dates packed into integers and service histories stored in arrays instead
+of one Python object per service.
+
+Classes:
+--------
+- ServiceList: List-like container that stores services column by column
+
+Functions:
+----------
+- pack_day / unpack_day: "YYYY-MM-DD" <-> days since 1970-01-01
+- pack_timestamp / unpack_timestamp: "YYYY-MM-DD HH:MM:SS" <-> seconds since 1970-01-01
+- pack_datetime / unpack_datetime: naive datetime <-> microseconds since 1970-01-01
+
+Educational Notes for Students:
+-------------------------------
+1. Every ordinary Python object carries a ``__dict__``; declaring
+   ``__slots__`` replaces it with fixed fields and saves around 100 bytes
+   per object
+2. A date written as text costs ~60 bytes as a string object; the same date
+   as an integer inside an ``array`` costs 8 bytes
+3. Storing a list of services as two parallel columns (descriptions and
+   dates) means no per-service object exists until someone reads one
+4. ``sys.intern`` makes equal strings share one object; service
+   descriptions repeat a lot ("Instalación", "Soporte") so this saves memory
+5. Values that cannot be packed exactly are kept as they are, so packing
+   never changes what is read back
+6. Parsing dates is on the hot path of every file load. The day part is
+   memoized (a data set only spans a few thousand distinct days) and the
+   clock part is read with small lookup tables instead of ``datetime``
+"""
+
+import sys
+from array import array
+from collections.abc import MutableSequence
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_DAY_CACHE_SIZE = 8192
+# "HH" / "MM" / "SS" -> seconds; anything out of range is simply missing
+_HOUR_SECONDS = {f"{hour:02d}": hour * 3600 for hour in range(24)}
+_MINUTE_SECONDS = {f"{minute:02d}": minute * 60 for minute in range(60)}
+_SECONDS = {f"{second:02d}": second for second in range(60)}
+
+
+@lru_cache(maxsize=_DAY_CACHE_SIZE)
+def pack_day(text: str) -> Optional[int]:
+    """
+    Pack a "YYYY-MM-DD" date into days since 1970-01-01.
+
+    Returns:
+        Optional[int]: Day number, or None if ``text`` is not exactly a valid date
+    """
+    if (len(text) != 10 or not text.isascii() or text[4] != "-" or text[7] != "-"
+            or not (text[:4] + text[5:7] + text[8:]).isdigit()):
+        return None
+    try:
+        return date(int(text[:4]), int(text[5:7]), int(text[8:])).toordinal() - _EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+def unpack_day(days: int) -> str:
+    """Format a day number from ``pack_day`` back as "YYYY-MM-DD"."""
+    return date.fromordinal(days + _EPOCH_ORDINAL).isoformat()
+
+
+def pack_timestamp(text: str) -> Optional[int]:
+    """
+    Pack a "YYYY-MM-DD HH:MM:SS" timestamp into seconds since 1970-01-01.
+
+    Returns:
+        Optional[int]: Seconds, or None if ``text`` is not exactly in that format
+    """
+    if len(text) != 19 or text[10] != " " or text[13] != ":" or text[16] != ":":
+        return None
+    days = pack_day(text[:10])
+    hours = _HOUR_SECONDS.get(text[11:13])
+    minutes = _MINUTE_SECONDS.get(text[14:16])
+    seconds = _SECONDS.get(text[17:])
+    if days is None or hours is None or minutes is None or seconds is None:
+        return None
+    return days * 86400 + hours + minutes + seconds
+
+
+def unpack_timestamp(seconds: int) -> str:
+    """Format seconds from ``pack_timestamp`` back as "YYYY-MM-DD HH:MM:SS"."""
+    return (_EPOCH + timedelta(seconds=seconds)).isoformat(" ")
+
+
+def pack_datetime(moment: Any) -> Optional[int]:
+    """
+    Pack a naive datetime into microseconds since 1970-01-01.
+
+    Returns:
+        Optional[int]: Microseconds, or None for anything else (e.g. aware datetimes)
+    """
+    if type(moment) is not datetime or moment.tzinfo is not None:
+        return None
+    return (moment - _EPOCH) // _ONE_MICROSECOND
+
+
+def unpack_datetime(microseconds: int) -> datetime:
+    """Turn microseconds from ``pack_datetime`` back into a datetime."""
+    return _EPOCH + timedelta(microseconds=microseconds)
+
+
+class ServiceList(MutableSequence):
+    """
+    List of services stored as a description column and a date column.
+
+    Items are packed when added and rebuilt when read, so it behaves like
+    a ``list`` of service objects while holding only interned strings and
+    one 8-byte integer per service. The item class decides how to pack
+    itself by providing:
+
+    - ``_compact(self) -> Optional[Tuple[str, int]]``: (description, ticks),
+      or None if the item cannot be packed exactly
+    - ``_from_compact(cls, description, ticks)``: rebuild an item
+
+    Items that cannot be packed are stored unchanged.
+
+    Args:
+        item_type (type): Service class (``Servicio`` or ``Service``)
+        items (Iterable, optional): Initial services
+
+    Educational Note:
+        Reading an item creates a new object each time, so changing an
+        attribute of a service read from the list does not change the
+        list. Replace the item (``services[i] = new_service``) instead.
+    """
+
+    __slots__ = ("_item_type", "_descriptions", "_ticks")
+
+    # Tick value marking an item stored unchanged in ``_descriptions``
+    _UNPACKED = -(2 ** 63)
+
+    def __init__(self, item_type: type, items: Iterable[Any] = ()):
+        self._item_type = item_type
+        self._descriptions: list = []
+        self._ticks = array("q")
+        for item in items:
+            self.append(item)
+
+    def _pack(self, item: Any) -> Tuple[Any, int]:
+        packed = item._compact()
+        if packed is None:
+            return item, self._UNPACKED
+        description, ticks = packed
+        if type(description) is str:
+            description = sys.intern(description)
+        return description, ticks
+
+    def _unpack(self, description: Any, ticks: int) -> Any:
+        if ticks == self._UNPACKED:
+            return description
+        return self._item_type._from_compact(description, ticks)
+
+    def append_compact(self, description: str, ticks: int) -> None:
+        """Append an already packed service (used by parsers and loaders)."""
+        self._descriptions.append(sys.intern(description))
+        self._ticks.append(ticks)
+
+    def append(self, item: Any) -> None:
+        description, ticks = self._pack(item)
+        self._descriptions.append(description)
+        self._ticks.append(ticks)
+
+    def insert(self, index: int, item: Any) -> None:
+        description, ticks = self._pack(item)
+        self._descriptions.insert(index, description)
+        self._ticks.insert(index, ticks)
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._unpack(d, t) for d, t in zip(self._descriptions[index], self._ticks[index])]
+        return self._unpack(self._descriptions[index], self._ticks[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            packed = [self._pack(item) for item in value]
+            self._descriptions[index] = [description for description, _ in packed]
+            self._ticks[index] = array("q", [ticks for _, ticks in packed])
+            return
+        self._descriptions[index], self._ticks[index] = self._pack(value)
+
+    def __delitem__(self, index) -> None:
+        del self._descriptions[index]
+        del self._ticks[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        unpack = self._unpack
+        for description, ticks in zip(self._descriptions, self._ticks):
+            yield unpack(description, ticks)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ServiceList, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
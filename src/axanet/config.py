@@ -30,21 +30,144 @@ Design Patterns Used:
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
+from .keyindex import MODES as KEY_INDEX_MODES
+from .layout import MAX_SHARD_DEPTH, client_file_path
+from .metrics import FORMATS as METRICS_FORMATS
+
 
 @dataclass
 class DatabaseConfig:
-    """Configuration for file-based data storage."""
+    """
+    Configuration for file-based data storage.
+
+    ``storage_backend`` selects how client records are persisted:
+    "files" keeps one text file per client, "log" appends every record
+    to a segmented log (see ``storage.LogStorage``). A log directory can
+    only be open in one process at a time.
+
+    ``lazy_loading`` makes ``ClientManager`` enumerate client names at
+    startup and parse each client on first access; ``lazy_warmup`` then
+    fills the cache from a background thread.
+
+    ``cache_capacity`` bounds how many clients each manager keeps in memory
+    (0 means unbounded) and ``cache_policy`` picks the eviction policy,
+    "lru" or "arc".
+
+    ``loader_workers`` sets how many threads (and processes, when
+    ``loader_use_processes`` is on) bulk loading uses; 0 means one per core.
+
+    With ``snapshot_enabled`` the managers save their cache to a binary
+    snapshot on close (and every ``snapshot_interval_seconds`` if > 0) and
+    restore unchanged clients from it at startup. Only the "files" backend
+    supports snapshots, since staleness is checked per text file.
+
+    ``trust_stored_data`` skips re-validating clients read back from disk
+    (the Spanish ``Cliente`` model validates on every parse otherwise);
+    only enable it when the data directory is written by this application.
+
+    ``async_workers`` sizes the thread pool ``AsyncClientManager`` uses for
+    blocking file I/O; 0 means one per core plus four (at most 32).
+
+    ``lock_stripes`` is the number of per-client locks each manager shares
+    out by name hash (see ``locks.StripedLock``).
+
+    Client files are always replaced atomically (temporary file + rename).
+    ``durable_writes`` also fsyncs every write before it returns, with either
+    storage backend; turning it off is faster but a power cut can lose the
+    latest changes.
+
+    With ``wal_enabled`` (and the "files" backend) adding a service appends
+    one record to a write-ahead log instead of rewriting the client file
+    (see ``wal.WriteAheadLog``). The logged services are folded into the
+    files every ``wal_checkpoint_interval_seconds``, as soon as
+    ``wal_checkpoint_records`` are pending, on close and on the next start.
+
+    ``shard_depth`` spreads client files over hashed subdirectories
+    (``ab/cd/<name>.txt`` at depth 2; see ``layout.ClientFileLayout``) so no
+    directory grows too large. It applies to a new data directory; an
+    existing one keeps its recorded layout until it is migrated.
+
+    With ``watch_enabled`` (and the "files" backend) the manager watches the
+    data directory and refreshes only the clients whose files another
+    process changed (see ``watcher.DirectoryWatcher``). ``watch_backend``
+    is "inotify", "polling" or "auto"; polling scans every
+    ``watch_poll_interval_seconds``.
+
+    ``existence_index`` keeps the names of the stored clients in memory so
+    a duplicate check of a stored name needs no file system call (see
+    ``keyindex.KeyIndex``); names not in the index are always confirmed on
+    disk. "set" is exact, "bloom" uses about 10 bits per client at a
+    ``bloom_false_positive_rate`` of 1% but confirms every answer on disk,
+    "none" asks the file system. The index needs ``watch_enabled`` (it
+    learns about other processes' deletions from the watcher): from the
+    environment it defaults to "set" with the watcher and "none" without,
+    and ``ClienteManager`` ignores it when the watcher is off.
+
+    ``ClienteManager`` can remember names it looked up and did not find for
+    ``negative_cache_ttl_seconds`` (0, the default, turns it off), up to
+    ``negative_cache_capacity`` names; creating a client forgets it at once
+    (see ``cache.NegativeCache``). A client created by another process
+    stays hidden until the TTL runs out, unless ``watch_enabled`` reports
+    it sooner, so only turn it on where that delay is acceptable.
+    ``ClientManager`` answers misses from its set of known names and does
+    not need it.
+
+    With ``metrics_enabled`` every manager operation is timed (latency
+    histograms with p50/p95/p99, error counts) alongside the cache, index
+    and watcher counters (see ``metrics.MetricsRegistry``). They are written
+    to ``metrics_file`` in ``metrics_format`` ("prometheus" or "json") every
+    ``metrics_interval_seconds`` and on close, and served on
+    ``127.0.0.1:metrics_port`` when a port is given.
+    """
     base_directory: str = "axanet_clients_data"
     file_extension: str = ".txt"
     encoding: str = "utf-8"
+    storage_backend: str = "files"
+    log_segment_size_mb: int = 64
+    log_compaction_interval_seconds: int = 300
+    log_compaction_min_dead_ratio: float = 0.5
+    lazy_loading: bool = False
+    lazy_warmup: bool = True
+    cache_capacity: int = 0
+    cache_policy: str = "lru"
+    loader_workers: int = 0
+    loader_use_processes: bool = False
+    snapshot_enabled: bool = False
+    snapshot_file: str = "cache_snapshot.bin"
+    snapshot_interval_seconds: int = 0
+    trust_stored_data: bool = False
+    async_workers: int = 0
+    lock_stripes: int = 64
+    durable_writes: bool = True
+    wal_enabled: bool = False
+    wal_checkpoint_interval_seconds: int = 60
+    wal_checkpoint_records: int = 10000
+    shard_depth: int = 0
+    watch_enabled: bool = False
+    watch_backend: str = "auto"
+    watch_poll_interval_seconds: float = 2.0
+    existence_index: str = "none"
+    bloom_false_positive_rate: float = 0.01
+    negative_cache_ttl_seconds: float = 0.0
+    negative_cache_capacity: int = 10000
+    metrics_enabled: bool = False
+    metrics_file: str = ""
+    metrics_format: str = "prometheus"
+    metrics_interval_seconds: int = 60
+    metrics_port: int = 0
     
     @property
     def full_path(self) -> Path:
         """Get the full path to the data directory."""
         return Path(self.base_directory).resolve()
+    
+    @property
+    def snapshot_path(self) -> Path:
+        """Get the snapshot file path (relative names live in the data directory)."""
+        return self.full_path / self.snapshot_file
 
 
 @dataclass
@@ -72,8 +195,8 @@ class AppConfig:
     environment: str = "development"
     
     # Component configurations
-    database: DatabaseConfig = DatabaseConfig()
-    logging: LoggingConfig = LoggingConfig()
+    database: DatabaseConfig = field(default_factory=DatabaseConfig)
+    logging: LoggingConfig = field(default_factory=LoggingConfig)
 
 
 class ConfigManager:
@@ -124,7 +247,43 @@ class ConfigManager:
         db_config = DatabaseConfig(
             base_directory=os.getenv("AXANET_DATA_DIR", "axanet_clients_data"),
             file_extension=os.getenv("AXANET_FILE_EXT", ".txt"),
-            encoding=os.getenv("AXANET_ENCODING", "utf-8")
+            encoding=os.getenv("AXANET_ENCODING", "utf-8"),
+            storage_backend=os.getenv("AXANET_STORAGE_BACKEND", "files"),
+            log_segment_size_mb=self._get_int_env("AXANET_SEGMENT_SIZE_MB", 64),
+            log_compaction_interval_seconds=self._get_int_env("AXANET_COMPACTION_INTERVAL_SECONDS", 300),
+            log_compaction_min_dead_ratio=self._get_float_env("AXANET_COMPACTION_DEAD_RATIO", 0.5),
+            lazy_loading=self._get_bool_env("AXANET_LAZY_LOADING", False),
+            lazy_warmup=self._get_bool_env("AXANET_LAZY_WARMUP", True),
+            cache_capacity=self._get_int_env("AXANET_CACHE_CAPACITY", 0),
+            cache_policy=os.getenv("AXANET_CACHE_POLICY", "lru"),
+            loader_workers=self._get_int_env("AXANET_LOADER_WORKERS", 0),
+            loader_use_processes=self._get_bool_env("AXANET_LOADER_PROCESSES", False),
+            snapshot_enabled=self._get_bool_env("AXANET_SNAPSHOT_ENABLED", False),
+            snapshot_file=os.getenv("AXANET_SNAPSHOT_FILE", "cache_snapshot.bin"),
+            snapshot_interval_seconds=self._get_int_env("AXANET_SNAPSHOT_INTERVAL_SECONDS", 0),
+            trust_stored_data=self._get_bool_env("AXANET_TRUST_STORED_DATA", False),
+            async_workers=self._get_int_env("AXANET_ASYNC_WORKERS", 0),
+            lock_stripes=self._get_int_env("AXANET_LOCK_STRIPES", 64),
+            durable_writes=self._get_bool_env("AXANET_DURABLE_WRITES", True),
+            wal_enabled=self._get_bool_env("AXANET_WAL_ENABLED", False),
+            wal_checkpoint_interval_seconds=self._get_int_env("AXANET_WAL_CHECKPOINT_SECONDS", 60),
+            wal_checkpoint_records=self._get_int_env("AXANET_WAL_CHECKPOINT_RECORDS", 10000),
+            shard_depth=self._get_int_env("AXANET_SHARD_DEPTH", 0),
+            watch_enabled=self._get_bool_env("AXANET_WATCH_ENABLED", False),
+            watch_backend=os.getenv("AXANET_WATCH_BACKEND", "auto"),
+            watch_poll_interval_seconds=self._get_float_env("AXANET_WATCH_POLL_SECONDS", 2.0),
+            existence_index=os.getenv(
+                "AXANET_EXISTENCE_INDEX",
+                "set" if self._get_bool_env("AXANET_WATCH_ENABLED", False) else "none"
+            ),
+            bloom_false_positive_rate=self._get_float_env("AXANET_BLOOM_FP_RATE", 0.01),
+            negative_cache_ttl_seconds=self._get_float_env("AXANET_NEGATIVE_CACHE_TTL_SECONDS", 0.0),
+            negative_cache_capacity=self._get_int_env("AXANET_NEGATIVE_CACHE_CAPACITY", 10000),
+            metrics_enabled=self._get_bool_env("AXANET_METRICS_ENABLED", False),
+            metrics_file=os.getenv("AXANET_METRICS_FILE", ""),
+            metrics_format=os.getenv("AXANET_METRICS_FORMAT", "prometheus"),
+            metrics_interval_seconds=self._get_int_env("AXANET_METRICS_INTERVAL_SECONDS", 60),
+            metrics_port=self._get_int_env("AXANET_METRICS_PORT", 0)
         )
         
         # Logging configuration  
@@ -162,6 +321,13 @@ class ConfigManager:
         except ValueError:
             return default
     
+    def _get_float_env(self, key: str, default: float) -> float:
+        """Get float value from environment variable."""
+        try:
+            return float(os.getenv(key, str(default)))
+        except ValueError:
+            return default
+    
     def _validate_config(self, config: AppConfig) -> None:
         """
         Validate configuration values.
@@ -192,6 +358,83 @@ class ConfigManager:
         if not config.database.file_extension.startswith('.'):
             raise ValueError("File extension must start with a dot")
         
+        # Validate storage backend
+        valid_backends = ["files", "log"]
+        if config.database.storage_backend not in valid_backends:
+            raise ValueError(f"Invalid storage backend: {config.database.storage_backend}. "
+                           f"Must be one of: {valid_backends}")
+        
+        if config.database.log_segment_size_mb <= 0:
+            raise ValueError("Log segment size must be positive")
+        
+        if not 0.0 <= config.database.log_compaction_min_dead_ratio <= 1.0:
+            raise ValueError("Compaction dead ratio must be between 0 and 1")
+        
+        # Validate cache settings
+        valid_cache_policies = ["lru", "arc"]
+        if config.database.cache_policy not in valid_cache_policies:
+            raise ValueError(f"Invalid cache policy: {config.database.cache_policy}. "
+                           f"Must be one of: {valid_cache_policies}")
+        
+        if config.database.cache_capacity < 0:
+            raise ValueError("Cache capacity cannot be negative")
+        
+        if config.database.loader_workers < 0:
+            raise ValueError("Loader worker count cannot be negative")
+        
+        if config.database.snapshot_interval_seconds < 0:
+            raise ValueError("Snapshot interval cannot be negative")
+        
+        if config.database.async_workers < 0:
+            raise ValueError("Async worker count cannot be negative")
+        
+        if config.database.lock_stripes <= 0:
+            raise ValueError("Lock stripe count must be positive")
+        
+        if config.database.wal_checkpoint_interval_seconds < 0:
+            raise ValueError("WAL checkpoint interval cannot be negative")
+        
+        if config.database.wal_checkpoint_records < 0:
+            raise ValueError("WAL checkpoint record count cannot be negative")
+
+        if not 0 <= config.database.shard_depth <= MAX_SHARD_DEPTH:
+            raise ValueError(f"Shard depth must be between 0 and {MAX_SHARD_DEPTH}")
+
+        valid_watch_backends = ["auto", "inotify", "polling"]
+        if config.database.watch_backend not in valid_watch_backends:
+            raise ValueError(f"Invalid watch backend: {config.database.watch_backend}. "
+                           f"Must be one of: {valid_watch_backends}")
+
+        if config.database.watch_poll_interval_seconds <= 0:
+            raise ValueError("Watch poll interval must be positive")
+
+        if config.database.existence_index not in KEY_INDEX_MODES:
+            raise ValueError(f"Invalid existence index: {config.database.existence_index}. "
+                           f"Must be one of: {list(KEY_INDEX_MODES)}")
+
+        if config.database.existence_index != "none" and not config.database.watch_enabled:
+            raise ValueError("The existence index needs watch_enabled: without the watcher it "
+                             "cannot see clients that other processes delete")
+
+        if not 0 < config.database.bloom_false_positive_rate < 1:
+            raise ValueError("Bloom filter false positive rate must be between 0 and 1")
+
+        if config.database.negative_cache_ttl_seconds < 0:
+            raise ValueError("Negative cache TTL cannot be negative")
+
+        if config.database.negative_cache_capacity <= 0:
+            raise ValueError("Negative cache capacity must be positive")
+
+        if config.database.metrics_format not in METRICS_FORMATS:
+            raise ValueError(f"Invalid metrics format: {config.database.metrics_format}. "
+                           f"Must be one of: {list(METRICS_FORMATS)}")
+
+        if config.database.metrics_interval_seconds < 0:
+            raise ValueError("Metrics interval cannot be negative")
+
+        if not 0 <= config.database.metrics_port <= 65535:
+            raise ValueError("Metrics port must be between 0 and 65535")
+        
         # Validate numeric values
         if config.logging.max_file_size_mb <= 0:
             raise ValueError("Log file max size must be positive")
@@ -223,10 +466,19 @@ class ConfigManager:
             normalized_name (str): Normalized client name
             
         Returns:
-            Path: Full path to client file
+            Path: Full path to client file under the configured ``shard_depth``
+            
+        Educational Note:
+            This is a pure computation from the settings. A running manager
+            asks its ``layout.ClientFileLayout`` instead, which knows the
+            layout actually recorded in the data directory.
         """
-        filename = f"{normalized_name}{self.config.database.file_extension}"
-        return self.get_data_directory() / filename
+        return client_file_path(
+            self.get_data_directory(),
+            normalized_name,
+            self.config.database.file_extension,
+            self.config.database.shard_depth
+        )
     
     def reload_config(self) -> None:
         """Reload configuration from environment variables."""
@@ -252,6 +504,39 @@ class ConfigManager:
                 "base_directory": self.config.database.base_directory,
                 "file_extension": self.config.database.file_extension,
                 "encoding": self.config.database.encoding,
+                "storage_backend": self.config.database.storage_backend,
+                "log_segment_size_mb": self.config.database.log_segment_size_mb,
+                "log_compaction_interval_seconds": self.config.database.log_compaction_interval_seconds,
+                "log_compaction_min_dead_ratio": self.config.database.log_compaction_min_dead_ratio,
+                "lazy_loading": self.config.database.lazy_loading,
+                "lazy_warmup": self.config.database.lazy_warmup,
+                "cache_capacity": self.config.database.cache_capacity,
+                "cache_policy": self.config.database.cache_policy,
+                "loader_workers": self.config.database.loader_workers,
+                "loader_use_processes": self.config.database.loader_use_processes,
+                "snapshot_enabled": self.config.database.snapshot_enabled,
+                "snapshot_file": self.config.database.snapshot_file,
+                "snapshot_interval_seconds": self.config.database.snapshot_interval_seconds,
+                "trust_stored_data": self.config.database.trust_stored_data,
+                "async_workers": self.config.database.async_workers,
+                "lock_stripes": self.config.database.lock_stripes,
+                "durable_writes": self.config.database.durable_writes,
+                "wal_enabled": self.config.database.wal_enabled,
+                "wal_checkpoint_interval_seconds": self.config.database.wal_checkpoint_interval_seconds,
+                "wal_checkpoint_records": self.config.database.wal_checkpoint_records,
+                "shard_depth": self.config.database.shard_depth,
+                "watch_enabled": self.config.database.watch_enabled,
+                "watch_backend": self.config.database.watch_backend,
+                "watch_poll_interval_seconds": self.config.database.watch_poll_interval_seconds,
+                "existence_index": self.config.database.existence_index,
+                "bloom_false_positive_rate": self.config.database.bloom_false_positive_rate,
+                "negative_cache_ttl_seconds": self.config.database.negative_cache_ttl_seconds,
+                "negative_cache_capacity": self.config.database.negative_cache_capacity,
+                "metrics_enabled": self.config.database.metrics_enabled,
+                "metrics_file": self.config.database.metrics_file,
+                "metrics_format": self.config.database.metrics_format,
+                "metrics_interval_seconds": self.config.database.metrics_interval_seconds,
+                "metrics_port": self.config.database.metrics_port,
                 "full_path": str(self.config.database.full_path)
             },
             "logging": {
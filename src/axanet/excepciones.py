@@ -1,5 +1,5 @@
 class ClienteError(Exception):
-    def __init__(self, mensaje: str, nombre_cliente: str):
+    def __init__(self, mensaje: str, nombre_cliente: str = ""):
         super().__init__(mensaje)
         self.mensaje = mensaje
         self.nombre_cliente = nombre_cliente
@@ -15,8 +15,9 @@ class ClienteExisteError(ClienteError):
         super().__init__(mensaje, nombre_cliente)
 
 class ErrorValidacion(ClienteError):
-    def __init__(self, campo: str, motivo: str):
+    def __init__(self, campo: str, motivo: str, valor: str = ""):
         self.campo = campo
+        self.valor = valor
         self.motivo = motivo
         super().__init__(f"Error de validación en {campo}: {motivo}")
 
@@ -44,7 +44,7 @@ class ClientError(Exception):
         client_name (str, optional): Name of the client involved in the error
     """
     
-    def __init__(self, message: str, client_name: str):
+    def __init__(self, message: str, client_name: str = ""):
         super().__init__(message)
         self.message = message
         self.client_name = client_name
@@ -0,0 +1,403 @@
+"""
+Streaming Export for Axanet Client Manager
+==========================================
+
+This module dumps the whole client base to CSV, JSON Lines or a compact
+columnar file. Clients are read in key order, one window at a time, and
+written straight out, so memory use does not grow with the number of
+clients and the manager's cache is left untouched.
+
+Functions:
+----------
+- client_row: Flatten a client into one row
+- service_rows: Flatten a client into one row per service ("explode" mode)
+- export_clients: Run an export, optionally resuming from a checkpoint
+- read_columnar: Read the rows of a columnar export back
+
+Classes:
+--------
+- ExportReport: Counters describing an export run
+- ColumnarWriter: Writer for the compact columnar format
+
+Educational Notes for Students:
+-------------------------------
+1. Exporting in a fixed order (the normalized name) makes the last exported
+   key a "cursor": everything up to it is done, everything after is not
+2. The checkpoint stores the cursor together with the output size at that
+   moment; resuming cuts the file back to that size, so rows written after
+   the last checkpoint are never duplicated
+3. Columnar files store each column contiguously; values in one column are
+   alike (dates, phone prefixes), so dictionary encoding plus compression
+   shrinks them much more than row-by-row text
+4. Rows are grouped into "row groups" (as in Parquet) so a reader never needs
+   more than one group in memory
+
+Columnar layout (little endian):
+--------------------------------
+    file header:  magic "AXCOL\\0\\1\\0", uint32 schema length, schema JSON
+    row group:    magic "AXRG", uint32 rows, uint32 raw length,
+                  uint32 compressed length, uint32 crc32, zlib payload
+    payload:      per column: uint32 distinct values, uint8 index width,
+                  uint32[distinct] value lengths, utf-8 values, indexes
+"""
+
+import csv
+import json
+import os
+import struct
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .modelos import Cliente
+from .storage import write_files_durably
+
+
+FORMATS = ("csv", "jsonl", "columnar")
+
+CLIENT_COLUMNS = (
+    "nombre_normalizado", "nombre", "id_cliente", "telefono", "email",
+    "fecha_registro", "total_servicios", "servicios",
+)
+SERVICE_COLUMNS = (
+    "nombre_normalizado", "nombre", "id_cliente", "telefono", "email",
+    "fecha_registro", "descripcion_servicio", "fecha_servicio",
+)
+
+COLUMNAR_MAGIC = b"AXCOL\x00\x01\x00"
+_ROW_GROUP_MAGIC = b"AXRG"
+_SCHEMA_LENGTH = struct.Struct("<I")
+_ROW_GROUP_HEADER = struct.Struct("<4sIIII")
+_COLUMN_HEADER = struct.Struct("<IB")
+
+
+@dataclass
+class ExportReport:
+    """
+    Counters describing an export run.
+
+    Attributes:
+        clients (int): Clients exported (including those of a resumed run)
+        rows (int): Rows written (one per service in explode mode)
+        cursor (str, optional): Normalized name of the last exported client
+        elapsed_seconds (float): Time spent in this run
+    """
+    clients: int = 0
+    rows: int = 0
+    cursor: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Average throughput of this run."""
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def detect_format(path: Path) -> str:
+    """Guess the export format from the file extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix in (".axcol", ".col"):
+        return "columnar"
+    return "csv"
+
+
+def client_row(key: str, cliente: Cliente) -> Dict[str, Any]:
+    """Flatten a client into one row; services become a list of objects."""
+    return {
+        "nombre_normalizado": key,
+        "nombre": cliente.nombre,
+        "id_cliente": cliente.id_cliente,
+        "telefono": cliente.telefono,
+        "email": cliente.email,
+        "fecha_registro": cliente.fecha_registro,
+        "total_servicios": len(cliente.servicios),
+        "servicios": [
+            {"descripcion": servicio.descripcion, "fecha": servicio.fecha_solicitud}
+            for servicio in cliente.servicios
+        ],
+    }
+
+
+def service_rows(key: str, cliente: Cliente) -> List[Dict[str, Any]]:
+    """Flatten a client into one row per service (no rows if it has none)."""
+    base = {
+        "nombre_normalizado": key,
+        "nombre": cliente.nombre,
+        "id_cliente": cliente.id_cliente,
+        "telefono": cliente.telefono,
+        "email": cliente.email,
+        "fecha_registro": cliente.fecha_registro,
+    }
+    return [
+        dict(base, descripcion_servicio=servicio.descripcion, fecha_servicio=servicio.fecha_solicitud)
+        for servicio in cliente.servicios
+    ]
+
+
+def _text(value: Any) -> str:
+    """Render a cell for formats that only hold text."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class _CsvWriter:
+    def __init__(self, handle, columns: Tuple[str, ...], write_header: bool):
+        self._writer = csv.writer(handle)
+        if write_header:
+            self._writer.writerow(columns)
+        self._columns = columns
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows([_text(row[column]) for column in self._columns] for row in rows)
+
+    def flush(self) -> None:
+        pass
+
+
+class _JsonlWriter:
+    def __init__(self, handle, columns: Tuple[str, ...], write_header: bool):
+        self._handle = handle
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._handle.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+    def flush(self) -> None:
+        pass
+
+
+class ColumnarWriter:
+    """
+    Writer for the compact columnar format.
+
+    Rows are buffered until ``row_group_size`` is reached (or ``flush`` is
+    called) and then written as one dictionary-encoded, zlib-compressed
+    row group.
+
+    Args:
+        handle: Binary file object opened for writing or appending
+        columns (Tuple[str, ...]): Column names
+        write_header (bool): Write the file header (False when appending)
+        row_group_size (int): Rows per row group
+    """
+
+    def __init__(self, handle, columns: Tuple[str, ...], write_header: bool, row_group_size: int = 10_000):
+        self._handle = handle
+        self._columns = columns
+        self.row_group_size = row_group_size
+        self._buffer: List[List[str]] = [[] for _ in columns]
+        if write_header:
+            schema = json.dumps({"columns": list(columns)}).encode("utf-8")
+            handle.write(COLUMNAR_MAGIC + _SCHEMA_LENGTH.pack(len(schema)) + schema)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            for values, column in zip(self._buffer, self._columns):
+                values.append(_text(row[column]))
+        if len(self._buffer[0]) >= self.row_group_size:
+            self.flush()
+
+    @staticmethod
+    def _encode_column(values: List[str]) -> bytes:
+        ids: Dict[str, int] = {}
+        indexes = [ids.setdefault(value, len(ids)) for value in values]
+        encoded = [value.encode("utf-8") for value in ids]
+        typecode = "B" if len(ids) <= 0xFF else "H" if len(ids) <= 0xFFFF else "I"
+        return b"".join((
+            _COLUMN_HEADER.pack(len(ids), ord(typecode)),
+            array("I", [len(value) for value in encoded]).tobytes(),
+            b"".join(encoded),
+            array(typecode, indexes).tobytes(),
+        ))
+
+    def flush(self) -> None:
+        """Write buffered rows as one row group."""
+        rows = len(self._buffer[0])
+        if not rows:
+            return
+        raw = b"".join(self._encode_column(values) for values in self._buffer)
+        payload = zlib.compress(raw, 6)
+        self._handle.write(
+            _ROW_GROUP_HEADER.pack(_ROW_GROUP_MAGIC, rows, len(raw), len(payload), zlib.crc32(payload))
+        )
+        self._handle.write(payload)
+        self._buffer = [[] for _ in self._columns]
+
+
+def read_columnar(path: Path) -> Iterator[Dict[str, str]]:
+    """
+    Read the rows of a columnar export, one row group at a time.
+
+    Args:
+        path (Path): Columnar file
+
+    Yields:
+        Dict[str, str]: One row; list columns are JSON text
+
+    Raises:
+        ValueError: If the file is not a columnar export or is corrupt
+    """
+    with open(path, "rb") as handle:
+        if handle.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"Not a columnar export: {path}")
+        (schema_length,) = _SCHEMA_LENGTH.unpack(handle.read(_SCHEMA_LENGTH.size))
+        columns = json.loads(handle.read(schema_length))["columns"]
+
+        while True:
+            header = handle.read(_ROW_GROUP_HEADER.size)
+            if not header:
+                return
+            if len(header) != _ROW_GROUP_HEADER.size:
+                raise ValueError(f"Truncated row group header in {path}")
+            magic, rows, raw_length, payload_length, crc = _ROW_GROUP_HEADER.unpack(header)
+            payload = handle.read(payload_length)
+            if magic != _ROW_GROUP_MAGIC or len(payload) != payload_length or zlib.crc32(payload) != crc:
+                raise ValueError(f"Corrupt row group in {path}")
+            raw = memoryview(zlib.decompress(payload))
+
+            decoded = []
+            offset = 0
+            for _ in columns:
+                distinct, typecode = _COLUMN_HEADER.unpack_from(raw, offset)
+                offset += _COLUMN_HEADER.size
+                lengths = array("I")
+                lengths.frombytes(raw[offset:offset + distinct * 4])
+                offset += distinct * 4
+                values = []
+                for length in lengths:
+                    values.append(str(raw[offset:offset + length], "utf-8"))
+                    offset += length
+                indexes = array(chr(typecode))
+                indexes.frombytes(raw[offset:offset + rows * indexes.itemsize])
+                offset += rows * indexes.itemsize
+                decoded.append([values[index] for index in indexes])
+
+            for row_values in zip(*decoded):
+                yield dict(zip(columns, row_values))
+
+
+def _read_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_checkpoint(path: Path, state: Dict[str, Any]) -> None:
+    # Synced like the output it describes, through a unique temporary file
+    failures = write_files_durably([(Path(path), json.dumps(state))])
+    if failures:
+        raise next(iter(failures.values()))
+
+
+def export_clients(
+    manager,
+    path: Path,
+    file_format: Optional[str] = None,
+    explode: bool = False,
+    after: Optional[str] = None,
+    checkpoint_path: Optional[Path] = None,
+    resume: bool = False,
+    checkpoint_every: int = 10_000,
+    on_progress: Optional[Callable[[ExportReport], None]] = None
+) -> ExportReport:
+    """
+    Export every client of a ``ClienteManager`` in normalized-name order.
+
+    Args:
+        manager (ClienteManager): Source store
+        path (Path): Output file
+        file_format (str, optional): "csv", "jsonl" or "columnar" (default: from extension)
+        explode (bool): Write one row per service instead of one per client
+        after (str, optional): Only export clients whose key sorts after this cursor
+        checkpoint_path (Path, optional): File where the cursor and output
+            size are saved every ``checkpoint_every`` clients
+        resume (bool): Continue the export recorded in ``checkpoint_path``,
+            truncating the output to the last checkpoint and appending
+        on_progress (Callable, optional): Called with the report at each checkpoint
+
+    Returns:
+        ExportReport: Final counters; ``cursor`` is the last exported key
+
+    Raises:
+        ValueError: If the checkpoint does not match the format or mode, or
+            the output it describes is missing or shorter than recorded
+            (resuming would silently leave out the clients before the cursor)
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    columns = SERVICE_COLUMNS if explode else CLIENT_COLUMNS
+    to_rows = service_rows if explode else (lambda key, cliente: [client_row(key, cliente)])
+
+    report = ExportReport(cursor=after)
+    offset = 0
+    if resume:
+        if checkpoint_path is None:
+            raise ValueError("Resuming an export needs a checkpoint file")
+        state = _read_checkpoint(checkpoint_path)
+        if state is not None:
+            if state.get("format") != file_format or state.get("explode") != explode:
+                raise ValueError("Checkpoint was written for a different format or mode")
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = -1
+            if size < state["offset"]:
+                raise ValueError(
+                    f"Cannot resume: {path} is missing or shorter than at the last checkpoint; "
+                    f"start the export again without resuming"
+                )
+            report.cursor = state["cursor"]
+            report.clients = state["clients"]
+            offset = state["offset"]
+
+    path = Path(path)
+    appending = resume and offset > 0 and path.exists()
+    binary = file_format == "columnar"
+    mode = ("r+b" if binary else "r+") if appending else ("wb" if binary else "w")
+    kwargs = {} if binary else {"encoding": "utf-8", "newline": ""}
+    writer_class = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "columnar": ColumnarWriter}[file_format]
+
+    started = time.perf_counter()
+    with open(path, mode, **kwargs) as handle:
+        if appending:
+            handle.truncate(offset)
+            handle.seek(offset)
+        writer = writer_class(handle, columns, write_header=not appending)
+
+        def checkpoint() -> None:
+            writer.flush()
+            handle.flush()
+            os.fsync(handle.fileno())
+            if checkpoint_path is not None:
+                _write_checkpoint(checkpoint_path, {
+                    "cursor": report.cursor,
+                    "clients": report.clients,
+                    "offset": handle.tell(),
+                    "format": file_format,
+                    "explode": explode,
+                })
+            report.elapsed_seconds = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(report)
+
+        since_checkpoint = 0
+        for key, cliente in manager.iterar_clientes_por_clave(despues_de=report.cursor):
+            rows = to_rows(key, cliente)
+            writer.write(rows)
+            report.rows += len(rows)
+            report.clients += 1
+            report.cursor = key
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                checkpoint()
+                since_checkpoint = 0
+        checkpoint()
+
+    return report
@@ -0,0 +1,320 @@
+"""
+Streaming Import for Axanet Client Manager
+==========================================
+
+This module loads clients (or services for existing clients) from CSV or
+JSON Lines files of any size. Rows flow through a chain of generators, so
+only one batch is in memory at a time no matter how big the file is.
+
+Pipeline:
+---------
+    read_rows -> validate_client_rows -> dedupe_clients -> batches -> crear_clientes_lote
+    read_rows -> validate_service_rows ---------------------> batches -> agregar_servicios_lote
+
+Functions:
+----------
+- read_rows: Parse a CSV or JSONL file into dictionaries
+- validate_client_rows: Build validated Cliente objects from rows
+- validate_service_rows: Check (name, service) rows
+- dedupe_clients: Drop rows whose normalized name was seen recently
+- batches: Group a stream into lists of a fixed size
+- import_file: Run the whole pipeline and report progress
+
+Classes:
+--------
+- ImportReport: Counters describing an import run
+
+Educational Notes for Students:
+-------------------------------
+1. A generator produces one item at a time and only when asked; chaining
+   generators builds a pipeline whose memory use does not depend on input size
+2. Every stage only knows about the stage before it, so stages can be tested,
+   replaced or reordered independently
+3. Errors are reported per row with its line number and the import keeps
+   going; one bad row should not throw away a multi-gigabyte load
+4. Writing in batches lets the manager sync the disk once per batch instead
+   of once per client
+"""
+
+import csv
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .modelos import Cliente
+
+
+T = TypeVar("T")
+
+# (line number, parsed row or None, error message or None)
+ParsedRow = Tuple[int, Optional[Dict[str, str]], Optional[str]]
+
+# Column names accepted for each field, Spanish first
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "nombre": ("nombre", "name"),
+    "telefono": ("telefono", "teléfono", "phone"),
+    "email": ("email", "correo", "e-mail"),
+    "servicio": ("servicio", "primer_servicio", "descripcion", "descripción", "service", "first_service", "description"),
+}
+
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class ImportReport:
+    """
+    Counters describing an import run.
+
+    Attributes:
+        rows_read (int): Data rows read from the file
+        written (int): Clients created or services added
+        duplicates (int): Rows skipped because the client appeared earlier in the file
+        errors (int): Rows rejected by parsing, validation or the store
+        elapsed_seconds (float): Time since the import started
+    """
+    rows_read: int = 0
+    written: int = 0
+    duplicates: int = 0
+    errors: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Average throughput so far."""
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to a dictionary."""
+        return {
+            "rows_read": self.rows_read,
+            "written": self.written,
+            "duplicates": self.duplicates,
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def detect_format(path: Path) -> str:
+    """Guess the file format from its extension (``.jsonl``/``.ndjson`` or CSV)."""
+    suffix = Path(path).suffix.lower()
+    return "jsonl" if suffix in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def _canonical_row(raw: Dict[str, Any]) -> Dict[str, str]:
+    """Map a row with any accepted column names onto the canonical field names."""
+    lowered = {str(key).strip().lower(): value for key, value in raw.items() if key is not None}
+    row = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            value = lowered.get(alias)
+            if value is not None:
+                row[field] = str(value)
+                break
+        else:
+            row[field] = ""
+    return row
+
+
+def read_rows(path: Path, file_format: Optional[str] = None, encoding: str = "utf-8-sig") -> Iterator[ParsedRow]:
+    """
+    Parse a CSV (with a header row) or JSON Lines file.
+
+    Args:
+        path (Path): Input file
+        file_format (str, optional): "csv" or "jsonl"; detected from the
+            extension when omitted
+        encoding (str): Text encoding; the default also skips a UTF-8 BOM
+
+    Yields:
+        ParsedRow: ``(line, row, None)`` or ``(line, None, error)``
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported import format: {file_format}")
+
+    with open(path, "r", encoding=encoding, newline="") as handle:
+        if file_format == "csv":
+            reader = csv.DictReader(handle)
+            for raw in reader:
+                yield reader.line_num, _canonical_row(raw), None
+            return
+
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(raw, dict):
+                yield line_number, None, "Expected a JSON object"
+                continue
+            yield line_number, _canonical_row(raw), None
+
+
+def validate_client_rows(rows: Iterable[ParsedRow]) -> Iterator[Tuple[int, Optional[Cliente], Optional[str]]]:
+    """
+    Turn parsed rows into validated clients carrying their first service.
+
+    Yields:
+        Tuple[int, Optional[Cliente], Optional[str]]: ``(line, client, None)``
+        or ``(line, None, error)``
+
+    Educational Note:
+        Creating a ``Cliente`` runs ``validar_datos``, so every client that
+        leaves this stage is valid and the manager does not check it again.
+    """
+    for line, row, error in rows:
+        if error is not None:
+            yield line, None, error
+            continue
+        try:
+            cliente = Cliente(nombre=row["nombre"], telefono=row["telefono"], email=row["email"])
+            cliente.agregar_servicio(row["servicio"])
+        except Exception as e:
+            yield line, None, str(e)
+            continue
+        yield line, cliente, None
+
+
+def validate_service_rows(rows: Iterable[ParsedRow]) -> Iterator[Tuple[int, Optional[Tuple[str, str]], Optional[str]]]:
+    """
+    Check (name, service) rows for existing clients.
+
+    Yields:
+        ``(line, (name, service), None)`` or ``(line, None, error)``
+    """
+    for line, row, error in rows:
+        if error is not None:
+            yield line, None, error
+        elif not row["nombre"].strip():
+            yield line, None, "Missing client name"
+        elif not row["servicio"].strip():
+            yield line, None, "Missing service description"
+        else:
+            yield line, (row["nombre"], row["servicio"]), None
+
+
+def dedupe_clients(
+    clients: Iterable[Tuple[int, Optional[Cliente], Optional[str]]],
+    window: int = 100_000
+) -> Iterator[Tuple[int, Optional[Cliente], Optional[str]]]:
+    """
+    Drop clients whose normalized name was already seen in the file.
+
+    Duplicates are passed through as ``(line, None, None)`` so the caller can
+    count them. Only the last ``window`` names are remembered, which keeps
+    memory bounded; an older duplicate is still rejected by the store,
+    because by then its first occurrence has been written.
+    """
+    seen: "OrderedDict[str, None]" = OrderedDict()
+    for line, cliente, error in clients:
+        if cliente is None:
+            yield line, None, error
+            continue
+        key = cliente.nombre_normalizado
+        if key in seen:
+            seen.move_to_end(key)
+            yield line, None, None
+            continue
+        seen[key] = None
+        if len(seen) > window:
+            seen.popitem(last=False)
+        yield line, cliente, None
+
+
+def batches(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group a stream into lists of at most ``size`` items."""
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_file(
+    manager,
+    path: Path,
+    file_format: Optional[str] = None,
+    mode: str = "clients",
+    batch_size: int = 1000,
+    dedupe_window: int = 100_000,
+    on_error: Optional[Callable[[int, str], None]] = None,
+    on_progress: Optional[Callable[[ImportReport], None]] = None,
+    progress_interval_seconds: float = 2.0
+) -> ImportReport:
+    """
+    Import a file into a ``ClienteManager``.
+
+    Args:
+        manager (ClienteManager): Destination store
+        path (Path): CSV or JSONL file
+        file_format (str, optional): "csv" or "jsonl" (default: from extension)
+        mode (str): "clients" creates clients (name, phone, email, service);
+            "services" adds services to existing clients (name, service)
+        batch_size (int): Rows written per batch (one disk sync each)
+        dedupe_window (int): Number of recent names remembered for deduplication
+        on_error (Callable, optional): Called with (line, message) for every rejected row
+        on_progress (Callable, optional): Called with the report at most once
+            per ``progress_interval_seconds`` and once at the end
+
+    Returns:
+        ImportReport: Final counters
+    """
+    if mode not in ("clients", "services"):
+        raise ValueError(f"Unsupported import mode: {mode}")
+
+    report = ImportReport()
+    started = time.perf_counter()
+    last_progress = started
+
+    def reject(line: int, message: str) -> None:
+        report.errors += 1
+        if on_error is not None:
+            on_error(line, message)
+
+    rows = read_rows(path, file_format)
+    if mode == "clients":
+        stream = dedupe_clients(validate_client_rows(rows), dedupe_window)
+        write_batch = manager.crear_clientes_lote
+    else:
+        stream = validate_service_rows(rows)
+        write_batch = manager.agregar_servicios_lote
+
+    for batch in batches(stream, batch_size):
+        report.rows_read += len(batch)
+        pending_lines: List[int] = []
+        pending_rows: List[Any] = []
+        for line, item, error in batch:
+            if item is not None:
+                pending_lines.append(line)
+                pending_rows.append(item)
+            elif error is not None:
+                reject(line, error)
+            else:
+                report.duplicates += 1
+
+        for line, result in zip(pending_lines, write_batch(pending_rows)):
+            if result["exito"]:
+                report.written += 1
+            else:
+                reject(line, result["error"])
+
+        now = time.perf_counter()
+        report.elapsed_seconds = now - started
+        if on_progress is not None and now - last_progress >= progress_interval_seconds:
+            on_progress(report)
+            last_progress = now
+
+    report.elapsed_seconds = time.perf_counter() - started
+    if on_progress is not None:
+        on_progress(report)
+    return report
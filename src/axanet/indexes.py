@@ -0,0 +1,258 @@
+"""
+In-Memory Indexes for Axanet Client Manager
+===========================================
+
+This module contains secondary indexes that let the client managers answer
+queries without scanning every client.
+
+Classes:
+--------
+- TrigramIndex: Substring search over name, email and phone
+- SortedNameIndex: Clients kept in name order for cursor-based listings
+
+Educational Notes for Students:
+-------------------------------
+1. A linear scan checks every client for every query: O(N) per search
+2. An inverted index maps each small piece of text (here, every 3-character
+   "trigram") to the set of clients that contain it
+3. Any substring of length >= 3 contains all of its own trigrams, so the
+   matching clients are inside the intersection of those posting lists
+4. The intersection can contain false positives (trigrams present but not
+   contiguous), so candidates are confirmed with a real substring check
+5. Keeping keys sorted as they are inserted means a listing never needs an
+   O(N log N) sort; it just walks the structure from a starting point
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over a few text fields per document.
+
+    Field values are lowercased once when a document is added, never at
+    query time. Queries shorter than three characters cannot use trigrams
+    and fall back to checking the stored lowercase fields.
+
+    Attributes:
+        _postings (Dict[str, Set[str]]): Trigram -> keys of documents containing it
+        _documents (Dict[str, Tuple[str, ...]]): Key -> lowercased field values
+        _sort_keys (Dict[str, str]): Key -> value used to order results
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, Tuple[str, ...]] = {}
+        self._sort_keys: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def _grams(cls, text: str) -> Set[str]:
+        size = cls.GRAM_SIZE
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+    def add(self, key: str, fields: Tuple[str, ...], sort_key: str) -> None:
+        """
+        Index a document, replacing any previous version of it.
+
+        Args:
+            key (str): Document key (normalized client name)
+            fields (Tuple[str, ...]): Searchable text values
+            sort_key (str): Value used to order search results
+        """
+        lowered = tuple(value.lower() for value in fields)
+        with self._lock:
+            if key in self._documents:
+                self.remove(key)
+            self._documents[key] = lowered
+            self._sort_keys[key] = sort_key
+            grams: Set[str] = set()
+            for value in lowered:
+                grams |= self._grams(value)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        """Remove a document from the index (no-op if it is not indexed)."""
+        with self._lock:
+            lowered = self._documents.pop(key, None)
+            self._sort_keys.pop(key, None)
+            if lowered is None:
+                return
+            for value in lowered:
+                for gram in self._grams(value):
+                    posting = self._postings.get(gram)
+                    if posting is not None:
+                        posting.discard(key)
+                        if not posting:
+                            del self._postings[gram]
+
+    def search(self, query: str, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[str], int]:
+        """
+        Find documents with a field containing ``query`` as a substring.
+
+        Args:
+            query (str): Text to look for (case-insensitive)
+            offset (int): Number of sorted results to skip
+            limit (int, optional): Maximum number of results to return
+
+        Returns:
+            Tuple[List[str], int]: Page of matching keys ordered by sort key,
+            and the total number of matches
+        """
+        query = query.lower().strip()
+        with self._lock:
+            if len(query) < self.GRAM_SIZE:
+                candidates = self._documents.keys()
+            else:
+                postings = []
+                for gram in self._grams(query):
+                    posting = self._postings.get(gram)
+                    if not posting:
+                        return [], 0
+                    postings.append(posting)
+                postings.sort(key=len)
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates &= posting
+                    if not candidates:
+                        return [], 0
+
+            matches = [
+                key for key in candidates
+                if any(query in value for value in self._documents[key])
+            ]
+            matches.sort(key=lambda key: (self._sort_keys[key], key))
+
+        end = None if limit is None else offset + limit
+        return matches[offset:end], len(matches)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+
+class SortedNameIndex:
+    """
+    Client keys kept in display-name order.
+
+    Entries are ``(name, key)`` tuples stored in a list of small sorted
+    chunks, the same idea as a B-tree with a single level: finding a chunk
+    is a binary search over the chunk maxima, and an insert only shifts the
+    elements of one chunk instead of the whole list.
+
+    Args:
+        chunk_size (int): Target number of entries per chunk
+
+    Educational Note:
+        ``bisect.insort`` on one flat list is O(N) per insert because of the
+        memory shift. Splitting into chunks of about ``chunk_size`` entries
+        keeps inserts and deletes cheap while iteration stays in order.
+    """
+
+    def __init__(self, chunk_size: int = 512):
+        self.chunk_size = chunk_size
+        self._chunks: List[List[Tuple[str, str]]] = []
+        self._maxes: List[Tuple[str, str]] = []
+        self._names: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def add(self, key: str, name: str) -> None:
+        """
+        Insert a client, replacing its previous entry if it was indexed.
+
+        Args:
+            key (str): Normalized client name
+            name (str): Display name used for ordering
+        """
+        entry = (name, key)
+        with self._lock:
+            if key in self._names:
+                self.remove(key)
+            self._names[key] = name
+
+            if not self._chunks:
+                self._chunks.append([entry])
+                self._maxes.append(entry)
+                return
+
+            position = bisect_left(self._maxes, entry)
+            if position == len(self._chunks):
+                position -= 1
+            chunk = self._chunks[position]
+            insort(chunk, entry)
+            self._maxes[position] = chunk[-1]
+
+            if len(chunk) > 2 * self.chunk_size:
+                half = len(chunk) // 2
+                self._chunks[position:position + 1] = [chunk[:half], chunk[half:]]
+                self._maxes[position:position + 1] = [chunk[half - 1], chunk[-1]]
+
+    def remove(self, key: str) -> None:
+        """Remove a client (no-op if it is not indexed)."""
+        with self._lock:
+            name = self._names.pop(key, None)
+            if name is None:
+                return
+            entry = (name, key)
+            position = bisect_left(self._maxes, entry)
+            chunk = self._chunks[position]
+            del chunk[bisect_left(chunk, entry)]
+            if chunk:
+                self._maxes[position] = chunk[-1]
+            else:
+                del self._chunks[position]
+                del self._maxes[position]
+
+    def iter_keys(self, after: Optional[str] = None, limit: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield keys in name order.
+
+        Args:
+            after (str, optional): Cursor; only names strictly greater are returned
+            limit (int, optional): Maximum number of keys to yield
+
+        Yields:
+            str: Normalized client names
+
+        Educational Note:
+            Keys are copied one chunk at a time under the lock and yielded
+            outside it, so slow consumers do not block writers and a full
+            walk never holds more than one chunk. Each chunk is found again
+            by a binary search from the last yielded entry, like the next
+            page of a cursor: clients added or removed during the walk show
+            up (or not) according to where they sort.
+        """
+        # Every entry with the ``after`` name sorts before (after, max char)
+        cursor = None if after is None else (after, "\U0010ffff")
+        remaining = limit
+        while remaining is None or remaining > 0:
+            with self._lock:
+                chunk_index = 0 if cursor is None else bisect_right(self._maxes, cursor)
+                if chunk_index == len(self._chunks):
+                    return
+                chunk = self._chunks[chunk_index]
+                entry_index = 0 if cursor is None else bisect_right(chunk, cursor)
+                stop = len(chunk) if remaining is None else entry_index + remaining
+                entries = chunk[entry_index:stop]
+            cursor = entries[-1]
+            if remaining is not None:
+                remaining -= len(entries)
+            for name, key in entries:
+                yield key
+
+    def name_of(self, key: str) -> Optional[str]:
+        """Get the display name indexed for a key."""
+        return self._names.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
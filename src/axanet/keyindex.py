@@ -0,0 +1,244 @@
+"""
+Existence Index for Axanet Client Manager
+=========================================
+
+This module answers "is there a stored client with this name?" from
+memory when the answer is "yes", so a duplicate check on insert of a name
+that is already stored needs no file system call.
+
+Classes:
+--------
+- KeyIndex: Names of every stored client, kept as a set or a Bloom filter
+- BloomFilter: Compact probabilistic set with no false negatives
+
+Educational Notes for Students:
+-------------------------------
+1. Asking the file system whether a file exists is a system call, and on
+   a large or remote directory it is far slower than a dictionary lookup
+2. A set of names gives exact answers but costs tens of bytes per name;
+   a Bloom filter spends about 10 bits per name for a 1% error rate
+3. Another process can create a file at any moment, and the directory
+   watcher only reports it a little later. So "absent" is never taken
+   from memory: it is confirmed on disk before a client is created,
+   because trusting it would overwrite the other process's file. Names
+   found that way are added to the index
+4. Names cannot be removed from a Bloom filter (their bits are shared
+   with other names), so deletions only make "maybe" answers more common.
+   The filter is rebuilt from a directory scan once it fills up
+5. A "present" answer can only be trusted while deletions by other
+   processes reach the index, which is what the directory watcher
+   (``watcher.DirectoryWatcher``) does. The managers therefore only use
+   the index with ``watch_enabled``
+6. A Bloom filter's "present" is only a "maybe", so in "bloom" mode every
+   answer is confirmed on disk; the mode costs about 10 bits per name
+   and is kept for stores where an exact set would not fit in memory
+"""
+
+import hashlib
+import math
+import sys
+import threading
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional
+
+
+MODES = ("none", "set", "bloom")
+
+
+class BloomFilter:
+    """
+    Bit array answering "possibly present" or "certainly absent".
+
+    Args:
+        capacity (int): Number of names the filter is sized for
+        false_positive_rate (float): Wanted rate of wrong "possibly present"
+            answers at full capacity
+
+    Educational Note:
+        The ``k`` bit positions of a name come from two halves of one hash
+        (``h1 + i * h2``), which is as good as ``k`` separate hashes.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % size
+
+    def add(self, key: str) -> None:
+        self.update((key,))
+
+    def update(self, keys: Iterable[str]) -> None:
+        bits = self._bits
+        # Setting a bit is a read-modify-write of its byte; two unlocked
+        # writers could lose one of their bits (and produce a false negative)
+        with self._lock:
+            for key in keys:
+                for position in self._positions(key):
+                    bits[position >> 3] |= 1 << (position & 7)
+                self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        # Positions are computed lazily: most absent names fail on the first bits
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+
+class KeyIndex:
+    """
+    In-memory record of which client names are stored.
+
+    Args:
+        list_names (Callable[[], Iterable[str]]): Scans the storage for
+            every stored name (used to build and rebuild the index)
+        exists_on_disk (Callable[[str], bool]): Checks one name on disk;
+            confirms every answer that is not an exact "present"
+        mode (str): "set" for exact answers, "bloom" for a compact filter
+        false_positive_rate (float): Bloom filter error rate
+
+    Example:
+        index = KeyIndex(layout.names, layout.exists)
+        if index.contains("ana_garcia"):
+            ...
+
+    Educational Note:
+        The index is built on first use, so opening a manager does not
+        scan the directory unless existence is actually asked.
+    """
+
+    def __init__(
+        self,
+        list_names: Callable[[], Iterable[str]],
+        exists_on_disk: Callable[[str], bool],
+        mode: str = "set",
+        false_positive_rate: float = 0.01
+    ):
+        if mode not in ("set", "bloom"):
+            raise ValueError('Key index mode must be "set" or "bloom"')
+        self.list_names = list_names
+        self.exists_on_disk = exists_on_disk
+        self.mode = mode
+        self.false_positive_rate = false_positive_rate
+        self._keys: Optional[set] = None
+        self._bloom: Optional[BloomFilter] = None
+        self._built = False
+        self._build_lock = threading.Lock()
+        self.memory_answers = 0
+        self.disk_checks = 0
+        self.rebuilds = 0
+
+    def build(self) -> None:
+        """
+        (Re)build the index from a storage scan.
+
+        Educational Note:
+            The scan runs under the build lock, so adds that happen while
+            it runs are not lost: each one either lands in the directory
+            before the scan reads it, or waits for the lock and goes into
+            the new index.
+        """
+        with self._build_lock:
+            self._build()
+
+    def _build(self) -> None:
+        names = list(self.list_names())
+        if self.mode == "set":
+            self._keys = set(names)
+        else:
+            bloom = BloomFilter(max(2 * len(names), 1024), self.false_positive_rate)
+            bloom.update(names)
+            self._bloom = bloom
+        if self._built:
+            self.rebuilds += 1
+        self._built = True
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            with self._build_lock:
+                if not self._built:
+                    self._build()
+
+    def contains(self, key: str) -> bool:
+        """
+        Whether ``key`` is stored.
+
+        Only an exact "present" ("set" mode) is answered from memory; any
+        other answer is checked on disk, and a name found there is added.
+        """
+        self._ensure_built()
+        if self.mode == "set" and key in self._keys:
+            self.memory_answers += 1
+            return True
+        self.disk_checks += 1
+        if not self.exists_on_disk(key):
+            return False
+        if self.mode == "set":
+            # Written by another process, and not yet reported by the watcher
+            self.add(key)
+        return True
+
+    def add(self, key: str) -> None:
+        """Record a name whose file was just written."""
+        # Under the build lock: a scan in progress may already have passed
+        # this file's directory, so the name must go into the new index
+        with self._build_lock:
+            if not self._built:
+                return
+            if self.mode == "set":
+                self._keys.add(key)
+                return
+            self._bloom.add(key)
+            full = self._bloom.count > self._bloom.capacity
+        if full:
+            # Past capacity the error rate climbs quickly: size it again
+            self.build()
+
+    def discard(self, key: str) -> None:
+        """Forget a name whose file was deleted (a no-op for the Bloom filter)."""
+        if self.mode == "set":
+            with self._build_lock:
+                if self._built:
+                    self._keys.discard(key)
+
+    def reset(self) -> None:
+        """Drop the index; it is built again from a scan on next use."""
+        with self._build_lock:
+            self._built = False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index counters.
+
+        Returns:
+            Dict[str, Any]: Mode, names recorded, memory used by the
+            structure, lookups answered "present" from memory, lookups
+            checked on disk and rebuilds
+        """
+        if self.mode == "set":
+            names = len(self._keys) if self._keys is not None else 0
+            memory = sys.getsizeof(self._keys) + sum(map(sys.getsizeof, self._keys)) if self._keys is not None else 0
+        else:
+            names = self._bloom.count if self._bloom is not None else 0
+            memory = self._bloom.memory_bytes if self._bloom is not None else 0
+        return {
+            "mode": self.mode,
+            "names": names,
+            "memory_bytes": memory,
+            "memory_answers": self.memory_answers,
+            "disk_checks": self.disk_checks,
+            "rebuilds": self.rebuilds
+        }
@@ -0,0 +1,361 @@
+"""
+Client File Layout for Axanet Client Manager
+============================================
+
+This module decides where each client file lives inside the data
+directory. The classic layout keeps every file in the directory itself;
+the sharded layout spreads them over hashed subdirectories::
+
+    depth 0:  axanet_clients_data/ana_garcia.txt
+    depth 2:  axanet_clients_data/3f/a1/ana_garcia.txt
+
+Classes:
+--------
+- ClientFileLayout: Path computation, listing and online migration between layouts
+
+Functions:
+----------
+- client_file_path: Path of a client file for a given shard depth
+
+Educational Notes for Students:
+-------------------------------
+1. A directory with hundreds of thousands of entries makes every listing,
+   and on many file systems every lookup, slow. Splitting the files over
+   256 (depth 1) or 65,536 (depth 2) subdirectories keeps each one small
+2. The subdirectory comes from a hash of the name, so finding a file is
+   still one path computation: no index or directory search is needed
+3. MD5 is used only because it spreads names evenly and is the same on
+   every platform and Python run; ``hash()`` changes between runs
+4. The layout a directory uses is recorded in ``layout.json`` inside it,
+   so a program opened with a different setting cannot lose track of files
+5. Migration moves one file at a time with an atomic rename. While it runs
+   a lookup tries the new place first and the old one second; a crash
+   leaves the directory half migrated but consistent, and the next start
+   resumes where it stopped
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .storage import _fsync_directory, write_files_durably
+
+
+MAX_SHARD_DEPTH = 3
+LAYOUT_FILE = "layout.json"
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def client_file_path(directory: Path, normalized_name: str, extension: str = ".txt", depth: int = 0) -> Path:
+    """
+    Get the path of a client file.
+
+    Args:
+        directory (Path): Data directory
+        normalized_name (str): Normalized client name (the file stem)
+        extension (str): File extension, including the dot
+        depth (int): Number of hashed directory levels (0 = flat)
+
+    Returns:
+        Path: Path of the client file (its directories may not exist yet)
+    """
+    filename = f"{normalized_name}{extension}"
+    if not depth:
+        return directory / filename
+    digest = hashlib.md5(normalized_name.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return directory.joinpath(*(digest[level * 2:level * 2 + 2] for level in range(depth)), filename)
+
+
+class ClientFileLayout:
+    """
+    Where the client files of one data directory live.
+
+    Args:
+        directory (Path): Data directory
+        extension (str): Client file extension, including the dot
+        depth (int): Shard depth new files are written at
+        legacy_depths (Sequence[int]): Depths that may still hold files
+            because a migration has not finished
+
+    Example:
+        layout = ClientFileLayout.open(Path("axanet_clients_data"), ".txt", 2)
+        path = layout.path_for("ana_garcia")
+
+    Educational Note:
+        Writes always go to ``path_for``. Reads use ``locate``, which only
+        looks at the old layout while a migration is in progress.
+    """
+
+    def __init__(self, directory: Path, extension: str = ".txt", depth: int = 0,
+                 legacy_depths: Sequence[int] = ()):
+        if not 0 <= depth <= MAX_SHARD_DEPTH:
+            raise ValueError(f"Shard depth must be between 0 and {MAX_SHARD_DEPTH}")
+        self.directory = Path(directory)
+        self.extension = extension
+        self.depth = depth
+        self.legacy_depths: Tuple[int, ...] = tuple(d for d in legacy_depths if d != depth)
+
+    @classmethod
+    def open(cls, directory: Path, extension: str = ".txt", shard_depth: int = 0) -> 'ClientFileLayout':
+        """
+        Open the layout recorded in a data directory.
+
+        ``shard_depth`` only applies to a directory without client files;
+        an existing directory keeps its recorded layout until it is
+        migrated with ``migrate_to``.
+
+        Returns:
+            ClientFileLayout: Layout of the directory
+        """
+        directory = Path(directory)
+        recorded = cls._read_layout_file(directory)
+        if recorded is not None:
+            return cls(directory, extension, recorded.get("shard_depth", 0), recorded.get("migrating_from", ()))
+        layout = cls(directory, extension, 0)
+        if shard_depth and not layout._has_files(0):
+            layout.depth = shard_depth
+            layout._write_layout_file()
+        return layout
+
+    @staticmethod
+    def _read_layout_file(directory: Path) -> Optional[dict]:
+        try:
+            return json.loads((directory / LAYOUT_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def _write_layout_file(self) -> None:
+        state = {"shard_depth": self.depth}
+        if self.legacy_depths:
+            state["migrating_from"] = list(self.legacy_depths)
+        failures = write_files_durably([(self.directory / LAYOUT_FILE, json.dumps(state))])
+        if failures:
+            raise next(iter(failures.values()))
+
+    @property
+    def migrating(self) -> bool:
+        """True while files may still be in an old layout."""
+        return bool(self.legacy_depths)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def path_for(self, normalized_name: str) -> Path:
+        """Path a client file is written to."""
+        return client_file_path(self.directory, normalized_name, self.extension, self.depth)
+
+    def locate(self, normalized_name: str) -> Path:
+        """Path a client file is read from: ``path_for``, or its old place during a migration."""
+        path = self.path_for(normalized_name)
+        if self.legacy_depths and not path.exists():
+            for depth in self.legacy_depths:
+                legacy_path = client_file_path(self.directory, normalized_name, self.extension, depth)
+                if legacy_path.exists():
+                    return legacy_path
+        return path
+
+    def exists(self, normalized_name: str) -> bool:
+        """Check whether a client file exists."""
+        return self.locate(normalized_name).exists()
+
+    def read_text(self, normalized_name: str, encoding: str = "utf-8") -> str:
+        """
+        Read a client file.
+
+        Raises:
+            FileNotFoundError: If the client has no file
+
+        Educational Note:
+            If a migration moves the file between ``locate`` and the read,
+            the read fails; looking it up a second time finds it.
+        """
+        path = self.locate(normalized_name)
+        try:
+            return path.read_text(encoding=encoding)
+        except FileNotFoundError:
+            moved_to = self.locate(normalized_name)
+            if moved_to == path:
+                raise
+            return moved_to.read_text(encoding=encoding)
+
+    def remove(self, normalized_name: str) -> bool:
+        """
+        Delete a client file, including a copy not yet migrated.
+
+        Returns:
+            bool: True if a file was deleted
+        """
+        removed = False
+        for depth in (self.depth, *self.legacy_depths):
+            try:
+                client_file_path(self.directory, normalized_name, self.extension, depth).unlink()
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    # ------------------------------------------------------------------
+    # Listing
+    # ------------------------------------------------------------------
+
+    def _leaf_directories(self, depth: int) -> List[Path]:
+        directories = [self.directory]
+        for _ in range(depth):
+            children = []
+            for directory in directories:
+                try:
+                    with os.scandir(directory) as entries:
+                        children.extend(
+                            Path(entry.path) for entry in entries
+                            if len(entry.name) == 2 and _HEX_DIGITS.issuperset(entry.name) and entry.is_dir()
+                        )
+                except FileNotFoundError:
+                    continue
+            directories = children
+        return directories
+
+    def _iter_names(self, depth: int) -> Iterator[str]:
+        suffix_length = len(self.extension)
+        for directory in self._leaf_directories(depth):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name.endswith(self.extension) and not name.startswith(".") and entry.is_file():
+                            yield name[:-suffix_length]
+            except FileNotFoundError:
+                continue
+
+    def _has_files(self, depth: int) -> bool:
+        return next(self._iter_names(depth), None) is not None
+
+    def names(self) -> List[str]:
+        """Normalized names of every client file, in no particular order."""
+        if not self.legacy_depths:
+            return list(self._iter_names(self.depth))
+        # Old layouts first: a file the migration moves after being listed
+        # there is listed again in the new one, never missed by both
+        names = set()
+        for depth in (*self.legacy_depths, self.depth):
+            names.update(self._iter_names(depth))
+        return list(names)
+
+    def directories(self) -> List[Path]:
+        """Every directory that can hold client files (for maintenance such as temp file cleanup)."""
+        directories = {self.directory}
+        for depth in (self.depth, *self.legacy_depths):
+            directories.update(self._leaf_directories(depth))
+        return sorted(directories)
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def start_migration(self, depth: int, locks=None) -> None:
+        """
+        Switch new writes to ``depth`` and record that older files still have to move.
+
+        Call ``migrate`` afterwards (possibly from another thread) to move them.
+
+        Args:
+            depth (int): New shard depth
+            locks (StripedLock, optional): Per-client locks of a running
+                manager; all of them are held during the switch so that no
+                write in progress still uses the old path afterwards
+        """
+        if not 0 <= depth <= MAX_SHARD_DEPTH:
+            raise ValueError(f"Shard depth must be between 0 and {MAX_SHARD_DEPTH}")
+        if depth == self.depth:
+            return
+        with locks.hold_all() if locks is not None else nullcontext():
+            self.legacy_depths = tuple(d for d in (self.depth, *self.legacy_depths) if d != depth)
+            self.depth = depth
+            self._write_layout_file()
+
+    def migrate(
+        self,
+        locks=None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        stop: Optional[threading.Event] = None,
+        sync: bool = True
+    ) -> int:
+        """
+        Move every file left in an old layout to its place in the current one.
+
+        Args:
+            locks (StripedLock, optional): Per-client locks of a running
+                manager; each file is moved while holding its client's lock
+            on_progress (Callable[[int, int], None], optional): Called with
+                (files moved, files to move) every 1,000 files and at the end
+            stop (threading.Event, optional): Set it to pause the migration;
+                the next call resumes it
+            sync (bool): Whether to fsync the directories that changed
+
+        Returns:
+            int: Number of files moved
+        """
+        moved = 0
+        for legacy_depth in self.legacy_depths:
+            names = list(self._iter_names(legacy_depth))
+            changed = {self.directory}
+            for position, name in enumerate(names, 1):
+                if stop is not None and stop.is_set():
+                    return moved
+                with locks.hold(name) if locks is not None else nullcontext():
+                    moved += self._move(name, legacy_depth, changed)
+                if on_progress is not None and (position % 1000 == 0 or position == len(names)):
+                    on_progress(moved, len(names))
+            if sync:
+                for directory in changed:
+                    _fsync_directory(directory)
+            if legacy_depth:
+                self._remove_empty_directories(legacy_depth)
+
+        with locks.hold_all() if locks is not None else nullcontext():
+            self.legacy_depths = ()
+            self._write_layout_file()
+        return moved
+
+    def _move(self, name: str, legacy_depth: int, changed: set) -> int:
+        source = client_file_path(self.directory, name, self.extension, legacy_depth)
+        target = self.path_for(name)
+        try:
+            if target.exists():
+                # Written (or deleted and created again) since the migration started
+                source.unlink()
+                return 0
+            if not target.parent.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                changed.update(target.parents[:self.depth])
+            os.replace(source, target)
+        except FileNotFoundError:
+            # Deleted while the migration was running
+            return 0
+        changed.add(source.parent)
+        changed.add(target.parent)
+        return 1
+
+    def _remove_empty_directories(self, depth: int) -> None:
+        for level in range(depth, 0, -1):
+            for directory in self._leaf_directories(level):
+                if directory.parent != self.directory or level == 1:
+                    try:
+                        directory.rmdir()
+                    except OSError:
+                        pass
+
+    def migrate_to(
+        self,
+        depth: int,
+        locks=None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        sync: bool = True
+    ) -> int:
+        """Switch to ``depth`` and move every existing file (``start_migration`` + ``migrate``)."""
+        self.start_migration(depth, locks)
+        return self.migrate(locks, on_progress, sync=sync)
@@ -0,0 +1,188 @@
+"""
+Parallel Bulk Loading for Axanet Client Manager
+===============================================
+
+This module loads many client records at once. Reading the files is spread
+over a thread pool so disk waits overlap, and parsing can optionally run in
+a process pool to use every CPU core.
+
+Classes:
+--------
+- LoaderPool: Worker threads (and processes) kept for the life of a manager
+
+Functions:
+----------
+- iter_load: Read and parse records in parallel, yielding results as they finish
+- default_worker_count: Worker count used when none is configured
+
+Educational Notes for Students:
+-------------------------------
+1. Threads are a good fit for I/O: while one thread waits for the disk,
+   another one can run
+2. Because of the GIL, pure-Python parsing does not get faster with threads;
+   separate processes are needed to parse on several cores at once
+3. Work is sent in chunks so the cost of handing data to another process is
+   paid once per chunk rather than once per file
+4. Only a few chunks are in flight at a time, so memory stays bounded even
+   for very large datasets
+5. Starting threads, and above all processes, costs far more than reading
+   one small file; a manager keeps one ``LoaderPool`` so that loads run in
+   many small batches do not pay that cost every time
+"""
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Set, Tuple
+
+
+# (key, parsed object or None, error message or None)
+LoadResult = Tuple[str, Any, Optional[str]]
+
+
+def default_worker_count() -> int:
+    """Get the default number of workers (one per CPU core)."""
+    return os.cpu_count() or 1
+
+
+class LoaderPool:
+    """
+    Reader threads and parser processes shared by every load of a manager.
+
+    The executors are created on first use and live until ``close``.
+    """
+
+    def __init__(self, workers: int = 0, use_processes: bool = False):
+        """
+        Initialize the pool without starting any worker.
+
+        Args:
+            workers (int): Number of reader threads and parser processes; 0 means one per core
+            use_processes (bool): Parse in a process pool instead of the reader threads
+        """
+        self.workers = workers or default_worker_count()
+        self.use_processes = use_processes
+        self._lock = threading.Lock()
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+
+    def executors(self) -> Tuple[ThreadPoolExecutor, Optional[ProcessPoolExecutor]]:
+        """Get the thread pool and process pool, starting them on first use."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("loader pool is closed")
+            if self._thread_pool is None:
+                if self.use_processes:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="axanet-loader"
+                )
+            return self._thread_pool, self._process_pool
+
+    def close(self) -> None:
+        """Stop the workers; loads still running finish their current chunks first."""
+        with self._lock:
+            self._closed = True
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=True, cancel_futures=True)
+        if process_pool is not None:
+            process_pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _parse_chunk(parse_content: Callable[[str], Any], items: List[Tuple[str, str]]) -> List[LoadResult]:
+    """Parse a chunk of (key, content) pairs; runs in a worker thread or process."""
+    results = []
+    for key, content in items:
+        try:
+            results.append((key, parse_content(content), None))
+        except Exception as e:
+            results.append((key, None, str(e)))
+    return results
+
+
+def _load_chunk(
+    keys: Sequence[str],
+    read_content: Callable[[str], str],
+    parse_content: Callable[[str], Any],
+    process_pool: Optional[ProcessPoolExecutor]
+) -> List[LoadResult]:
+    """Read a chunk of records, then parse it locally or in the process pool."""
+    results: List[LoadResult] = []
+    contents: List[Tuple[str, str]] = []
+    for key in keys:
+        try:
+            contents.append((key, read_content(key)))
+        except Exception as e:
+            results.append((key, None, str(e)))
+
+    if process_pool is not None:
+        results.extend(process_pool.submit(_parse_chunk, parse_content, contents).result())
+    else:
+        results.extend(_parse_chunk(parse_content, contents))
+    return results
+
+
+def iter_load(
+    keys: Sequence[str],
+    read_content: Callable[[str], str],
+    parse_content: Callable[[str], Any],
+    workers: int = 0,
+    use_processes: bool = False,
+    chunk_size: int = 64,
+    pool: Optional[LoaderPool] = None
+) -> Iterator[LoadResult]:
+    """
+    Read and parse records in parallel.
+
+    Args:
+        keys (Sequence[str]): Normalized names to load
+        read_content (Callable): Returns the stored text for a key (called in threads)
+        parse_content (Callable): Turns stored text into a client; must be
+            picklable (e.g. ``Client.from_file_content``) when ``use_processes`` is set
+        workers (int): Number of reader threads and parser processes; 0 means one per core
+        use_processes (bool): Parse in a process pool instead of the reader threads
+        chunk_size (int): Number of records handled per task
+        pool (LoaderPool, optional): Workers to run on; ``workers`` and
+            ``use_processes`` then come from the pool. Without one, workers
+            are started for this call and stopped when it ends
+
+    Yields:
+        LoadResult: ``(key, client, None)`` on success or ``(key, None, error)``
+        on failure, in completion order
+
+    Educational Note:
+        Failures are returned instead of raised so that one corrupt file
+        does not stop the whole load; callers log them as warnings.
+    """
+    if not keys:
+        return
+    own_pool = pool is None
+    if pool is None:
+        pool = LoaderPool(workers, use_processes)
+    thread_pool, process_pool = pool.executors()
+    chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+    max_in_flight = pool.workers * 2
+
+    pending: Set[Future] = set()
+    next_chunk = 0
+    try:
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < max_in_flight:
+                pending.add(thread_pool.submit(
+                    _load_chunk, chunks[next_chunk], read_content, parse_content, process_pool
+                ))
+                next_chunk += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        if own_pool:
+            pool.close()
+        else:
+            # The workers are shared: only drop this load's chunks
+            for future in pending:
+                future.cancel()
+            wait(pending)
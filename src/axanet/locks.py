@@ -0,0 +1,108 @@
+"""
+Striped Locks for Axanet Client Manager
+=======================================
+
+This module provides the per-client locking used by ``ClienteManager`` and
+``ClientManager`` so that two threads changing the same client never
+overwrite each other's file, while threads working on different clients
+run in parallel.
+
+Classes:
+--------
+- StripedLock: A fixed pool of locks shared out by key hash
+
+Educational Notes for Students:
+-------------------------------
+1. A read-modify-write (load client, add service, write file) is only
+   correct if nobody else modifies the same client in between
+2. One lock for the whole manager would make that safe, but every write
+   would wait for every other write, even for unrelated clients
+3. One lock per client is precise but grows without limit; "lock striping"
+   keeps a fixed number of locks and maps each key to one by its hash.
+   Two clients rarely share a stripe, and when they do they only wait
+4. When an operation needs several keys, it takes their stripes in
+   ascending order. Every thread uses the same order, so no two threads
+   can each hold a lock the other is waiting for (no deadlock)
+5. The locks are reentrant, so a method holding a client's lock can call
+   another method that takes the same lock
+6. Each stripe also counts the writes made under it. A bulk load reads
+   files without the locks; comparing the counts from before the read
+   with the current ones tells it whether a file may have changed since
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator, List
+
+
+class StripedLock:
+    """
+    Fixed pool of reentrant locks selected by key.
+
+    Args:
+        stripes (int): Number of locks in the pool
+
+    Example:
+        locks = StripedLock(64)
+        with locks.hold("ana_garcia"):
+            ...  # read, change and write the client
+
+    Educational Note:
+        Readers that only look at the cache do not take these locks; they
+        are for operations that change a client.
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes <= 0:
+            raise ValueError("Lock stripe count must be positive")
+        self._locks = [threading.RLock() for _ in range(stripes)]
+        self._generations = [0] * stripes
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def _stripe(self, key: Hashable) -> int:
+        return hash(key) % len(self._locks)
+
+    def lock_for(self, key: Hashable) -> threading.RLock:
+        """Get the lock that guards ``key``."""
+        return self._locks[self._stripe(key)]
+
+    @contextmanager
+    def hold(self, *keys: Hashable) -> Iterator[None]:
+        """Hold the locks of every given key (each stripe once, in ascending order)."""
+        stripes = sorted({self._stripe(key) for key in keys})
+        acquired: List[threading.RLock] = []
+        try:
+            for stripe in stripes:
+                lock = self._locks[stripe]
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    @contextmanager
+    def hold_all(self) -> Iterator[None]:
+        """Hold every lock of the pool (for changes that affect all keys at once)."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def bump(self, key: Hashable) -> None:
+        """Record a write of ``key``; call it while holding the key's lock."""
+        self._generations[self._stripe(key)] += 1
+
+    def generations(self) -> List[int]:
+        """Write counts of every stripe, to compare later with ``changed_since``."""
+        return list(self._generations)
+
+    def changed_since(self, key: Hashable, generations: List[int]) -> bool:
+        """Whether ``key``'s stripe recorded a write after ``generations`` was taken."""
+        stripe = self._stripe(key)
+        return self._generations[stripe] != generations[stripe]
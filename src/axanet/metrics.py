@@ -0,0 +1,390 @@
+"""
+Operation Metrics for Axanet Client Manager
+===========================================
+
+This module measures how often and how fast the managers' operations run
+and publishes the numbers, together with the counters the caches, the
+existence index and the directory watcher already keep.
+
+Classes:
+--------
+- MetricsRegistry: Latency histograms, error counters and collected statistics
+- LatencyHistogram: Bucketed latencies with p50/p95/p99 estimates
+- MetricsExporter: Writes the metrics to a file and/or serves them over HTTP
+
+Functions:
+----------
+- instrument_methods: Wrap methods of an object so each call is timed
+
+Educational Notes for Students:
+-------------------------------
+1. Latency is recorded in buckets whose bounds grow by a factor of
+   2^(1/4), so any percentile is known to within about 19% with a fixed
+   amount of memory, however many calls are made
+2. A percentile of the average hides the slow calls users notice; p95 and
+   p99 show them
+3. Metrics are switched on by wrapping the methods of one manager object.
+   With ``metrics_enabled`` off nothing is wrapped, so the disabled cost
+   is exactly zero
+4. Statistics that already exist (cache hits, watcher events...) are not
+   counted twice: a collector reads them when the metrics are exported
+5. Prometheus reads the text format; the JSON form is easier to read by
+   hand or from a script
+"""
+
+import functools
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .storage import write_files_durably
+
+
+# 1 microsecond to about 2 minutes, four buckets per doubling
+_BUCKET_BOUNDS: List[float] = [1e-6 * 2 ** (index / 4) for index in range(108)]
+_LAST_BUCKET = len(_BUCKET_BOUNDS)
+_PROMETHEUS_PREFIX = "axanet"
+FORMATS = ("prometheus", "json")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """
+    Distribution of the durations of one operation.
+
+    Educational Note:
+        Only every fourth bound (the powers of two) is exported to
+        Prometheus, which keeps the text short; the percentiles use all of
+        them.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        # The bucket comes from the logarithm instead of a search of the bounds
+        bucket = min(max(math.ceil(4 * math.log2(seconds * 1e6)), 0), _LAST_BUCKET) if seconds > 1e-6 else 0
+        # No lock, like the cache counters: it would double the cost of a
+        # measurement, and an increment lost to a thread switch is harmless here
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the ``q`` quantile (0.95 for p95), in seconds.
+
+        The value is interpolated inside the bucket that holds it.
+        """
+        counts, count = list(self.counts), self.count
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for bucket, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = _BUCKET_BOUNDS[bucket - 1] if bucket else 0.0
+                upper = _BUCKET_BOUNDS[bucket] if bucket < len(_BUCKET_BOUNDS) else self.maximum
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.maximum)
+            seen += bucket_count
+        return self.maximum
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        """(upper bound, calls at or below it) at every power-of-two bound, then +Inf."""
+        buckets = []
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts[:-1]):
+            seen += bucket_count
+            if bucket % 4 == 0:
+                buckets.append((_BUCKET_BOUNDS[bucket], seen))
+        buckets.append((math.inf, seen + self.counts[-1]))
+        return buckets
+
+
+class MetricsRegistry:
+    """
+    Metrics of one manager.
+
+    Example:
+        registry = MetricsRegistry()
+        instrument_methods(registry, manager, ["get_client"], "client_manager")
+        registry.register_collector("cache", manager.get_cache_statistics)
+        print(registry.to_prometheus())
+
+    Educational Note:
+        Histograms and error counters are created on first use and never
+        removed, so the wrappers can keep direct references to them.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self._histograms: Dict[Labels, LatencyHistogram] = {}
+        self._errors: Dict[Labels, int] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, component: str, operation: str) -> LatencyHistogram:
+        key = (("component", component), ("operation", operation))
+        with self._lock:
+            return self._histograms.setdefault(key, LatencyHistogram())
+
+    def count_error(self, component: str, operation: str, error: str) -> None:
+        key = (("component", component), ("operation", operation), ("error", error))
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def register_collector(self, name: str, collect: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Publish the statistics returned by ``collect`` under ``name``.
+
+        Numbers (and booleans) become gauges; other values only appear in
+        the JSON form.
+        """
+        self._collectors[name] = collect
+
+    def timed(self, component: str, operation: str, function: Callable) -> Callable:
+        """Wrap ``function`` so each call is timed and each exception counted."""
+        histogram = self.histogram(component, operation)
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                self.count_error(component, operation, type(e).__name__)
+                raise
+            finally:
+                histogram.observe(clock() - started)
+
+        return wrapper
+
+    def _collect(self) -> Dict[str, Dict[str, Any]]:
+        collected = {}
+        for name, collect in list(self._collectors.items()):
+            try:
+                collected[name] = collect()
+            except Exception as e:
+                collected[name] = {"error": str(e)}
+        return collected
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get every metric as plain data.
+
+        Returns:
+            Dict[str, Any]: uptime_seconds, operations by component and
+            operation (calls, errors by type, calls per second, mean, p50,
+            p95, p99 and max in milliseconds) and each collector's statistics
+        """
+        uptime = time.monotonic() - self.started
+        with self._lock:
+            histograms = list(self._histograms.items())
+            errors = list(self._errors.items())
+        operations: Dict[str, Dict[str, Any]] = {}
+        for labels, histogram in histograms:
+            component, operation = (value for _, value in labels)
+            operations.setdefault(component, {})[operation] = {
+                "calls": histogram.count,
+                "errors": {},
+                "calls_per_second": round(histogram.count / uptime, 3) if uptime else 0.0,
+                "mean_ms": round(histogram.total / histogram.count * 1e3, 4) if histogram.count else 0.0,
+                "p50_ms": round(histogram.quantile(0.50) * 1e3, 4),
+                "p95_ms": round(histogram.quantile(0.95) * 1e3, 4),
+                "p99_ms": round(histogram.quantile(0.99) * 1e3, 4),
+                "max_ms": round(histogram.maximum * 1e3, 4)
+            }
+        for labels, count in errors:
+            component, operation, error = (value for _, value in labels)
+            operations[component][operation]["errors"][error] = count
+        return {"uptime_seconds": round(uptime, 3), "operations": operations, **self._collect()}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        """Get every metric in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {_PROMETHEUS_PREFIX}_uptime_seconds Seconds since the manager started",
+            f"# TYPE {_PROMETHEUS_PREFIX}_uptime_seconds gauge",
+            f"{_PROMETHEUS_PREFIX}_uptime_seconds {time.monotonic() - self.started:.3f}"
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            errors = sorted(self._errors.items())
+
+        name = f"{_PROMETHEUS_PREFIX}_operation_seconds"
+        lines += [f"# HELP {name} Duration of manager and file operations", f"# TYPE {name} histogram"]
+        for labels, histogram in histograms:
+            for bound, count in histogram.cumulative_buckets():
+                le = "+Inf" if bound == math.inf else f"{bound:.6g}"
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total:.9f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        name = f"{_PROMETHEUS_PREFIX}_operation_quantile_seconds"
+        lines += [f"# HELP {name} Estimated latency percentiles", f"# TYPE {name} gauge"]
+        for labels, histogram in histograms:
+            if not histogram.count:
+                continue
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f"{name}{_format_labels(labels + (('quantile', str(q)),))} {histogram.quantile(q):.9f}")
+
+        name = f"{_PROMETHEUS_PREFIX}_operation_errors_total"
+        lines += [f"# HELP {name} Operations that raised, by exception type", f"# TYPE {name} counter"]
+        lines += [f"{name}{_format_labels(labels)} {count}" for labels, count in errors]
+
+        for collector, statistics in self._collect().items():
+            for key, value in statistics.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if not isinstance(value, (int, float)):
+                    continue
+                name = f"{_PROMETHEUS_PREFIX}_{_metric_name(collector)}_{_metric_name(key)}"
+                lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def render(self, format: str = "prometheus") -> str:
+        """Get the metrics as "prometheus" text or "json"."""
+        if format not in FORMATS:
+            raise ValueError(f"Unknown metrics format: {format}")
+        return self.to_prometheus() if format == "prometheus" else self.to_json()
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = []
+    for key, value in labels:
+        value = value.replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _metric_name(text: str) -> str:
+    return "".join(character if character.isalnum() else "_" for character in text).lower()
+
+
+def instrument_methods(registry: MetricsRegistry, target: Any, method_names: Iterable[str], component: str) -> None:
+    """
+    Replace methods of ``target`` (on that object only) with timed wrappers.
+
+    Calls the object makes to its own methods go through ``self`` and are
+    timed too; other instances of the class are not affected.
+
+    Args:
+        registry (MetricsRegistry): Where the measurements go
+        target (Any): Object whose methods are wrapped
+        method_names (Iterable[str]): Methods to wrap (used as operation names)
+        component (str): Component label, e.g. "file_manager"
+    """
+    for method_name in method_names:
+        setattr(target, method_name, registry.timed(component, method_name.lstrip("_"), getattr(target, method_name)))
+
+
+class MetricsExporter:
+    """
+    Publish a registry's metrics to a file, an HTTP endpoint or both.
+
+    Args:
+        registry (MetricsRegistry): Metrics to publish
+        file_path (Path, optional): File rewritten every
+            ``interval_seconds`` (0 = only on ``close``)
+        format (str): "prometheus" or "json" for the file
+        interval_seconds (float): Seconds between file writes
+        port (int): Serve ``/metrics`` (Prometheus) and ``/metrics.json``
+            on 127.0.0.1 at this port; 0 disables the endpoint
+
+    Educational Note:
+        The file is replaced atomically, so a reader never sees half of it.
+    """
+
+    def __init__(self, registry: MetricsRegistry, file_path: Optional[Path] = None,
+                 format: str = "prometheus", interval_seconds: float = 60, port: int = 0):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown metrics format: {format}")
+        self.registry = registry
+        self.file_path = Path(file_path) if file_path else None
+        self.format = format
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        if self.file_path is not None and interval_seconds > 0:
+            self._thread = threading.Thread(
+                target=self._run, args=(interval_seconds,), name="axanet-metrics", daemon=True
+            )
+            self._thread.start()
+        if port:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="axanet-metrics-http", daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        """Port the endpoint listens on (0 without an endpoint)."""
+        return self._server.server_address[1] if self._server is not None else 0
+
+    def write(self) -> None:
+        """Write the metrics file now."""
+        if self.file_path is None:
+            return
+        failures = write_files_durably([(self.file_path, self.registry.render(self.format))], sync=False)
+        if failures:
+            raise next(iter(failures.values()))
+
+    def _run(self, interval_seconds: float) -> None:
+        while not self._stop.wait(interval_seconds):
+            try:
+                self.write()
+            except OSError:
+                # A full disk or a removed directory must not stop the manager
+                continue
+
+    def _handler(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    body, content_type = registry.to_json(), "application/json; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def close(self) -> None:
+        """Stop the endpoint and the timer and write the file one last time."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.write()
@@ -1,11 +1,21 @@
 from datetime import datetime
-from typing import List
+from typing import Iterable, List, Optional, Tuple, Union
 import re
 
+from .compact import ServiceList, pack_day, pack_timestamp, unpack_day, unpack_timestamp
 from .excepciones import ErrorValidacion
+from .normalization import normalize_accented
+
+# Campos de la cabecera del archivo de cliente y su posición al parsear
+_CAMPOS_ARCHIVO = {"Nombre": 0, "Telefono": 1, "Correo": 2, "ID_Cliente": 3, "FechaRegistro": 4}
+_NO_DIGITO = re.compile(r'[^\d]')
+_PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 
 class Servicio:
+    # Sin __dict__: la fecha se guarda como segundos desde 1970 cuando es posible
+    __slots__ = ("descripcion", "_fecha")
+    
     def __init__(self, descripcion: str, fecha_solicitud: str):
         self.descripcion = descripcion.strip()
         if fecha_solicitud:
@@ -14,31 +24,75 @@ class Servicio:
             ahora = datetime.now()
             self.fecha_solicitud = ahora.strftime("%Y-%m-%d %H:%M:%S")
     
+    @property
+    def fecha_solicitud(self) -> str:
+        fecha = self._fecha
+        return fecha if type(fecha) is str else unpack_timestamp(fecha)
+    
+    @fecha_solicitud.setter
+    def fecha_solicitud(self, valor: str):
+        segundos = pack_timestamp(valor)
+        self._fecha = valor if segundos is None else segundos
+    
+    def _compact(self) -> Optional[Tuple[str, int]]:
+        if type(self._fecha) is str:
+            return None
+        return self.descripcion, self._fecha
+    
+    @classmethod
+    def _from_compact(cls, descripcion: str, segundos: int) -> 'Servicio':
+        servicio = cls.__new__(cls)
+        servicio.descripcion = descripcion
+        servicio._fecha = segundos
+        return servicio
+    
+    def __eq__(self, otro):
+        if not isinstance(otro, Servicio):
+            return NotImplemented
+        return self.descripcion == otro.descripcion and self.fecha_solicitud == otro.fecha_solicitud
+    
+    __hash__ = None
+    
     def __str__(self):
         return f"{self.descripcion} ({self.fecha_solicitud})"
 
 class Cliente:
+    # Sin __dict__: fecha de registro en días desde 1970 y servicios en columnas
+    __slots__ = ("nombre", "telefono", "email", "id_cliente", "_fecha_registro", "_servicios")
+    
     def __init__(self, nombre: str, telefono: str, email: str):
         self.nombre = nombre.strip()
         self.telefono = telefono.strip()
         self.email = email.strip()
-        self.servicios: List[Servicio] = []
+        self.servicios = ServiceList(Servicio)
         self.id_cliente = ""
         ahora = datetime.now()
         self.fecha_registro = ahora.strftime("%Y-%m-%d")
         self.validar_datos()
     
+    @property
+    def servicios(self) -> ServiceList:
+        return self._servicios
+    
+    @servicios.setter
+    def servicios(self, servicios: Iterable[Servicio]):
+        if not isinstance(servicios, ServiceList):
+            servicios = ServiceList(Servicio, servicios)
+        self._servicios = servicios
+    
+    @property
+    def fecha_registro(self) -> str:
+        fecha = self._fecha_registro
+        return fecha if type(fecha) is str else unpack_day(fecha)
+    
+    @fecha_registro.setter
+    def fecha_registro(self, valor: Union[str, int]):
+        dias = pack_day(valor)
+        self._fecha_registro = valor if dias is None else dias
+    
     @property
     def nombre_normalizado(self) -> str:
-        normalizado = self.nombre.lower()
-        reemplazos = {
-            'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u',
-            'ñ': 'n', 'ç': 'c', ' ': '_'
-        }
-        for original, reemplazo in reemplazos.items():
-            normalizado = normalizado.replace(original, reemplazo)
-        normalizado = re.sub(r'[^a-z0-9_]', '', normalizado)
-        return normalizado
+        return normalize_accented(self.nombre)
     
     def validar_datos(self):
         if not self.nombre or len(self.nombre.strip()) < 2:
@@ -47,7 +101,7 @@ class Cliente:
                 valor=self.nombre,
                 motivo="Nombre no valido"
             )
-        telefono_limpio = re.sub(r'[^\d]', '', self.telefono)
+        telefono_limpio = _NO_DIGITO.sub('', self.telefono)
         if len(telefono_limpio) != 10:
             raise ErrorValidacion(
                 campo="telefono",
@@ -55,8 +109,7 @@ class Cliente:
                 motivo="Telefono no es correcto"
             )
         self.telefono = telefono_limpio
-        patron_email = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(patron_email, self.email):
+        if not _PATRON_EMAIL.match(self.email):
             raise ErrorValidacion(
                 campo="email",
                 valor=self.email,
@@ -97,48 +150,68 @@ class Cliente:
             contenido.append(f"- {servicio.descripcion} ({servicio.fecha_solicitud})")
         return "\n".join(contenido)
     
+    @staticmethod
+    def contar_servicios_archivo(contenido_archivo: str) -> int:
+        # Cuenta las líneas de servicio igual que desde_archivo, sin crear el cliente
+        cantidad = 0
+        servicios_seccion = False
+        for linea in contenido_archivo.split('\n'):
+            linea = linea.strip()
+            if linea == "Servicios:":
+                servicios_seccion = True
+            elif servicios_seccion and linea.startswith("- "):
+                cantidad += 1
+        return cantidad
+    
     @classmethod
-    def desde_archivo(cls, contenido_archivo: str) -> 'Cliente':
-        lineas = contenido_archivo.strip().split('\n')
-        nombre = ""
-        telefono = ""
-        email = ""
-        id_cliente = ""
-        fecha_registro = ""
+    def desde_archivo(cls, contenido_archivo: str, confiar: bool = False) -> 'Cliente':
+        # Una sola pasada: cada línea se parte una vez en clave y valor, y los
+        # servicios se guardan ya empaquetados sin crear objetos Servicio.
+        # Con confiar=True no se repite validar_datos (datos escritos por el sistema)
+        campos = ["", "", "", "", ""]
+        servicios = ServiceList(Servicio)
         servicios_seccion = False
-        servicios_encontrados = []
-        for linea in lineas:
+        for linea in contenido_archivo.split('\n'):
             linea = linea.strip()
-            if linea.startswith("Nombre:"):
-                nombre = linea.split(":", 1)[1].strip()
-            elif linea.startswith("ID_Cliente:"):
-                id_cliente = linea.split(":", 1)[1].strip()
-            elif linea.startswith("Telefono:"):
-                telefono = linea.split(":", 1)[1].strip()
-            elif linea.startswith("Correo:"):
-                email = linea.split(":", 1)[1].strip()
-            elif linea.startswith("FechaRegistro:"):
-                fecha_registro = linea.split(":", 1)[1].strip()
+            clave, separador, valor = linea.partition(":")
+            indice = _CAMPOS_ARCHIVO.get(clave)
+            if indice is not None and separador:
+                campos[indice] = valor.strip()
             elif linea == "Servicios:":
                 servicios_seccion = True
             elif servicios_seccion and linea.startswith("- "):
                 servicio_texto = linea[2:]
-                if "(" in servicio_texto and ")" in servicio_texto:
-                    partes = servicio_texto.rsplit("(", 1)
-                    if len(partes) == 2:
-                        descripcion = partes[0].strip()
-                        fecha_parte = partes[1].rstrip(")")
-                        servicios_encontrados.append((descripcion, fecha_parte))
-                    else:
-                        servicios_encontrados.append((servicio_texto, None))
+                parentesis = servicio_texto.rfind("(")
+                if parentesis == -1 or ")" not in servicio_texto:
+                    servicios.append(Servicio(servicio_texto, None))
+                    continue
+                descripcion = servicio_texto[:parentesis].strip()
+                fecha_parte = servicio_texto[parentesis + 1:].rstrip(")")
+                segundos = pack_timestamp(fecha_parte)
+                if segundos is None:
+                    servicios.append(Servicio(descripcion, fecha_parte))
                 else:
-                    servicios_encontrados.append((servicio_texto, None))
-        cliente = cls(nombre=nombre, telefono=telefono, email=email)
-        cliente.id_cliente = id_cliente
+                    servicios.append_compact(descripcion, segundos)
+        # Los campos ya vienen sin espacios: no hace falta pasar por __init__
+        cliente = cls.__new__(cls)
+        cliente.nombre, cliente.telefono, cliente.email, cliente.id_cliente, fecha_registro = campos
+        if not confiar:
+            cliente.validar_datos()
         cliente.fecha_registro = fecha_registro
-        for descripcion, fecha in servicios_encontrados:
-            servicio = Servicio(descripcion, fecha)
-            cliente.servicios.append(servicio)
+        cliente.servicios = servicios
+        return cliente
+    
+    def a_campos_instantanea(self) -> Tuple[Tuple[str, ...], List[Tuple[str, str]]]:
+        campos = (self.nombre, self.telefono, self.email, self.id_cliente, self.fecha_registro)
+        servicios = [(servicio.descripcion, servicio.fecha_solicitud) for servicio in self.servicios]
+        return campos, servicios
+    
+    @classmethod
+    def desde_campos_instantanea(cls, campos: Tuple[str, ...], servicios: List[Tuple[str, str]]) -> 'Cliente':
+        # Los datos de la instantánea ya fueron validados al crearse, no se repite validar_datos
+        cliente = cls.__new__(cls)
+        cliente.nombre, cliente.telefono, cliente.email, cliente.id_cliente, cliente.fecha_registro = campos
+        cliente.servicios = [Servicio(descripcion, fecha) for descripcion, fecha in servicios]
         return cliente
     
     def __str__(self):
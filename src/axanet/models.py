@@ -18,6 +18,8 @@ Educational Notes for Students:
 3. Validation methods ensure data integrity
 4. Serialization methods allow for easy data persistence
 5. The __str__ and __repr__ methods provide meaningful string representations
+6. ``slots=True`` drops the per-instance ``__dict__``, and services are kept
+   in a ``compact.ServiceList`` so large caches stay small
 
 Design Patterns Used:
 ---------------------
@@ -28,14 +30,23 @@ Design Patterns Used:
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from re import match
 import uuid
 
+from .compact import ServiceList, pack_datetime, pack_day, unpack_datetime
 from .exceptions import ValidationError
+from .normalization import normalize_whitespace
 
 
-@dataclass
+# Header keys of the client text file and the Client field each one fills
+_FILE_FIELDS = {"Name": "name", "Client_ID": "client_id", "Phone": "phone", "Email": "email"}
+_MICROSECONDS_PER_DAY = 86_400_000_000
+# Written in place of the service lines when a client has none
+NO_SERVICES_LINE = "- No services registered yet"
+
+
+@dataclass(slots=True)
 class Service:
     """
     Represents a service requested by a client.
@@ -54,6 +65,18 @@ class Service:
     description: str
     date_requested: datetime = field(default_factory=datetime.now)
     
+    def _compact(self) -> Optional[Tuple[str, int]]:
+        """Pack into (description, microseconds) for ``ServiceList``."""
+        microseconds = pack_datetime(self.date_requested)
+        if microseconds is None:
+            return None
+        return self.description, microseconds
+    
+    @classmethod
+    def _from_compact(cls, description: str, microseconds: int) -> 'Service':
+        """Rebuild a service packed by ``_compact``."""
+        return cls(description, unpack_datetime(microseconds))
+    
     def __str__(self) -> str:
         """Return a human-readable string representation."""
         return f"- {self.description} ({self.date_requested.strftime('%Y-%m-%d')})"
@@ -74,7 +97,7 @@ class Service:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Client:
     """
     Represents a client in the Axanet system.
@@ -87,25 +110,28 @@ class Client:
         name (str): Full name of the client
         phone (str): Phone number
         email (str): Email address
-        services (List[Service]): List of services requested by the client
+        services (ServiceList): Services requested by the client
         client_id (str): Unique identifier for the client
         registration_date (datetime): When the client was registered
     
     Educational Notes:
         - The client_id is automatically generated using UUID and timestamp
-        - Services are stored as a list of Service objects
+        - Services are stored in a ServiceList (description and date columns);
+          it reads and writes Service objects like a list
         - Validation ensures data integrity before saving
         - The normalized_name property creates filesystem-safe filenames
     """
     name: str
     phone: str
     email: str
-    services: List[Service] = field(default_factory=list)
+    services: ServiceList = field(default_factory=lambda: ServiceList(Service))
     client_id: str = field(default="")
     registration_date: datetime = field(default_factory=datetime.now)
     
     def __post_init__(self):
         """Called after dataclass initialization to set computed fields."""
+        if not isinstance(self.services, ServiceList):
+            self.services = ServiceList(Service, self.services)
         if not self.client_id:
             self.client_id = self._generate_client_id()
     
@@ -140,9 +166,9 @@ class Client:
         Educational Note:
             This property converts spaces to underscores and makes lowercase
             to ensure consistent file naming across different operating systems.
+            The work is done (and memoized) by ``normalization.normalize_whitespace``.
         """
-        import re
-        return re.sub(r"\s+", "_", self.name.strip().lower())
+        return normalize_whitespace(self.name)
     
     def add_service(self, description: str) -> None:
         """
@@ -284,10 +310,32 @@ class Client:
             for service in self.services:
                 lines.append(str(service))
         else:
-            lines.append("- No services registered yet")
+            lines.append(NO_SERVICES_LINE)
         
         return "\n".join(lines)
     
+    @staticmethod
+    def count_file_services(content: str) -> int:
+        """
+        Count the service lines of a client file without building the client.
+        
+        Args:
+            content (str): Content from client text file
+            
+        Returns:
+            int: Number of "- description (date)" lines after "Services:"
+        """
+        count = 0
+        in_services_section = False
+        for line in content.split('\n'):
+            line = line.strip()
+            if in_services_section:
+                if line.startswith("- ") and " (" in line and line.endswith(")"):
+                    count += 1
+            elif line == "Services:":
+                in_services_section = True
+        return count
+    
     @classmethod
     def from_file_content(cls, content: str) -> 'Client':
         """
@@ -305,56 +353,55 @@ class Client:
         Educational Note:
             This parser reads the text file format and reconstructs the
             Client object. It demonstrates text parsing and error handling.
+            It is a single pass over the lines: dates in the usual
+            "YYYY-MM-DD" form are decoded by position, and ``strptime``
+            only runs for anything else.
         """
-        lines = content.strip().split('\n')
         client_data = {}
-        services = []
-        
-        # Parse basic client information
+        services = ServiceList(Service)
         in_services_section = False
         
-        for line in lines:
+        # Single pass: each line is split once, and well-formed service dates
+        # go straight into the ServiceList columns without a Service object
+        for line in content.split('\n'):
             line = line.strip()
             
+            if in_services_section:
+                # Parse service line: "- Service description (2024-10-22)"
+                if line.startswith("- ") and " (" in line and line.endswith(")"):
+                    last_paren = line.rfind("(")
+                    description = line[2:last_paren].strip()
+                    date_str = line[last_paren + 1:-1].strip()
+                    days = pack_day(date_str)
+                    if days is not None:
+                        services.append_compact(description, days * _MICROSECONDS_PER_DAY)
+                        continue
+                    try:
+                        service_date = datetime.strptime(date_str, "%Y-%m-%d")
+                    except ValueError:
+                        # Skip invalid date formats
+                        continue
+                    services.append(Service(description=description, date_requested=service_date))
+                continue
+            
             if line == "Services:":
                 in_services_section = True
                 continue
             
-            if in_services_section:
-                if line.startswith("- ") and " (" in line and line.endswith(")"):
-                    # Parse service line: "- Service description (2024-10-22)"
-                    service_text = line[2:]  # Remove "- "
-                    
-                    # Find the date in parentheses
-                    last_paren = service_text.rfind("(")
-                    if last_paren != -1:
-                        description = service_text[:last_paren].strip()
-                        date_str = service_text[last_paren+1:-1].strip()
-                        
-                        try:
-                            service_date = datetime.strptime(date_str, "%Y-%m-%d")
-                            service = Service(description=description, date_requested=service_date)
-                            services.append(service)
-                        except ValueError:
-                            # Skip invalid date formats
-                            continue
+            # Parse key-value pairs
+            key, separator, value = line.partition(":")
+            if not separator:
                 continue
+            key = key.strip()
             
-            # Parse key-value pairs
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip()
+            if key in _FILE_FIELDS:
+                client_data[_FILE_FIELDS[key]] = value.strip()
+            elif key == "RegistrationDate":
                 value = value.strip()
-                
-                if key == "Name":
-                    client_data["name"] = value
-                elif key == "Client_ID":
-                    client_data["client_id"] = value
-                elif key == "Phone":
-                    client_data["phone"] = value
-                elif key == "Email":
-                    client_data["email"] = value
-                elif key == "RegistrationDate":
+                days = pack_day(value)
+                if days is not None:
+                    client_data["registration_date"] = unpack_datetime(days * _MICROSECONDS_PER_DAY)
+                else:
                     try:
                         client_data["registration_date"] = datetime.strptime(value, "%Y-%m-%d")
                     except ValueError:
@@ -367,17 +414,64 @@ class Client:
                 raise ValidationError(field, "", f"Required field '{field}' not found in file")
         
         # Create client instance
-        client = cls(
+        return cls(
             name=client_data["name"],
             phone=client_data["phone"],
             email=client_data["email"],
+            services=services,
             client_id=client_data.get("client_id", ""),
             registration_date=client_data.get("registration_date", datetime.now())
         )
+    
+    def to_snapshot_fields(self) -> Tuple[Tuple[str, ...], List[Tuple[str, str]]]:
+        """
+        Convert client data to the flat string fields stored in cache snapshots.
         
-        # Add services
-        client.services = services
+        Returns:
+            Tuple: (name, phone, email, client_id, registration date) and a
+            list of (description, date) pairs, with dates at file precision
+            
+        Educational Note:
+            Dates are kept at the same day precision as the text file, so a
+            client restored from a snapshot equals one parsed from its file.
+        """
+        fields = (
+            self.name,
+            self.phone,
+            self.email,
+            self.client_id,
+            self.registration_date.strftime("%Y-%m-%d")
+        )
+        services = [
+            (service.description, service.date_requested.strftime("%Y-%m-%d"))
+            for service in self.services
+        ]
+        return fields, services
+    
+    @classmethod
+    def from_snapshot_fields(cls, fields: Tuple[str, ...], services: List[Tuple[str, str]]) -> 'Client':
+        """
+        Create Client instance from snapshot fields (see ``to_snapshot_fields``).
         
+        Args:
+            fields (Tuple[str, ...]): Client fields
+            services (List[Tuple[str, str]]): (description, date) pairs
+            
+        Returns:
+            Client: Restored client instance
+        """
+        name, phone, email, client_id, registration_date = fields
+        client = cls(
+            name=name,
+            phone=phone,
+            email=email,
+            client_id=client_id,
+            registration_date=datetime.fromisoformat(registration_date)
+        )
+        client.services = ServiceList(Service, (
+            Service(description=description, date_requested=datetime.fromisoformat(date))
+            for description, date in services
+        ))
         return client
     
     def __str__(self) -> str:
@@ -0,0 +1,103 @@
+"""
+Name Normalization for Axanet Client Manager
+============================================
+
+This module turns client names into the keys used for file names and cache
+lookups. Both client models share it, and each keeps its own rule so that
+existing data files keep their names.
+
+Functions:
+----------
+- normalize_accented: Rule used by ``modelos.Cliente`` (folds Spanish accents)
+- normalize_whitespace: Rule used by ``models.Client`` (whitespace to underscores)
+- clear_normalization_cache: Empty the memo caches
+
+Educational Notes for Students:
+-------------------------------
+1. ``str.translate`` applies a whole character mapping in one pass written
+   in C, instead of one ``str.replace`` scan per character
+2. Compiling a regular expression once at import time avoids looking it up
+   in the ``re`` module cache on every call; plain string methods written in
+   C are faster still when they can express the same rule
+3. The same names are normalized again and again (every lookup, update and
+   delete), so results are memoized in a bounded LRU cache
+4. A bounded cache keeps memory predictable: once full, the least recently
+   used names are forgotten
+"""
+
+import re
+import string
+from functools import lru_cache
+
+
+NORMALIZATION_CACHE_SIZE = 65536
+
+# Spanish rule: fold accents, spaces become underscores, then keep [a-z0-9_]
+_ACCENT_FOLDING = {'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u', 'ñ': 'n', 'ç': 'c', ' ': '_'}
+_ALLOWED_ASCII = set(string.ascii_lowercase + string.digits + "_")
+_ACCENTED_TABLE = str.maketrans({
+    **{chr(code): None for code in range(128) if chr(code) not in _ALLOWED_ASCII},
+    **_ACCENT_FOLDING,
+})
+_NOT_KEY_CHARACTER = re.compile(r"[^a-z0-9_]")
+# Pure-ASCII names take a faster bytes path: map space, delete the rest
+_ASCII_TABLE = bytes.maketrans(b" ", b"_")
+_ASCII_DELETE = bytes(code for code in range(128) if chr(code) not in _ALLOWED_ASCII and code != ord(" "))
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_accented(name: str) -> str:
+    """
+    Normalize a name with the ``Cliente`` rule.
+
+    Surrounding whitespace is stripped (as ``Cliente`` does on creation),
+    the name is lowercased, Spanish accents are folded (á -> a, ñ -> n,
+    ç -> c), spaces become underscores and every other character outside
+    ``[a-z0-9_]`` is dropped.
+
+    Args:
+        name (str): Client name
+
+    Returns:
+        str: Normalized key, e.g. "José Núñez" -> "jose_nunez"
+
+    Educational Note:
+        Most names are plain ASCII and go through ``bytes.translate``, which
+        maps and deletes in a single C loop. Otherwise the translation table
+        folds the accents and removes unwanted ASCII characters at once;
+        only names that still contain other non-ASCII characters need the
+        regular expression.
+    """
+    normalized = name.strip().lower()
+    if normalized.isascii():
+        return normalized.encode("ascii").translate(_ASCII_TABLE, _ASCII_DELETE).decode("ascii")
+    normalized = normalized.translate(_ACCENTED_TABLE)
+    if normalized.isascii():
+        return normalized
+    return _NOT_KEY_CHARACTER.sub("", normalized)
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_whitespace(name: str) -> str:
+    """
+    Normalize a name with the ``Client`` rule.
+
+    Args:
+        name (str): Client name
+
+    Returns:
+        str: Lowercased name with each run of whitespace replaced by "_"
+
+    Educational Note:
+        ``str.split()`` with no argument splits on runs of the same Unicode
+        whitespace that ``\\s+`` matches and ignores it at both ends, so
+        joining the pieces gives the result of ``re.sub(r"\\s+", "_", ...)``
+        on the stripped name without running the regex engine.
+    """
+    return "_".join(name.lower().split())
+
+
+def clear_normalization_cache() -> None:
+    """Empty the memo caches of both normalization rules."""
+    normalize_accented.cache_clear()
+    normalize_whitespace.cache_clear()
@@ -27,13 +27,27 @@ Design Patterns Used:
 """
 
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 import os
 
-from .models import Client
+from .models import NO_SERVICES_LINE, Client
+from .normalization import normalize_whitespace
 from .exceptions import ClientError, ClientNotFoundError, ClientExistsError, FileOperationError
-from .config import get_config, get_data_directory, get_client_file_path
+from .config import DatabaseConfig, get_config, get_data_directory
+from .layout import ClientFileLayout
+from .storage import GroupCommitter, LogStorage, remove_stale_temp_files, write_files_durably
+from .wal import WriteAheadLog
+from .cache import create_cache
+from .stats import RunningStatistics
+from .indexes import SortedNameIndex, TrigramIndex
+from .keyindex import KeyIndex
+from .loader import LoaderPool, iter_load
+from .locks import StripedLock
+from .metrics import MetricsExporter, MetricsRegistry, instrument_methods
+from .snapshot import load_fresh_records, write_snapshot
+from .watcher import DirectoryWatcher, FileVersions
 
 
 class FileManager:
@@ -47,14 +61,94 @@ class FileManager:
         - Abstraction layer separates file operations from business logic
         - Error handling converts system errors to domain-specific exceptions
         - Path management ensures cross-platform compatibility
-        - Atomic operations prevent data corruption
+        - Client files are replaced atomically (temporary file, fsync,
+          rename), so a crash never leaves a half-written file behind
+        - With ``storage_backend = "log"`` every operation is delegated to a
+          single segmented log instead of one file per client
+        - With ``wal_enabled`` a new service is appended to a write-ahead
+          log instead of rewriting the client file (see ``wal.WriteAheadLog``)
+        - Where each file lives (flat or in hashed subdirectories) is decided
+          by ``self.layout`` (see ``layout.ClientFileLayout``)
+        - With ``watch_enabled`` it remembers the version of every file it
+          writes or reads, so changes made by other processes stand out
+        - With ``watch_enabled``, ``self.key_index`` answers "present" from
+          memory (see ``keyindex.KeyIndex``); "absent" is always checked on
+          disk, since another process may just have written the file
     """
     
-    def __init__(self):
-        """Initialize file manager with configuration."""
+    def __init__(self, locks: Optional[StripedLock] = None):
+        """
+        Initialize file manager with configuration.
+        
+        Args:
+            locks (StripedLock, optional): The client manager's per-client
+                locks, which WAL checkpoints and layout migrations hold
+                while they rewrite or move a file
+        """
         self.config = get_config()
         self.logger = logging.getLogger(__name__)
         self._ensure_data_directory()
+        self._locks = locks or StripedLock(self.config.database.lock_stripes)
+        
+        self._log_storage: Optional[LogStorage] = None
+        self.layout = ClientFileLayout(get_data_directory(), self.config.database.file_extension)
+        if self.config.database.storage_backend == "log":
+            try:
+                self._log_storage = LogStorage.from_config(self.config.database)
+            except OSError as e:
+                raise FileOperationError("open", str(get_data_directory()), e)
+        else:
+            try:
+                self.layout = ClientFileLayout.open(
+                    get_data_directory(),
+                    self.config.database.file_extension,
+                    self.config.database.shard_depth
+                )
+            except OSError as e:
+                raise FileOperationError("open", str(get_data_directory()), e)
+            removed = sum(remove_stale_temp_files(directory) for directory in self.layout.directories())
+            if removed:
+                self.logger.info(f"Removed {removed} temporary files left by interrupted writes")
+        
+        self.versions: Optional[FileVersions] = None
+        if self._log_storage is None and self.config.database.watch_enabled:
+            self.versions = FileVersions(self.layout)
+        
+        # Only with the watcher, which reports files other processes delete
+        self.key_index: Optional[KeyIndex] = None
+        if self.versions is not None and self.config.database.existence_index != "none":
+            self.key_index = KeyIndex(
+                self.layout.names,
+                self.layout.exists,
+                self.config.database.existence_index,
+                self.config.database.bloom_false_positive_rate
+            )
+        
+        self._committer = GroupCommitter(
+            encoding=self.config.database.encoding,
+            sync=self.config.database.durable_writes
+        )
+        
+        self._wal: Optional[WriteAheadLog] = None
+        if self._log_storage is None and self.config.database.wal_enabled:
+            try:
+                self._wal = WriteAheadLog.from_config(
+                    self.config.database,
+                    get_data_directory(),
+                    self.layout.path_for,
+                    self._apply_service_records,
+                    self._locks,
+                    locate=self.layout.locate,
+                    versions=self.versions
+                )
+            except OSError as e:
+                raise FileOperationError("open", str(get_data_directory()), e)
+        
+        # Resume a layout migration that an earlier run did not finish
+        self._migration_stop = threading.Event()
+        self._migration_thread: Optional[threading.Thread] = None
+        if self.layout.migrating:
+            self._start_migration_thread()
     
     def _ensure_data_directory(self) -> None:
         """Ensure the data directory exists."""
@@ -79,17 +173,43 @@ class FileManager:
             FileOperationError: If file read fails
             ClientNotFoundError: If client file doesn't exist
         """
-        file_path = get_client_file_path(normalized_name)
-        
-        if not file_path.exists():
-            raise ClientNotFoundError(normalized_name)
+        if self._log_storage is not None:
+            try:
+                content = self._log_storage.read(normalized_name)
+            except OSError as e:
+                raise FileOperationError("read", normalized_name, e)
+            if content is None:
+                raise ClientNotFoundError(normalized_name)
+            return content
         
+        if self._wal is not None:
+            return self._wal.read(normalized_name, self._read_file)
+        return self._read_file(normalized_name)
+    
+    def _read_file(self, normalized_name: str) -> str:
+        """Read a client file as stored, without logged services."""
+        if self.versions is not None:
+            self.versions.remember(normalized_name)
         try:
-            content = file_path.read_text(encoding=self.config.database.encoding)
-            self.logger.debug(f"Read client file: {file_path}")
+            content = self.layout.read_text(normalized_name, self.config.database.encoding)
+            self.logger.debug(f"Read client file: {normalized_name}")
             return content
+        except FileNotFoundError:
+            raise ClientNotFoundError(normalized_name)
         except OSError as e:
-            raise FileOperationError("read", str(file_path), e)
+            raise FileOperationError("read", str(self.layout.locate(normalized_name)), e)
+    
+    def client_file_path(self, normalized_name: str) -> Path:
+        """
+        Get the path a client's file is currently read from.
+        
+        Args:
+            normalized_name (str): Normalized client name
+            
+        Returns:
+            Path: Path of the file (it may not exist)
+        """
+        return self.layout.locate(normalized_name)
     
     def write_client_file(self, normalized_name: str, content: str) -> None:
         """
@@ -101,14 +221,135 @@ class FileManager:
             
         Raises:
             FileOperationError: If file write fails
+            
+        Educational Note:
+            The file is replaced atomically and, with ``durable_writes``, is
+            on disk when this returns. Threads writing at the same moment
+            share one group commit (see ``storage.GroupCommitter``).
         """
-        file_path = get_client_file_path(normalized_name)
+        if self._log_storage is not None:
+            try:
+                self._log_storage.write(normalized_name, content)
+            except OSError as e:
+                raise FileOperationError("write", normalized_name, e)
+            self._locks.bump(normalized_name)
+            return
+        
+        file_path = self.layout.path_for(normalized_name)
         
         try:
-            file_path.write_text(content, encoding=self.config.database.encoding)
+            self._committer.write(file_path, content)
             self.logger.debug(f"Wrote client file: {file_path}")
         except OSError as e:
             raise FileOperationError("write", str(file_path), e)
+        # Written: a parallel load that read the old file will know to read it again
+        self._locks.bump(normalized_name)
+        if self.versions is not None:
+            self.versions.remember(normalized_name)
+        if self.key_index is not None:
+            self.key_index.add(normalized_name)
+    
+    def append_client_service(self, normalized_name: str, client: Client) -> None:
+        """
+        Persist the last service added to a client.
+        
+        Args:
+            normalized_name (str): Normalized client name
+            client (Client): Client whose newest service is the one to save
+            
+        Raises:
+            FileOperationError: If the write fails
+            
+        Educational Note:
+            With the write-ahead log this writes one short record, whatever
+            the number of services; otherwise the whole file is rewritten.
+        """
+        if self._wal is None:
+            self.write_client_file(normalized_name, client.to_file_format())
+            return
+        
+        try:
+            self._wal.append_service(normalized_name, len(client.services) - 1, str(client.services[-1]))
+        except OSError as e:
+            raise FileOperationError("write", normalized_name, e)
+        self._locks.bump(normalized_name)
+    
+    @staticmethod
+    def _apply_service_records(content: str, records: List[Tuple[int, str]]) -> str:
+        """Add logged service lines to a client file, skipping the positions it already has."""
+        # Counted, not parsed: on reads the caller parses the result anyway
+        service_count = Client.count_file_services(content)
+        lines = [line for position, line in records if position >= service_count]
+        if not lines:
+            return content
+        if service_count == 0:
+            # Match what ``to_file_format`` writes for a client with services
+            content = content.replace(f"\n{NO_SERVICES_LINE}", "")
+        return "\n".join([content, *lines])
+    
+    def checkpoint(self) -> int:
+        """
+        Fold the services waiting in the write-ahead log into the client files.
+        
+        Returns:
+            int: Number of client files rewritten (0 without the log)
+            
+        Raises:
+            FileOperationError: If a client file could not be written
+        """
+        if self._wal is None:
+            return 0
+        try:
+            return self._wal.checkpoint()
+        except OSError as e:
+            raise FileOperationError("write", str(get_data_directory()), e)
+    
+    def write_client_files(self, items: Iterable[Tuple[str, str]]) -> Dict[str, FileOperationError]:
+        """
+        Write several client files with one durability barrier.
+        
+        Args:
+            items (Iterable[Tuple[str, str]]): (normalized name, content) pairs
+            
+        Returns:
+            Dict[str, FileOperationError]: Errors by normalized name; empty
+            when every file was written and synced to disk
+            
+        Educational Note:
+            Syncing once per batch instead of once per file is what makes
+            bulk imports fast without giving up durability.
+        """
+        items = list(items)
+        if self._log_storage is not None:
+            try:
+                self._log_storage.write_many(items)
+            except OSError as e:
+                return {
+                    normalized_name: FileOperationError("write", normalized_name, e)
+                    for normalized_name, _ in items
+                }
+            for normalized_name, _ in items:
+                self._locks.bump(normalized_name)
+            return {}
+        
+        paths = {self.layout.path_for(normalized_name): normalized_name for normalized_name, _ in items}
+        failures = write_files_durably(
+            ((self.layout.path_for(normalized_name), content) for normalized_name, content in items),
+            encoding=self.config.database.encoding,
+            sync=self.config.database.durable_writes
+        )
+        self.logger.debug(f"Wrote {len(items) - len(failures)} client files in one batch")
+        for file_path, normalized_name in paths.items():
+            if file_path not in failures:
+                self._locks.bump(normalized_name)
+                if self.versions is not None:
+                    self.versions.remember(normalized_name)
+                if self.key_index is not None:
+                    self.key_index.add(normalized_name)
+        return {
+            paths[file_path]: FileOperationError("write", str(file_path), e)
+            for file_path, e in failures.items()
+        }
     
     def delete_client_file(self, normalized_name: str) -> None:
         """
@@ -121,13 +362,28 @@ class FileManager:
             FileOperationError: If file delete fails
             ClientNotFoundError: If client file doesn't exist
         """
-        file_path = get_client_file_path(normalized_name)
+        if self._log_storage is not None:
+            try:
+                deleted = self._log_storage.delete(normalized_name)
+            except OSError as e:
+                raise FileOperationError("delete", normalized_name, e)
+            if not deleted:
+                raise ClientNotFoundError(normalized_name)
+            self._locks.bump(normalized_name)
+            return
         
-        if not file_path.exists():
-            raise ClientNotFoundError(normalized_name)
+        file_path = self.layout.locate(normalized_name)
         
         try:
-            file_path.unlink()
+            if not self.layout.remove(normalized_name):
+                raise ClientNotFoundError(normalized_name)
+            self._locks.bump(normalized_name)
+            if self.versions is not None:
+                self.versions.forget(normalized_name)
+            if self.key_index is not None:
+                self.key_index.discard(normalized_name)
+            if self._wal is not None:
+                self._wal.clear(normalized_name)
             self.logger.debug(f"Deleted client file: {file_path}")
         except OSError as e:
             raise FileOperationError("delete", str(file_path), e)
@@ -142,17 +398,11 @@ class FileManager:
         Raises:
             FileOperationError: If directory listing fails
         """
+        if self._log_storage is not None:
+            return self._log_storage.keys()
+        
         try:
-            data_dir = get_data_directory()
-            file_extension = self.config.database.file_extension
-            
-            client_files = []
-            for file_path in data_dir.glob(f"*{file_extension}"):
-                if file_path.is_file():
-                    # Remove extension to get normalized name
-                    normalized_name = file_path.stem
-                    client_files.append(normalized_name)
-            
+            client_files = self.layout.names()
             self.logger.debug(f"Listed {len(client_files)} client files")
             return sorted(client_files)
         
@@ -168,9 +418,141 @@ class FileManager:
             
         Returns:
             bool: True if file exists, False otherwise
+            
+        Educational Note:
+            With the existence index a stored name is a set lookup; any
+            other answer is confirmed on disk, so a file another process
+            just wrote is never reported missing (and never overwritten).
+        """
+        if self._log_storage is not None:
+            return self._log_storage.exists(normalized_name)
+        
+        if self.key_index is not None:
+            return self.key_index.contains(normalized_name)
+        return self.layout.exists(normalized_name)
+    
+    def recheck_file(self, normalized_name: str) -> bool:
+        """
+        Check a client file on disk, bypassing the existence index, and update the index.
+        
+        Used when another process may have created or deleted the file.
+        
+        Args:
+            normalized_name (str): Normalized client name
+            
+        Returns:
+            bool: True if the file exists
         """
-        file_path = get_client_file_path(normalized_name)
-        return file_path.exists()
+        exists = self.layout.exists(normalized_name)
+        if self.key_index is not None:
+            if exists:
+                self.key_index.add(normalized_name)
+            else:
+                self.key_index.discard(normalized_name)
+        return exists
+    
+    def reset_key_index(self) -> None:
+        """Drop the existence index; it is rebuilt from a directory scan on next use."""
+        if self.key_index is not None:
+            self.key_index.reset()
+    
+    def changed_externally(self, normalized_name: str) -> bool:
+        """
+        Check whether a client's file was changed by another process.
+        
+        Args:
+            normalized_name (str): Normalized client name
+            
+        Returns:
+            bool: True if the file on disk (or its absence) is not the
+            version this manager last wrote or read; always False when
+            ``watch_enabled`` is off
+        """
+        return self.versions is not None and not self.versions.is_known(normalized_name)
+    
+    def migrate_layout(
+        self,
+        shard_depth: int,
+        background: bool = False,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Move the client files to another layout while the manager keeps working.
+        
+        Args:
+            shard_depth (int): New number of hashed directory levels (0 = flat)
+            background (bool): Move the files in a background thread and return at once
+            on_progress (Callable[[int, int], None], optional): Called with
+                (files moved, files to move) as the migration advances
+            
+        Returns:
+            int: Number of files moved (0 when running in the background)
+            
+        Raises:
+            ValueError: If the depth is out of range or the backend is "log"
+            FileOperationError: If the layout could not be changed
+            
+        Educational Note:
+            New writes go to the new layout as soon as this is called; reads
+            look in the old one too until every file has moved. If the
+            process stops first, the next start resumes the migration.
+        """
+        if self._log_storage is not None:
+            raise ValueError('The "log" storage backend has no client files to migrate')
+        self._stop_migration_thread()
+        try:
+            self.layout.start_migration(shard_depth, self._locks)
+        except OSError as e:
+            raise FileOperationError("write", str(get_data_directory()), e)
+        self.logger.info(f"Migrating client files to shard depth {shard_depth}")
+        if background:
+            self._start_migration_thread()
+            return 0
+        return self._migrate_files(on_progress)
+    
+    def _migrate_files(self, on_progress: Optional[Callable[[int, int], None]] = None) -> int:
+        try:
+            moved = self.layout.migrate(
+                self._locks,
+                on_progress,
+                stop=self._migration_stop,
+                sync=self.config.database.durable_writes
+            )
+        except OSError as e:
+            raise FileOperationError("move", str(get_data_directory()), e)
+        if not self.layout.migrating:
+            self.logger.info(f"Layout migration finished ({moved} files moved)")
+        return moved
+    
+    def _start_migration_thread(self) -> None:
+        def run() -> None:
+            try:
+                self._migrate_files()
+            except FileOperationError as e:
+                self.logger.error(f"Layout migration stopped: {e}")
+        
+        self._migration_stop.clear()
+        self._migration_thread = threading.Thread(target=run, name="axanet-layout-migration", daemon=True)
+        self._migration_thread.start()
+    
+    def _stop_migration_thread(self) -> None:
+        """Pause a background migration; the next start resumes it."""
+        if self._migration_thread is not None:
+            self._migration_stop.set()
+            self._migration_thread.join()
+            self._migration_thread = None
+            self._migration_stop.clear()
+    
+    def close(self) -> None:
+        """Release storage resources (pauses a layout migration, stops log compaction and folds the write-ahead log)."""
+        self._stop_migration_thread()
+        if self._log_storage is not None:
+            self._log_storage.close()
+        if self._wal is not None:
+            try:
+                self._wal.close()
+            except OSError as e:
+                raise FileOperationError("write", str(get_data_directory()), e)
 
 
 class ClientManager:
@@ -187,22 +569,85 @@ class ClientManager:
         - Business logic validation ensures data integrity
         - Comprehensive logging provides audit trail and debugging information
         - Error handling provides specific, actionable error messages
+        - With ``lazy_loading`` enabled only the directory of names is read at
+          startup; each client is parsed the first time it is requested
+        - A bounded cache (``cache_capacity``) evicts clients that are read
+          back from disk on the next miss, so memory no longer grows with
+          the dataset
+        - Writes hold the client's stripe of a ``StripedLock``, so the
+          manager can be shared by threads; cache hits take no lock
     
     Attributes:
-        _clients_cache (Dict[str, Client]): In-memory cache of loaded clients
+        _clients_cache (LRUCache | ARCCache): In-memory cache of loaded clients
+        _known_names (Set[str]): Normalized names of every stored client
         _file_manager (FileManager): Handles file system operations
     """
     
+    # Operations timed when ``metrics_enabled`` is on
+    _METERED_OPERATIONS = (
+        "create_client", "create_clients_batch", "get_client", "find_client", "read_client",
+        "get_all_clients", "update_client", "add_services_batch", "delete_client",
+        "client_exists", "search_clients", "get_statistics"
+    )
+    _METERED_FILE_OPERATIONS = (
+        "read_client_file", "write_client_file", "write_client_files", "append_client_service",
+        "delete_client_file", "file_exists", "list_client_files", "checkpoint"
+    )
+    
     def __init__(self):
         """Initialize client manager."""
-        self._clients_cache: Dict[str, Client] = {}
-        self._file_manager = FileManager()
+        database_config = get_config().database
+        self._database_config = database_config
+        self._clients_cache = create_cache(database_config.cache_capacity, database_config.cache_policy)
+        self._known_names: Set[str] = set()
+        self._statistics: Optional[RunningStatistics] = None
+        self._search_index: Optional[TrigramIndex] = None
+        self._name_index: Optional[SortedNameIndex] = None
+        self._load_lock = threading.Lock()
+        self._client_locks = StripedLock(database_config.lock_stripes)
+        self._warmup_stop = threading.Event()
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._snapshot_stop = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self._file_manager = FileManager(self._client_locks)
+        # Started on first bulk load and shared by all of them until close()
+        self._loader_pool = LoaderPool(database_config.loader_workers, database_config.loader_use_processes)
         self.logger = logging.getLogger(__name__)
         
-        # Load existing clients into cache
-        self._load_all_clients()
+        if database_config.lazy_loading:
+            # Only enumerate names; parsing happens on first access
+            self._load_client_names()
+            self._restore_snapshot()
+            if database_config.lazy_warmup:
+                self._start_warmup()
+        else:
+            # Load existing clients into cache
+            self._load_all_clients()
         
-        self.logger.info(f"ClientManager initialized with {len(self._clients_cache)} clients")
+        if self._snapshots_enabled() and database_config.snapshot_interval_seconds > 0:
+            self._start_snapshot_timer(database_config.snapshot_interval_seconds)
+        
+        # Pick up files changed by other processes one client at a time
+        self._watcher: Optional[DirectoryWatcher] = None
+        if self._file_manager.versions is not None:
+            try:
+                self._watcher = DirectoryWatcher(
+                    self._file_manager.layout,
+                    self._on_file_changed,
+                    self.refresh_cache,
+                    database_config.watch_backend,
+                    database_config.watch_poll_interval_seconds
+                )
+            except OSError as e:
+                raise FileOperationError("watch", str(get_data_directory()), e)
+        
+        self.metrics: Optional[MetricsRegistry] = None
+        self._metrics_exporter: Optional[MetricsExporter] = None
+        if database_config.metrics_enabled:
+            self._start_metrics(database_config)
+        
+        self.logger.info(f"ClientManager initialized with {len(self._known_names)} clients "
+                         f"({len(self._clients_cache)} loaded)")
     
     def _load_all_clients(self) -> None:
         """
@@ -213,20 +658,207 @@ class ClientManager:
             This is suitable for small to medium datasets. For larger datasets,
             you might implement lazy loading or pagination.
         """
+        self._load_client_names()
+        self._restore_snapshot()
+        names = [name for name in self._known_names if name not in self._clients_cache]
+        if self._clients_cache.capacity is not None:
+            # Bounded cache: the remaining clients are loaded on demand
+            names = names[:max(self._clients_cache.capacity - len(self._clients_cache), 0)]
+        for _ in self._bulk_load(names):
+            pass
+    
+    def _load_client_names(self) -> None:
+        """Enumerate the normalized names of all stored clients without parsing them."""
         try:
-            client_files = self._file_manager.list_client_files()
-            
-            for normalized_name in client_files:
-                try:
-                    content = self._file_manager.read_client_file(normalized_name)
-                    client = Client.from_file_content(content)
-                    self._clients_cache[normalized_name] = client
-                except Exception as e:
-                    self.logger.warning(f"Failed to load client {normalized_name}: {e}")
-                    
+            self._known_names = set(self._file_manager.list_client_files())
         except Exception as e:
             self.logger.error(f"Failed to load clients: {e}")
     
+    def _load_client(self, normalized_name: str) -> Optional[Client]:
+        """
+        Read and parse one client into the cache.
+        
+        Args:
+            normalized_name (str): Normalized client name
+            
+        Returns:
+            Optional[Client]: Loaded client, or None if it could not be loaded
+            
+        Educational Note:
+            Parsing happens outside the cache lock so the warm-up thread never
+            blocks a request; that lock only decides which of two racing loads
+            wins. The file is read and cached under the client's own stripe
+            lock, so it is never read halfway through a write, and a write
+            cannot land between the read and the cache (where it would be
+            lost if the written client were evicted before this one is cached).
+        """
+        with self._client_locks.hold(normalized_name):
+            try:
+                content = self._file_manager.read_client_file(normalized_name)
+                client = Client.from_file_content(content)
+            except Exception as e:
+                self._discard_unloadable(normalized_name, e)
+                return None
+            return self._store_loaded_client(normalized_name, client)
+    
+    def _store_loaded_client(self, normalized_name: str, client: Client) -> Optional[Client]:
+        """Cache a freshly parsed client unless another load or a delete got there first."""
+        with self._load_lock:
+            if normalized_name not in self._known_names:
+                # Deleted while we were reading it
+                return None
+            return self._clients_cache.setdefault(normalized_name, client)
+    
+    def _discard_unloadable(self, normalized_name: str, error: Any) -> None:
+        self.logger.warning(f"Failed to load client {normalized_name}: {error}")
+        self._known_names.discard(normalized_name)
+    
+    def _bulk_load(self, names: List[str]) -> Iterator[Client]:
+        """
+        Load many clients in parallel and cache them.
+        
+        Args:
+            names (List[str]): Normalized names to load
+            
+        Yields:
+            Client: Each client as soon as it is loaded
+            
+        Educational Note:
+            Files are read by ``loader_workers`` threads; with
+            ``loader_use_processes`` they are also parsed on every core.
+            Per-file failures are logged as warnings, as in a serial load.
+            Files are read without the client locks, so a client written
+            after its file was read is read again under its lock instead of
+            caching the old copy.
+        """
+        generations = self._client_locks.generations()
+        results = iter_load(
+            names,
+            read_content=self._file_manager.read_client_file,
+            parse_content=Client.from_file_content,
+            pool=self._loader_pool
+        )
+        for normalized_name, client, error in results:
+            if error is not None:
+                self._discard_unloadable(normalized_name, error)
+                continue
+            with self._client_locks.hold(normalized_name):
+                if self._client_locks.changed_since(normalized_name, generations):
+                    # Written since it was read: the cached or re-read copy is current
+                    client = self._clients_cache.peek(normalized_name) or self._load_client(normalized_name)
+                else:
+                    client = self._store_loaded_client(normalized_name, client)
+            if client is not None:
+                yield client
+    
+    def _get_loaded_client(self, normalized_name: str) -> Optional[Client]:
+        """Get a client by normalized name from the cache, reading it from disk on a miss."""
+        client = self._clients_cache.get(normalized_name)
+        if client is None and normalized_name in self._known_names:
+            client = self._load_client(normalized_name)
+        return client
+    
+    def _iter_clients(self) -> Iterator[Client]:
+        """
+        Yield every stored client, reading from disk the ones not in the cache.
+        
+        Educational Note:
+            Whole-dataset operations iterate instead of first copying every
+            client into the cache, so a bounded cache stays bounded.
+        """
+        missing = []
+        for normalized_name in list(self._known_names):
+            client = self._clients_cache.peek(normalized_name)
+            if client is None:
+                missing.append(normalized_name)
+            else:
+                yield client
+        yield from self._bulk_load(missing)
+    
+    def _snapshots_enabled(self) -> bool:
+        """Snapshots need per-client text files to detect stale entries."""
+        return self._database_config.snapshot_enabled and self._database_config.storage_backend == "files"
+    
+    def _restore_snapshot(self) -> None:
+        """
+        Fill the cache from the binary snapshot, skipping entries whose file changed.
+        
+        Educational Note:
+            Restored clients skip text parsing entirely; only a ``stat`` per
+            client is needed to prove the snapshot entry is still current.
+        """
+        if not self._snapshots_enabled():
+            return
+        fresh, stale = load_fresh_records(
+            self._database_config.snapshot_path,
+            self._file_manager.client_file_path,
+            wanted_keys=self._known_names,
+            limit=self._clients_cache.capacity
+        )
+        for normalized_name, fields, services in fresh:
+            self._store_loaded_client(normalized_name, Client.from_snapshot_fields(fields, services))
+        if fresh or stale:
+            self.logger.info(f"Restored {len(fresh)} clients from snapshot ({len(stale)} stale entries re-read)")
+    
+    def save_snapshot(self) -> int:
+        """
+        Write the cached clients to the binary snapshot file.
+        
+        Returns:
+            int: Number of clients written (0 if snapshots are disabled)
+        """
+        if not self._snapshots_enabled():
+            return 0
+        
+        def records():
+            for normalized_name, client in self._clients_cache.items():
+                try:
+                    stat = os.stat(self._file_manager.client_file_path(normalized_name))
+                except OSError:
+                    continue
+                fields, services = client.to_snapshot_fields()
+                yield normalized_name, fields, services, stat.st_mtime_ns, stat.st_size
+        
+        snapshot_path = self._database_config.snapshot_path
+        try:
+            count = write_snapshot(snapshot_path, records(), sync=self._database_config.durable_writes)
+        except OSError as e:
+            raise FileOperationError("write", str(snapshot_path), e)
+        self.logger.info(f"Saved {count} clients to snapshot {snapshot_path}")
+        return count
+    
+    def _start_snapshot_timer(self, interval_seconds: int) -> None:
+        def run() -> None:
+            while not self._snapshot_stop.wait(interval_seconds):
+                try:
+                    self.save_snapshot()
+                except FileOperationError as e:
+                    self.logger.error(f"Periodic snapshot failed: {e}")
+        
+        self._snapshot_thread = threading.Thread(target=run, name="axanet-snapshot", daemon=True)
+        self._snapshot_thread.start()
+    
+    def _start_warmup(self) -> None:
+        """Start a background thread that fills the cache after a lazy startup."""
+        self._warmup_stop.clear()
+        self._warmup_thread = threading.Thread(
+            target=self._warmup,
+            name="axanet-cache-warmup",
+            daemon=True
+        )
+        self._warmup_thread.start()
+    
+    def _warmup(self) -> None:
+        missing = [name for name in list(self._known_names) if name not in self._clients_cache]
+        if self._clients_cache.capacity is not None:
+            missing = missing[:max(self._clients_cache.capacity - len(self._clients_cache), 0)]
+        loaded = 0
+        for _ in self._bulk_load(missing):
+            loaded += 1
+            if self._warmup_stop.is_set():
+                break
+        self.logger.info(f"Cache warm-up finished, {loaded} clients loaded in background")
+    
     def create_client(self, name: str, phone: str, email: str, first_service: str) -> Client:
         """
         Create a new client with initial service.
@@ -256,24 +888,121 @@ class ClientManager:
         # Add first service
         client.add_service(first_service)
         
-        # Check if client already exists
         normalized_name = client.normalized_name
-        if normalized_name in self._clients_cache:
-            raise ClientExistsError(normalized_name)
+        with self._client_locks.hold(normalized_name):
+            # Check if client already exists
+            if normalized_name in self._clients_cache:
+                raise ClientExistsError(normalized_name)
+            
+            # Check if file exists (in case cache is out of sync)
+            if self._file_manager.file_exists(normalized_name):
+                raise ClientExistsError(normalized_name)
+            
+            # Save to file
+            content = client.to_file_format()
+            self._file_manager.write_client_file(normalized_name, content)
+            
+            # Add to cache
+            self._register_created_client(client)
+        
+        self.logger.info(f"Created client: {name} ({client.client_id})")
+        return client
+    
+    def _register_created_client(self, client: Client) -> None:
+        """Add a newly written client to the cache, statistics and indexes."""
+        normalized_name = client.normalized_name
+        with self._load_lock:
+            self._known_names.add(normalized_name)
+            self._clients_cache[normalized_name] = client
+        if self._statistics is not None:
+            self._statistics.add_client(self._service_days(client))
+        if self._search_index is not None:
+            self._index_client(self._search_index, client)
+        if self._name_index is not None:
+            self._name_index.add(normalized_name, client.name)
+    
+    @staticmethod
+    def _row_values(row: Union[Dict[str, str], Sequence[str]], fields: Sequence[str]) -> List[str]:
+        """Extract ``fields`` from a mapping row, or check the length of a sequence row."""
+        if isinstance(row, dict):
+            return [row.get(field) or "" for field in fields]
+        values = list(row)
+        if len(values) != len(fields):
+            raise ValueError(f"Expected {len(fields)} values ({', '.join(fields)}), got {len(values)}")
+        return values
+    
+    @staticmethod
+    def _batch_result(index: int) -> Dict[str, Any]:
+        return {"index": index, "name": None, "success": False, "client": None, "error": None}
+    
+    def create_clients_batch(self, rows: Iterable[Union[Dict[str, str], Sequence[str]]]) -> List[Dict[str, Any]]:
+        """
+        Create many clients with a single grouped write.
         
-        # Check if file exists (in case cache is out of sync)
-        if self._file_manager.file_exists(normalized_name):
-            raise ClientExistsError(normalized_name)
+        Args:
+            rows (Iterable): Mappings with ``name``, ``phone``, ``email`` and
+                ``first_service`` keys, or 4-item sequences in that order
+            
+        Returns:
+            List[Dict[str, Any]]: One result per row, in input order, with
+            ``index``, ``name``, ``success``, ``client`` and ``error`` keys
+            
+        Educational Note:
+            Every row is validated (including duplicates inside the batch)
+            before anything is written. Valid rows are then written together
+            and synced once, so a bad row never blocks the good ones and the
+            batch costs one durability barrier instead of one per client.
+        """
+        results: List[Dict[str, Any]] = []
+        valid: List[Tuple[Dict[str, Any], Client]] = []
         
-        # Save to file
-        content = client.to_file_format()
-        self._file_manager.write_client_file(normalized_name, content)
+        for index, row in enumerate(rows):
+            result = self._batch_result(index)
+            results.append(result)
+            try:
+                name, phone, email, first_service = self._row_values(
+                    row, ("name", "phone", "email", "first_service")
+                )
+                result["name"] = name
+                client = Client(name=name, phone=phone, email=email)
+                client.validate()
+                client.add_service(first_service)
+            except (ClientError, ValueError) as e:
+                result["error"] = str(e)
+                continue
+            valid.append((result, client))
         
-        # Add to cache
-        self._clients_cache[normalized_name] = client
+        # Existence checks and writes happen while holding every row's lock
+        with self._client_locks.hold(*(client.normalized_name for _, client in valid)):
+            pending: Dict[str, Client] = {}
+            for result, client in valid:
+                normalized_name = client.normalized_name
+                if (normalized_name in pending or normalized_name in self._known_names
+                        or self._file_manager.file_exists(normalized_name)):
+                    result["error"] = str(ClientExistsError(normalized_name))
+                    continue
+                pending[normalized_name] = client
+                result["client"] = client
+            
+            errors = self._file_manager.write_client_files(
+                (normalized_name, client.to_file_format()) for normalized_name, client in pending.items()
+            )
+            
+            for result in results:
+                client = result["client"]
+                if client is None:
+                    continue
+                error = errors.get(client.normalized_name)
+                if error is not None:
+                    result["client"] = None
+                    result["error"] = str(error)
+                    continue
+                result["success"] = True
+                self._register_created_client(client)
         
-        self.logger.info(f"Created client: {name} ({client.client_id})")
-        return client
+        created = sum(1 for result in results if result["success"])
+        self.logger.info(f"Created {created} of {len(results)} clients in batch")
+        return results
     
     def get_client(self, name: str) -> Client:
         """
@@ -288,29 +1017,118 @@ class ClientManager:
         Raises:
             ClientNotFoundError: If client doesn't exist
         """
-        # Normalize the name for lookup
-        normalized_name = Client(name=name, phone="", email="").normalized_name
-        
-        if normalized_name not in self._clients_cache:
+        client = self.find_client(name)
+        if client is None:
             raise ClientNotFoundError(name)
         
-        client = self._clients_cache[normalized_name]
-        self.logger.debug(f"Retrieved client: {name}")
+        self.logger.debug("Retrieved client: %s", name)
         return client
     
-    def get_all_clients(self) -> List[Client]:
+    def find_client(self, name: str) -> Optional[Client]:
         """
-        Get all clients.
+        Get a client by name, or None if it does not exist.
         
+        Args:
+            name (str): Client name (original or normalized)
+            
         Returns:
-            List[Client]: List of all clients
+            Optional[Client]: Client instance, or None
+            
+        Educational Note:
+            This is the hot lookup path. The key comes from the memoized
+            normalizer instead of a throwaway ``Client``, and a miss returns
+            None instead of raising, since building an exception and its
+            traceback costs more than the lookup itself.
+        """
+        return self._get_loaded_client(normalize_whitespace(name))
+    
+    def find_cached_client(self, name: str) -> Optional[Client]:
+        """
+        Get a client only if it is already in memory.
+        
+        Args:
+            name (str): Client name (original or normalized)
+            
+        Returns:
+            Optional[Client]: Cached client, or None on a cache miss
+            
+        Educational Note:
+            This never touches the disk, so it is safe to call from an
+            event loop. On a miss, follow up with ``read_client``.
+        """
+        return self._clients_cache.get(normalize_whitespace(name))
+    
+    def read_client(self, name: str) -> Optional[Client]:
+        """
+        Read a client from storage into the cache, skipping the cache lookup.
+        
+        Args:
+            name (str): Client name (original or normalized)
+            
+        Returns:
+            Optional[Client]: Loaded client, or None if it does not exist
+        """
+        normalized_name = normalize_whitespace(name)
+        if normalized_name not in self._known_names:
+            return None
+        # Another thread may have loaded it since the caller's cache miss
+        client = self._clients_cache.peek(normalized_name)
+        if client is not None:
+            return client
+        return self._load_client(normalized_name)
+    
+    def _get_name_index(self) -> SortedNameIndex:
+        """Get the sorted name index, building it from every client on first use."""
+        if self._name_index is not None:
+            return self._name_index
+        index = SortedNameIndex()
+        for client in self._iter_clients():
+            index.add(client.normalized_name, client.name)
+        # Kept only while other processes' changes reach this manager; otherwise
+        # every listing rebuilds it and sees their creates and deletes
+        if self._aggregates_stay_current():
+            self._name_index = index
+        return index
+    
+    def iter_all_clients(self, after: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Client]:
+        """
+        Stream clients in name order.
+        
+        Args:
+            after (str, optional): Cursor; start after the client with this name
+            limit (int, optional): Maximum number of clients to yield
+            
+        Yields:
+            Client: Clients sorted by name
+            
+        Educational Note:
+            The order comes from a sorted index that create and delete keep
+            current, so no sort runs here. To fetch the next page, pass the
+            name of the last client received as ``after``. With per-client
+            files and ``watch_enabled`` off the index is rebuilt on every
+            call, since only the watcher reports other processes' changes.
+        """
+        for normalized_name in self._get_name_index().iter_keys(after, limit):
+            client = self._get_loaded_client(normalized_name)
+            if client is not None:
+                yield client
+    
+    def get_all_clients(self, after: Optional[str] = None, limit: Optional[int] = None) -> List[Client]:
+        """
+        Get all clients, or one page of them.
+        
+        Args:
+            after (str, optional): Cursor; start after the client with this name
+            limit (int, optional): Maximum number of clients to return
+        
+        Returns:
+            List[Client]: Clients sorted by name
             
         Educational Note:
             Returns a copy of the clients list to prevent external modification
             of the internal cache. This is a defensive programming practice.
         """
-        clients = list(self._clients_cache.values())
-        clients.sort(key=lambda c: c.name)  # Sort by name for consistent ordering
+        clients = list(self.iter_all_clients(after, limit))
         
         self.logger.debug(f"Retrieved {len(clients)} clients")
         return clients
@@ -331,20 +1149,104 @@ class ClientManager:
             ValidationError: If service description is invalid
             FileOperationError: If file operations fail
         """
-        # Get client from cache
-        client = self.get_client(name)
-        
-        # Add new service (this validates the service description)
-        client.add_service(new_service)
-        
-        # Save updated client to file
-        normalized_name = client.normalized_name
-        content = client.to_file_format()
-        self._file_manager.write_client_file(normalized_name, content)
+        # Read-modify-write under the client's lock, so two threads adding a
+        # service to the same client cannot overwrite each other's file
+        with self._client_locks.hold(normalize_whitespace(name)):
+            # Get client from cache
+            client = self.get_client(name)
+            
+            # Add new service (this validates the service description)
+            client.add_service(new_service)
+            
+            # Save the new service (one log record, or a full file rewrite)
+            normalized_name = client.normalized_name
+            try:
+                self._file_manager.append_client_service(normalized_name, client)
+            except FileOperationError:
+                # Keep the cached client matching the file
+                del client.services[-1]
+                raise
+            
+            if self._statistics is not None:
+                self._statistics.add_service(client.services[-1].date_requested.strftime("%Y-%m-%d"))
         
         self.logger.info(f"Updated client {name} with new service: {new_service}")
         return client
     
+    def add_services_batch(self, rows: Iterable[Union[Dict[str, str], Sequence[str]]]) -> List[Dict[str, Any]]:
+        """
+        Add many services with a single grouped write.
+        
+        Args:
+            rows (Iterable): Mappings with ``name`` and ``service`` keys, or
+                2-item sequences in that order
+            
+        Returns:
+            List[Dict[str, Any]]: One result per row, in input order, with
+            ``index``, ``name``, ``success``, ``client`` and ``error`` keys
+            
+        Educational Note:
+            Several services for the same client are merged into one file
+            write. If that write fails, the services are taken back out of
+            the in-memory client so it keeps matching what is on disk.
+        """
+        results: List[Dict[str, Any]] = []
+        valid: List[Tuple[Dict[str, Any], str, str, str]] = []
+        
+        for index, row in enumerate(rows):
+            result = self._batch_result(index)
+            results.append(result)
+            try:
+                name, service = self._row_values(row, ("name", "service"))
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+            result["name"] = name
+            valid.append((result, name, normalize_whitespace(name), service))
+        
+        with self._client_locks.hold(*(normalized_name for _, _, normalized_name, _ in valid)):
+            changed: Dict[str, Client] = {}
+            added: Dict[str, int] = {}
+            for result, name, normalized_name, service in valid:
+                try:
+                    client = changed.get(normalized_name) or self._get_loaded_client(normalized_name)
+                    if client is None:
+                        raise ClientNotFoundError(name)
+                    client.add_service(service)
+                except (ClientError, ValueError) as e:
+                    result["error"] = str(e)
+                    continue
+                changed[normalized_name] = client
+                added[normalized_name] = added.get(normalized_name, 0) + 1
+                result["client"] = client
+            
+            errors = self._file_manager.write_client_files(
+                (normalized_name, client.to_file_format()) for normalized_name, client in changed.items()
+            )
+            
+            for normalized_name, count in added.items():
+                client = changed[normalized_name]
+                if normalized_name in errors:
+                    del client.services[-count:]
+                elif self._statistics is not None:
+                    for day in self._service_days(client)[-count:]:
+                        self._statistics.add_service(day)
+        
+        for result in results:
+            client = result["client"]
+            if client is None:
+                continue
+            error = errors.get(client.normalized_name)
+            if error is not None:
+                result["client"] = None
+                result["error"] = str(error)
+            else:
+                result["success"] = True
+        
+        updated = sum(1 for result in results if result["success"])
+        self.logger.info(f"Added {updated} of {len(results)} services in batch")
+        return results
+    
     def delete_client(self, name: str) -> bool:
         """
         Delete a client.
@@ -359,15 +1261,27 @@ class ClientManager:
             ClientNotFoundError: If client doesn't exist
             FileOperationError: If file operations fail
         """
-        # Get client to ensure it exists
-        client = self.get_client(name)
-        normalized_name = client.normalized_name
-        
-        # Delete file
-        self._file_manager.delete_client_file(normalized_name)
-        
-        # Remove from cache
-        del self._clients_cache[normalized_name]
+        with self._client_locks.hold(normalize_whitespace(name)):
+            # Get client to ensure it exists
+            client = self.get_client(name)
+            normalized_name = client.normalized_name
+            
+            # Delete file
+            self._file_manager.delete_client_file(normalized_name)
+            
+            # Remove from cache
+            with self._load_lock:
+                self._known_names.discard(normalized_name)
+                self._clients_cache.pop(normalized_name, None)
+            
+            # Still under the client's lock: a client re-created with the same
+            # name must not lose its index entries or statistics to this delete
+            if self._statistics is not None:
+                self._statistics.remove_client(self._service_days(client))
+            if self._search_index is not None:
+                self._search_index.remove(normalized_name)
+            if self._name_index is not None:
+                self._name_index.remove(normalized_name)
         
         self.logger.info(f"Deleted client: {name} ({client.client_id})")
         return True
@@ -382,8 +1296,7 @@ class ClientManager:
         Returns:
             bool: True if client exists
         """
-        normalized_name = Client(name=name, phone="", email="").normalized_name
-        return normalized_name in self._clients_cache
+        return normalize_whitespace(name) in self._known_names
     
     def get_client_count(self) -> int:
         """
@@ -392,37 +1305,49 @@ class ClientManager:
         Returns:
             int: Number of clients
         """
-        return len(self._clients_cache)
+        return len(self._known_names)
+    
+    @staticmethod
+    def _index_client(index: TrigramIndex, client: Client) -> None:
+        """Add a client's searchable fields to the trigram index."""
+        index.add(client.normalized_name, (client.name, client.email, client.phone), client.name)
+    
+    def _get_search_index(self) -> TrigramIndex:
+        """Get the trigram index, building it from every client on first use."""
+        if self._search_index is None:
+            index = TrigramIndex()
+            for client in self._iter_clients():
+                self._index_client(index, client)
+            self._search_index = index
+            self.logger.debug(f"Search index built for {len(index)} clients")
+        return self._search_index
     
-    def search_clients(self, query: str) -> List[Client]:
+    def search_clients(self, query: str, offset: int = 0, limit: Optional[int] = None) -> List[Client]:
         """
         Search clients by name, email, or phone.
         
         Args:
             query (str): Search query
+            offset (int): Number of matches to skip (for pagination)
+            limit (int, optional): Maximum number of clients to return
             
         Returns:
-            List[Client]: Matching clients
+            List[Client]: Matching clients, sorted by name
             
         Educational Note:
-            This demonstrates basic search functionality. In a production
-            system, you might implement more sophisticated search with
-            indexing, fuzzy matching, or full-text search capabilities.
+            Matches come from a trigram index (see ``indexes.TrigramIndex``)
+            that create and delete keep current, so a query only looks at
+            clients sharing its trigrams. Only the requested page of clients
+            is loaded.
         """
-        query = query.lower().strip()
+        matching_names, total = self._get_search_index().search(query, offset, limit)
         matching_clients = []
-        
-        for client in self._clients_cache.values():
-            # Search in name, email, and phone
-            if (query in client.name.lower() or 
-                query in client.email.lower() or 
-                query in client.phone):
+        for normalized_name in matching_names:
+            client = self._get_loaded_client(normalized_name)
+            if client is not None:
                 matching_clients.append(client)
         
-        # Sort by name for consistent results
-        matching_clients.sort(key=lambda c: c.name)
-        
-        self.logger.debug(f"Search for '{query}' found {len(matching_clients)} clients")
+        self.logger.debug(f"Search for '{query}' found {total} clients")
         return matching_clients
     
     def refresh_cache(self) -> None:
@@ -432,23 +1357,269 @@ class ClientManager:
         Educational Note:
             This method is useful for scenarios where external processes
             might modify the data files, or for debugging cache-related issues.
+            With ``watch_enabled`` it is only needed if change notifications
+            were lost (the watcher then calls it itself).
         """
+        self._stop_warmup()
+        self._file_manager.reset_key_index()
         self._clients_cache.clear()
-        self._load_all_clients()
-        self.logger.info(f"Cache refreshed with {len(self._clients_cache)} clients")
+        self._statistics = None
+        self._search_index = None
+        self._name_index = None
+        database_config = get_config().database
+        if database_config.lazy_loading:
+            self._load_client_names()
+            if database_config.lazy_warmup:
+                self._start_warmup()
+        else:
+            self._load_all_clients()
+        self.logger.info(f"Cache refreshed with {len(self._known_names)} clients")
+    
+    def _on_file_changed(self, normalized_name: str) -> bool:
+        """
+        Bring one client up to date after its file changed on disk.
+        
+        Args:
+            normalized_name (str): Normalized name of the changed file
+            
+        Returns:
+            bool: False if the file is the version this manager wrote or
+            read (its own change), True if the client was refreshed
+            
+        Educational Note:
+            A cached client is reloaded and its statistics adjusted by the
+            difference. For a client that was not cached the old services
+            are unknown, so the statistics are recomputed on next use.
+        """
+        with self._client_locks.hold(normalized_name):
+            if not self._file_manager.changed_externally(normalized_name):
+                return False
+            self._client_locks.bump(normalized_name)
+            cached = self._clients_cache.peek(normalized_name)
+            
+            if not self._file_manager.recheck_file(normalized_name):
+                # Deleted by another process
+                self._file_manager.versions.forget(normalized_name)
+                with self._load_lock:
+                    self._known_names.discard(normalized_name)
+                    self._clients_cache.pop(normalized_name, None)
+                if self._statistics is not None:
+                    if cached is None:
+                        self._statistics = None
+                    else:
+                        self._statistics.remove_client(self._service_days(cached))
+                if self._search_index is not None:
+                    self._search_index.remove(normalized_name)
+                if self._name_index is not None:
+                    self._name_index.remove(normalized_name)
+                return True
+            
+            if normalized_name not in self._known_names:
+                # Created by another process
+                client = Client.from_file_content(self._file_manager.read_client_file(normalized_name))
+                self._register_created_client(client)
+                return True
+            
+            if cached is None and self._statistics is None and self._search_index is None \
+                    and self._name_index is None:
+                # Nothing in memory depends on this file; the next access reads it
+                self._file_manager.versions.remember(normalized_name)
+                return True
+            
+            try:
+                client = Client.from_file_content(self._file_manager.read_client_file(normalized_name))
+            except Exception:
+                # Possibly caught halfway through an in-place write: drop it
+                # and let the next access (or the next event) read it again
+                with self._load_lock:
+                    self._clients_cache.pop(normalized_name, None)
+                self._statistics = None
+                raise
+            with self._load_lock:
+                if cached is not None:
+                    self._clients_cache[normalized_name] = client
+            if self._statistics is not None:
+                if cached is None:
+                    self._statistics = None
+                else:
+                    self._statistics.remove_client(self._service_days(cached))
+                    self._statistics.add_client(self._service_days(client))
+            if self._search_index is not None:
+                self._index_client(self._search_index, client)
+            if self._name_index is not None:
+                self._name_index.add(normalized_name, client.name)
+            return True
+    
+    def get_watcher_statistics(self) -> Dict[str, Any]:
+        """
+        Get the change watcher's counters.
+        
+        Returns:
+            Dict[str, Any]: Backend, events, invalidations, own writes
+            skipped, overflows, errors and reload latency; empty when
+            ``watch_enabled`` is off
+        """
+        return self._watcher.stats() if self._watcher is not None else {}
+    
+    def get_existence_index_statistics(self) -> Dict[str, Any]:
+        """
+        Get the existence index's counters.
+        
+        Returns:
+            Dict[str, Any]: Mode, names recorded, memory used, lookups
+            answered "absent" from memory, "maybe" answers confirmed on
+            disk and rebuilds; empty when ``existence_index`` is "none" or
+            the log backend is used
+        """
+        key_index = self._file_manager.key_index
+        return key_index.stats() if key_index is not None else {}
+    
+    def get_cache_statistics(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dict[str, Any]: Hits, misses, evictions, size, capacity and hit ratio
+        """
+        return self._clients_cache.stats()
+    
+    def _start_metrics(self, database_config: DatabaseConfig) -> None:
+        """
+        Time the manager's and the file manager's operations and publish them.
+        
+        Educational Note:
+            Only this object's methods are wrapped, after everything else
+            is set up: loading at startup is not counted, and a manager
+            without ``metrics_enabled`` runs the plain methods.
+        """
+        self.metrics = MetricsRegistry()
+        instrument_methods(self.metrics, self, self._METERED_OPERATIONS, "client_manager")
+        instrument_methods(self.metrics, self._file_manager, self._METERED_FILE_OPERATIONS, "file_manager")
+        self.metrics.register_collector("clients", lambda: {"stored": len(self._known_names)})
+        self.metrics.register_collector("cache", self.get_cache_statistics)
+        self.metrics.register_collector("existence_index", self.get_existence_index_statistics)
+        self.metrics.register_collector("watcher", self.get_watcher_statistics)
+        if database_config.metrics_file or database_config.metrics_port:
+            try:
+                self._metrics_exporter = MetricsExporter(
+                    self.metrics,
+                    Path(database_config.metrics_file) if database_config.metrics_file else None,
+                    database_config.metrics_format,
+                    database_config.metrics_interval_seconds,
+                    database_config.metrics_port
+                )
+            except OSError as e:
+                raise FileOperationError("serve", f"127.0.0.1:{database_config.metrics_port}", e)
     
-    def get_statistics(self) -> Dict[str, int | float]:
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get operation metrics.
+        
+        Returns:
+            Dict[str, Any]: Calls, errors, throughput and p50/p95/p99
+            latency per operation, plus cache, index and watcher counters;
+            empty when ``metrics_enabled`` is off
+        """
+        return self.metrics.to_dict() if self.metrics is not None else {}
+    
+    def _stop_warmup(self) -> None:
+        if self._warmup_thread is not None:
+            self._warmup_stop.set()
+            self._warmup_thread.join()
+            self._warmup_thread = None
+    
+    def migrate_layout(
+        self,
+        shard_depth: int,
+        background: bool = False,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Move the client files to another directory layout without stopping the manager.
+        
+        Args:
+            shard_depth (int): New number of hashed directory levels (0 = flat)
+            background (bool): Move the files in a background thread and return at once
+            on_progress (Callable[[int, int], None], optional): Called with
+                (files moved, files to move) as the migration advances
+            
+        Returns:
+            int: Number of files moved (0 when running in the background)
+        """
+        return self._file_manager.migrate_layout(shard_depth, background, on_progress)
+    
+    def close(self) -> None:
+        """Stop background threads, fold the write-ahead log, save the snapshot (if enabled) and release storage and loader workers."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        self._stop_warmup()
+        if self._snapshot_thread is not None:
+            self._snapshot_stop.set()
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        # Fold logged services first, so the snapshot sees the final files
+        self._file_manager.checkpoint()
+        self.save_snapshot()
+        self._file_manager.close()
+        self._loader_pool.close()
+        if self._metrics_exporter is not None:
+            self._metrics_exporter.close()
+            self._metrics_exporter = None
+    
+    @staticmethod
+    def _service_days(client: Client) -> List[str]:
+        """Get the "YYYY-MM-DD" day of every service of a client."""
+        return [service.date_requested.strftime("%Y-%m-%d") for service in client.services]
+    
+    def _aggregates_stay_current(self) -> bool:
+        """Whether totals built from every client can be kept between calls."""
+        # Other processes' writes only reach this manager through the watcher;
+        # the log backend is not shared between processes
+        return self._database_config.storage_backend != "files" or self._file_manager.versions is not None
+    
+    def _compute_statistics(self) -> RunningStatistics:
+        """Recompute statistics from scratch by walking every client."""
+        return RunningStatistics.from_service_days(
+            self._service_days(client) for client in self._iter_clients()
+        )
+    
+    def get_statistics(self, verify: bool = False) -> Dict[str, int | float | Dict[str, int]]:
         """
         Get usage statistics.
         
+        Args:
+            verify (bool): Recompute from scratch and resynchronize if the
+                running totals have drifted
+        
         Returns:
-            Dict[str, int | float]: Statistics about clients and services
+            Dict[str, int | float | Dict[str, int]]: Statistics about clients and services
+            
+        Educational Note:
+            The first call walks every client once; after that create, update
+            and delete keep the totals current and this method is O(1).
+            That only holds while this manager sees every change: with
+            per-client files and ``watch_enabled`` off, another process may
+            have written since, so every call walks the clients again.
         """
-        total_clients = len(self._clients_cache)
-        total_services = sum(len(client.services) for client in self._clients_cache.values())
+        if not self._aggregates_stay_current():
+            statistics = self._compute_statistics()
+        else:
+            if self._statistics is None:
+                self._statistics = self._compute_statistics()
+            elif verify:
+                recomputed = self._compute_statistics()
+                drift = self._statistics.differences(recomputed)
+                if drift:
+                    self.logger.warning(f"Statistics drift detected, resynchronizing: {drift}")
+                    self._statistics = recomputed
+            statistics = self._statistics
+        
+        total_clients, total_services, services_per_day = statistics.snapshot()
         
         return {
             "total_clients": total_clients,
             "total_services": total_services,
-            "average_services_per_client": round(total_services / total_clients, 2) if total_clients > 0 else 0
+            "average_services_per_client": round(total_services / total_clients, 2) if total_clients > 0 else 0,
+            "services_per_day": services_per_day
         }
\ No newline at end of file
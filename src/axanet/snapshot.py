@@ -0,0 +1,288 @@
+"""
+Binary Cache Snapshots for Axanet Client Manager
+================================================
+
+This module saves the in-memory client cache to one compact binary file and
+maps it back into memory on the next start, so unchanged clients do not
+have to be parsed and validated again.
+
+Functions:
+----------
+- write_snapshot: Save client records to a snapshot file
+- load_fresh_records: Read back the records whose text file did not change
+
+Classes:
+--------
+- Snapshot: Read-only, memory-mapped view of a snapshot file
+
+Educational Notes for Students:
+-------------------------------
+1. A columnar layout stores each field in its own array instead of storing
+   one object after another; arrays of integers are compact and can be used
+   straight from a memory-mapped file without copying
+2. A string table stores every distinct string once; records hold 4-byte
+   indexes into it, so repeated values (dates, services) cost almost nothing
+3. Each record keeps the modification time and size of its text file; if
+   either changed since the snapshot was written, that entry is stale
+4. The snapshot is written to a uniquely named temporary file and renamed
+   into place, so a crash while saving never leaves a half-written
+   snapshot behind and two threads saving at once never share a file
+
+File layout (little endian):
+----------------------------
+    header: magic, version, records, services, strings, string bytes, crc32
+    string offsets   uint64[strings + 1]
+    string bytes     utf-8, padded to 8 bytes
+    record columns   uint32[records] x 6  (key + 5 client fields)
+    file stamps      int64[records] x 2   (mtime_ns, size)
+    service starts   uint32[records + 1]
+    service columns  uint32[services] x 2 (description, date)
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .storage import write_files_durably
+
+
+MAGIC = b"AXSNAP\x00\x01"
+VERSION = 1
+_HEADER = struct.Struct("<8sIQQQQI")
+FIELD_COUNT = 5
+
+# (key, five client fields, [(service description, service date)], mtime_ns, size)
+SnapshotRecord = Tuple[str, Tuple[str, ...], List[Tuple[str, str]], int, int]
+# (key, five client fields, [(service description, service date)])
+ClientFields = Tuple[str, Tuple[str, ...], List[Tuple[str, str]]]
+
+
+def _padding(length: int) -> bytes:
+    return b"\x00" * (-length % 8)
+
+
+def write_snapshot(path: Path, records: Iterable[SnapshotRecord], sync: bool = True) -> int:
+    """
+    Write a snapshot file atomically.
+
+    Args:
+        path (Path): Destination file
+        records (Iterable[SnapshotRecord]): Records to store
+        sync (bool): Whether to fsync before the rename (``durable_writes``)
+
+    Returns:
+        int: Number of records written
+
+    Raises:
+        OSError: If the snapshot could not be written
+    """
+    string_ids: Dict[str, int] = {}
+    string_offsets = array("Q", [0])
+    string_bytes = bytearray()
+
+    def intern(value: str) -> int:
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = len(string_ids)
+            string_ids[value] = string_id
+            string_bytes.extend(value.encode("utf-8"))
+            string_offsets.append(len(string_bytes))
+        return string_id
+
+    columns = [array("I") for _ in range(FIELD_COUNT + 1)]
+    mtimes = array("q")
+    sizes = array("q")
+    service_starts = array("I", [0])
+    service_descriptions = array("I")
+    service_dates = array("I")
+
+    for key, fields, services, mtime_ns, size in records:
+        columns[0].append(intern(key))
+        for column, value in zip(columns[1:], fields):
+            column.append(intern(value))
+        mtimes.append(mtime_ns)
+        sizes.append(size)
+        for description, date in services:
+            service_descriptions.append(intern(description))
+            service_dates.append(intern(date))
+        service_starts.append(len(service_descriptions))
+
+    body = bytearray()
+    body += string_offsets.tobytes()
+    body += string_bytes + _padding(len(string_bytes))
+    for column in columns:
+        body += column.tobytes() + _padding(len(column) * 4)
+    body += mtimes.tobytes() + sizes.tobytes()
+    body += service_starts.tobytes() + _padding(len(service_starts) * 4)
+    body += service_descriptions.tobytes() + _padding(len(service_descriptions) * 4)
+    body += service_dates.tobytes()
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, len(mtimes), len(service_descriptions),
+        len(string_ids), len(string_bytes), zlib.crc32(body)
+    )
+
+    # Hidden, unique temporary name: remove_stale_temp_files cleans it up after a crash
+    failures = write_files_durably([(Path(path), bytes(header + _padding(_HEADER.size) + body))], sync=sync)
+    if failures:
+        raise next(iter(failures.values()))
+    return len(mtimes)
+
+
+class Snapshot:
+    """
+    Memory-mapped, read-only view of a snapshot file.
+
+    Integer columns are ``memoryview`` casts over the mapping, so opening a
+    snapshot costs a checksum pass and no per-record work. Strings are only
+    decoded when a record is materialized.
+
+    Args:
+        path (Path): Snapshot file
+
+    Raises:
+        ValueError: If the file is not a valid snapshot
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Empty snapshot file: {self.path}")
+
+        view = memoryview(self._map)
+        try:
+            self._parse(view)
+        except Exception:
+            view.release()
+            self.close()
+            raise
+
+    def _parse(self, view: memoryview) -> None:
+        if len(view) < _HEADER.size:
+            raise ValueError(f"Truncated snapshot file: {self.path}")
+        magic, version, records, services, strings, string_length, crc = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a snapshot file (or unsupported version): {self.path}")
+        offset = _HEADER.size + len(_padding(_HEADER.size))
+        if zlib.crc32(view[offset:]) != crc:
+            raise ValueError(f"Snapshot checksum mismatch: {self.path}")
+
+        def take(length: int, typecode: Optional[str] = None) -> memoryview:
+            nonlocal offset
+            section = view[offset:offset + length]
+            if len(section) != length:
+                raise ValueError(f"Truncated snapshot file: {self.path}")
+            offset += length + len(_padding(length))
+            return section.cast(typecode) if typecode else section
+
+        self._string_offsets = take((strings + 1) * 8, "Q")
+        self._string_bytes = take(string_length)
+        self._columns = [take(records * 4, "I") for _ in range(FIELD_COUNT + 1)]
+        self._mtimes = take(records * 8, "q")
+        self._sizes = take(records * 8, "q")
+        self._service_starts = take((records + 1) * 4, "I")
+        self._service_descriptions = take(services * 4, "I")
+        self._service_dates = take(services * 4, "I")
+        self._records = records
+        self._views = [
+            self._string_offsets, self._string_bytes, *self._columns, self._mtimes,
+            self._sizes, self._service_starts, self._service_descriptions, self._service_dates, view
+        ]
+
+    @classmethod
+    def open(cls, path: Path) -> Optional['Snapshot']:
+        """Open a snapshot, or return None if it is missing or invalid."""
+        try:
+            return cls(path)
+        except (OSError, ValueError):
+            return None
+
+    def _string(self, string_id: int) -> str:
+        start = self._string_offsets[string_id]
+        end = self._string_offsets[string_id + 1]
+        return str(self._string_bytes[start:end], "utf-8")
+
+    def __len__(self) -> int:
+        return self._records
+
+    def key(self, index: int) -> str:
+        """Get the normalized client name of a record."""
+        return self._string(self._columns[0][index])
+
+    def stamp(self, index: int) -> Tuple[int, int]:
+        """Get the (mtime_ns, size) recorded for a record's text file."""
+        return self._mtimes[index], self._sizes[index]
+
+    def record(self, index: int) -> ClientFields:
+        """Materialize one record as (key, fields, services)."""
+        fields = tuple(self._string(column[index]) for column in self._columns[1:])
+        services = [
+            (self._string(self._service_descriptions[i]), self._string(self._service_dates[i]))
+            for i in range(self._service_starts[index], self._service_starts[index + 1])
+        ]
+        return self.key(index), fields, services
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        for section in getattr(self, "_views", []):
+            section.release()
+        self._views = []
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def load_fresh_records(
+    path: Path,
+    path_for_key: Callable[[str], Path],
+    wanted_keys: Optional[Set[str]] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[ClientFields], Set[str]]:
+    """
+    Read the snapshot records whose text file is unchanged.
+
+    Args:
+        path (Path): Snapshot file
+        path_for_key (Callable): Maps a normalized name to its text file
+        wanted_keys (Set[str], optional): Only consider these keys
+        limit (int, optional): Stop after this many fresh records
+
+    Returns:
+        Tuple[List[ClientFields], Set[str]]: Fresh records, and keys whose
+        file changed or disappeared since the snapshot was written
+    """
+    snapshot = Snapshot.open(path)
+    if snapshot is None:
+        return [], set()
+
+    fresh: List[ClientFields] = []
+    stale: Set[str] = set()
+    try:
+        for index in range(len(snapshot)):
+            if limit is not None and len(fresh) >= limit:
+                break
+            key = snapshot.key(index)
+            if wanted_keys is not None and key not in wanted_keys:
+                continue
+            try:
+                stat = os.stat(path_for_key(key))
+            except OSError:
+                stale.add(key)
+                continue
+            if (stat.st_mtime_ns, stat.st_size) != snapshot.stamp(index):
+                stale.add(key)
+                continue
+            fresh.append(snapshot.record(index))
+    finally:
+        snapshot.close()
+    return fresh, stale
+
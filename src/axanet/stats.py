@@ -0,0 +1,113 @@
+"""
+Running Statistics for Axanet Client Manager
+============================================
+
+This module keeps the client and service totals up to date as clients are
+created, updated and deleted, so statistics can be answered without walking
+every client again.
+
+Classes:
+--------
+- RunningStatistics: Incrementally maintained totals and services per day
+
+Educational Notes for Students:
+-------------------------------
+1. Recomputing a sum over N clients on every request costs O(N) each time
+2. Updating the sum when the data changes costs O(1) per change instead
+3. Aggregates that are maintained by hand can drift if some write path
+   forgets to update them, so a "verify" mode recomputes from scratch and
+   compares
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Tuple
+
+
+class RunningStatistics:
+    """
+    Incrementally maintained totals for clients and services.
+
+    Service dates are grouped by day using their "YYYY-MM-DD" prefix.
+
+    Attributes:
+        total_clients (int): Number of clients
+        total_services (int): Number of services across all clients
+        services_per_day (Counter): Number of services requested per day
+    """
+
+    def __init__(self):
+        self.total_clients = 0
+        self.total_services = 0
+        self.services_per_day: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_service_days(cls, clients_service_days: Iterable[Iterable[str]]) -> 'RunningStatistics':
+        """
+        Build statistics from scratch.
+
+        Args:
+            clients_service_days: One iterable of service days per client
+
+        Returns:
+            RunningStatistics: Freshly computed statistics
+        """
+        statistics = cls()
+        for service_days in clients_service_days:
+            statistics.add_client(service_days)
+        return statistics
+
+    def add_client(self, service_days: Iterable[str]) -> None:
+        """Account for a new client and its initial services."""
+        with self._lock:
+            self.total_clients += 1
+            for day in service_days:
+                self.total_services += 1
+                self.services_per_day[day] += 1
+
+    def remove_client(self, service_days: Iterable[str]) -> None:
+        """Remove a deleted client and its services from the totals."""
+        with self._lock:
+            self.total_clients -= 1
+            for day in service_days:
+                self.total_services -= 1
+                self.services_per_day[day] -= 1
+                if self.services_per_day[day] <= 0:
+                    del self.services_per_day[day]
+
+    def add_service(self, day: str) -> None:
+        """Account for one service added to an existing client."""
+        with self._lock:
+            self.total_services += 1
+            self.services_per_day[day] += 1
+
+    def snapshot(self) -> Tuple[int, int, Dict[str, int]]:
+        """
+        Get a consistent copy of the current totals.
+
+        Returns:
+            Tuple[int, int, Dict[str, int]]: Clients, services and services per day
+        """
+        with self._lock:
+            return self.total_clients, self.total_services, dict(sorted(self.services_per_day.items()))
+
+    def differences(self, other: 'RunningStatistics') -> Dict[str, Any]:
+        """
+        Compare against another set of statistics (normally a recomputation).
+
+        Args:
+            other (RunningStatistics): Statistics to compare with
+
+        Returns:
+            Dict[str, Any]: Fields that differ, as (this, other) pairs; empty if none
+        """
+        mine = self.snapshot()
+        theirs = other.snapshot()
+        differences = {}
+        for field_name, this_value, other_value in zip(
+            ("total_clients", "total_services", "services_per_day"), mine, theirs
+        ):
+            if this_value != other_value:
+                differences[field_name] = (this_value, other_value)
+        return differences
@@ -0,0 +1,706 @@
+"""
+Append-Only Log Storage for Axanet Client Manager
+=================================================
+
+This module provides an alternative storage engine to the classic
+"one text file per client" layout. Client records are appended to a small
+number of segment files and located through an in-memory offset index.
+
+Classes:
+--------
+- LogStorage: Segmented append-only key/value store with background compaction
+- GroupCommitter: Atomic single-file writes whose fsyncs are shared by concurrent writers
+
+Functions:
+----------
+- write_files_durably: Atomically replace many files with one durability barrier
+- remove_stale_temp_files: Clean up temporary files left by interrupted writes
+
+Educational Notes for Students:
+-------------------------------
+1. Appending is cheap: the disk only ever writes at the end of a file
+2. An index (dictionary) maps every key to the position of its latest record
+3. Old versions and deleted records become "dead bytes" that compaction reclaims
+4. Checksums (CRC32) let the loader detect a record torn by a crash
+5. This is the same idea used by Bitcask and by the LSM trees behind many databases
+6. ``fsync`` is what makes a write survive a power cut, and it is slow; writing
+   a whole batch first and syncing once at the end ("group commit") pays that
+   cost once per batch instead of once per record
+7. Overwriting a file in place is not atomic: a crash halfway leaves it
+   truncated. Writing a temporary file, syncing it and renaming it over the
+   original is, because a rename replaces the directory entry in one step
+8. The offset index lives in one process's memory, so only one process may
+   append to a log directory; an advisory lock on a ``LOCK`` file makes a
+   second process fail at open instead of corrupting the segments
+
+On-disk record layout:
+----------------------
+    crc32 (4 bytes) | op (1 byte) | key length (2 bytes) | value length (4 bytes)
+    key bytes | value bytes
+
+The CRC covers everything after itself. ``op`` is 1 for a put and 0 for a
+delete (tombstone). Segments are named ``segment_000001.log``, and a larger
+number always means newer data.
+"""
+
+import itertools
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+_HEADER = struct.Struct("<IBHI")
+_OP_DELETE = 0
+_OP_PUT = 1
+TEMP_SUFFIX = ".tmp"
+_temp_counter = itertools.count()
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist directory entries (new file names); not supported on every platform."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path: Path) -> Path:
+    """Unique hidden sibling of ``path``; it never matches the ``*.txt`` listings."""
+    return path.with_name(f".{path.name}.{os.getpid()}.{next(_temp_counter)}{TEMP_SUFFIX}")
+
+
+def _remove_quietly(path: Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _create_parent_directories(path: Path, created: set) -> None:
+    """Create the missing parents of ``path``, remembering whose entries changed."""
+    missing = []
+    directory = path.parent
+    while not directory.exists():
+        missing.append(directory)
+        directory = directory.parent
+    path.parent.mkdir(parents=True, exist_ok=True)
+    created.update(directory.parent for directory in missing)
+
+
+def write_files_durably(
+    files: Iterable[Tuple[Path, Union[str, bytes]]],
+    encoding: str = "utf-8",
+    sync: bool = True
+) -> Dict[Path, OSError]:
+    """
+    Atomically replace a group of files and make them durable together.
+
+    Every content is written to a temporary file next to its target and
+    fsynced; only then is each temporary file renamed over its target, and
+    finally each parent directory is synced once. A crash at any point
+    leaves every target either with its old content or with its new one,
+    never truncated, and the batch pays for a single durability barrier
+    instead of one per file. Missing parent directories (such as the
+    shard directories of ``layout.ClientFileLayout``) are created.
+
+    Args:
+        files (Iterable[Tuple[Path, Union[str, bytes]]]): (path, content)
+            pairs; bytes contents are written as they are
+        encoding (str): Text encoding of the text contents
+        sync (bool): Whether to fsync; without it the replacement is still
+            atomic for other processes, but may not survive a power cut
+
+    Returns:
+        Dict[Path, OSError]: Files that could not be written or synced; an
+        empty dictionary means every file is on stable storage
+    """
+    failures: Dict[Path, OSError] = {}
+    written: List[Tuple[Path, Path]] = []
+    renamed = set()
+    for path, content in files:
+        path = Path(path)
+        temp_path = _temp_path(path)
+        try:
+            try:
+                fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileNotFoundError:
+                _create_parent_directories(path, renamed)
+                fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except OSError as e:
+            failures[path] = e
+            continue
+        try:
+            data = content if isinstance(content, bytes) else content.encode(encoding)
+            while data:
+                data = data[os.write(fd, data):]
+            if sync:
+                os.fsync(fd)
+        except OSError as e:
+            failures[path] = e
+        finally:
+            os.close(fd)
+        if path in failures:
+            _remove_quietly(temp_path)
+        else:
+            written.append((path, temp_path))
+
+    # Renames happen only after every content is on disk, so a crash in the
+    # loop above leaves nothing but temporary files behind
+    for path, temp_path in written:
+        try:
+            os.replace(temp_path, path)
+            renamed.add(path.parent)
+        except OSError as e:
+            failures[path] = e
+            _remove_quietly(temp_path)
+
+    if sync:
+        for directory in renamed:
+            _fsync_directory(directory)
+    return failures
+
+
+def remove_stale_temp_files(directory: Path, max_age_seconds: float = 3600) -> int:
+    """
+    Delete temporary files left in ``directory`` by interrupted writes.
+
+    Only files older than ``max_age_seconds`` are removed, so a write still
+    in progress in another process keeps its temporary file.
+
+    Returns:
+        int: Number of files removed
+    """
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    try:
+        candidates = list(Path(directory).glob(f".*{TEMP_SUFFIX}"))
+    except OSError:
+        return 0
+    for temp_path in candidates:
+        try:
+            if temp_path.stat().st_mtime < cutoff:
+                temp_path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class _CommitRequest:
+    __slots__ = ("path", "content", "error", "done")
+
+    def __init__(self, path: Path, content: str):
+        self.path = path
+        self.content = content
+        self.error: Optional[OSError] = None
+        self.done = False
+
+
+class GroupCommitter:
+    """
+    Atomic, durable single-file writes that share their fsyncs.
+
+    ``write`` queues the file and waits. The first waiting thread becomes
+    the "leader": it takes every request queued so far and writes them all
+    with ``write_files_durably``, while new writers queue up for the next
+    round. Ten threads saving ten clients at once thus pay for roughly two
+    barriers instead of ten.
+
+    Args:
+        encoding (str): Text encoding of the contents
+        sync (bool): Whether to fsync (see ``write_files_durably``)
+
+    Example:
+        committer = GroupCommitter()
+        committer.write(Path("data/ana_garcia.txt"), content)
+
+    Educational Note:
+        A thread writing alone gets no worse than a plain atomic write: it
+        leads a batch of one and returns as soon as it is durable.
+    """
+
+    def __init__(self, encoding: str = "utf-8", sync: bool = True):
+        self.encoding = encoding
+        self.sync = sync
+        self._condition = threading.Condition()
+        self._pending: List[_CommitRequest] = []
+        self._leader_active = False
+        self.commits = 0
+        self.files_written = 0
+
+    def write(self, path: Path, content: str) -> None:
+        """
+        Atomically replace ``path`` with ``content`` and wait until it is durable.
+
+        Raises:
+            OSError: If the file could not be written
+        """
+        request = _CommitRequest(Path(path), content)
+        with self._condition:
+            self._pending.append(request)
+            while not request.done and self._leader_active:
+                self._condition.wait()
+            if request.done:
+                if request.error is not None:
+                    raise request.error
+                return
+            self._leader_active = True
+            batch, self._pending = self._pending, []
+
+        failures: Dict[Path, OSError] = {}
+        try:
+            failures = write_files_durably(
+                ((queued.path, queued.content) for queued in batch),
+                self.encoding,
+                self.sync
+            )
+        except OSError as e:
+            failures = {queued.path: e for queued in batch}
+        finally:
+            with self._condition:
+                for queued in batch:
+                    queued.error = failures.get(queued.path)
+                    queued.done = True
+                self.commits += 1
+                self.files_written += len(batch) - len(failures)
+                self._leader_active = False
+                self._condition.notify_all()
+
+        if request.error is not None:
+            raise request.error
+
+
+class LogStorage:
+    """
+    Segmented append-only key/value store for client records.
+
+    Every write appends a full record to the active segment and updates the
+    in-memory index, so a change never rewrites existing data. When the
+    active segment grows past ``segment_size_bytes`` a new one is started.
+    A background thread periodically copies the live records of sealed
+    segments forward and deletes them.
+
+    A log directory belongs to one process at a time: opening it takes an
+    exclusive advisory lock and a second ``LogStorage`` on the same
+    directory, in any process, raises ``OSError``.
+
+    Args:
+        directory (Path): Directory holding the segment files
+        segment_size_bytes (int): Size at which the active segment is sealed
+        encoding (str): Text encoding used for record values
+        compaction_interval_seconds (int): Seconds between background
+            compaction checks; 0 disables the background thread
+        compaction_min_dead_ratio (float): Fraction of dead bytes in the
+            sealed segments needed before compaction runs
+        sync_writes (bool): Whether to fsync the segment after every write
+
+    Educational Note:
+        The index stores (segment, offset, length) triples instead of the
+        records themselves, so memory use grows with the number of keys,
+        not with the size of the data.
+    """
+
+    SEGMENT_PREFIX = "segment_"
+    SEGMENT_SUFFIX = ".log"
+    LOCK_FILE = "LOCK"
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_size_bytes: int = 64 * 1024 * 1024,
+        encoding: str = "utf-8",
+        compaction_interval_seconds: int = 300,
+        compaction_min_dead_ratio: float = 0.5,
+        sync_writes: bool = False
+    ):
+        self.directory = Path(directory)
+        self.segment_size_bytes = segment_size_bytes
+        self.encoding = encoding
+        self.compaction_min_dead_ratio = compaction_min_dead_ratio
+        self.sync_writes = sync_writes
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.RLock()
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._segment_sizes: Dict[int, int] = {}
+        self._dead_bytes: Dict[int, int] = {}
+        self._readers: Dict[int, BinaryIO] = {}
+        self._active_id = 0
+        self._active_file: Optional[BinaryIO] = None
+        self._lock_file: Optional[BinaryIO] = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Before recovery, which may truncate a segment another process is appending to
+        self._acquire_directory_lock()
+        try:
+            self._recover()
+        except Exception:
+            self._release_directory_lock()
+            raise
+
+        self._stop_event = threading.Event()
+        self._compaction_thread: Optional[threading.Thread] = None
+        if compaction_interval_seconds > 0:
+            self._compaction_thread = threading.Thread(
+                target=self._compaction_loop,
+                args=(compaction_interval_seconds,),
+                name="axanet-log-compaction",
+                daemon=True
+            )
+            self._compaction_thread.start()
+
+    @classmethod
+    def from_config(cls, database_config, directory: Optional[Path] = None) -> 'LogStorage':
+        """
+        Create a log store from a ``DatabaseConfig``.
+
+        Args:
+            database_config (DatabaseConfig): Storage configuration
+            directory (Path, optional): Overrides ``database_config.full_path``
+
+        Returns:
+            LogStorage: Opened log store
+
+        Educational Note:
+            ``durable_writes`` becomes ``sync_writes``, so a log write is as
+            durable as a file write when it returns.
+        """
+        return cls(
+            directory=Path(directory) if directory is not None else database_config.full_path,
+            segment_size_bytes=database_config.log_segment_size_mb * 1024 * 1024,
+            encoding=database_config.encoding,
+            compaction_interval_seconds=database_config.log_compaction_interval_seconds,
+            compaction_min_dead_ratio=database_config.log_compaction_min_dead_ratio,
+            sync_writes=database_config.durable_writes
+        )
+
+    # ------------------------------------------------------------------
+    # Segment bookkeeping
+    # ------------------------------------------------------------------
+
+    def _acquire_directory_lock(self) -> None:
+        path = self.directory / self.LOCK_FILE
+        handle = open(path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError as e:
+            handle.close()
+            raise OSError(e.errno, "log directory is already in use by another LogStorage", str(path)) from e
+        self._lock_file = handle
+
+    def _release_directory_lock(self) -> None:
+        # Closing the file releases the lock
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.directory / f"{self.SEGMENT_PREFIX}{segment_id:06d}{self.SEGMENT_SUFFIX}"
+
+    def _existing_segment_ids(self) -> List[int]:
+        segment_ids = []
+        for path in self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"):
+            number = path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+            if number.isdigit():
+                segment_ids.append(int(number))
+        return sorted(segment_ids)
+
+    def _reader(self, segment_id: int) -> BinaryIO:
+        reader = self._readers.get(segment_id)
+        if reader is None:
+            reader = open(self._segment_path(segment_id), "rb")
+            self._readers[segment_id] = reader
+        return reader
+
+    def _open_new_segment(self) -> None:
+        if self._active_file is not None:
+            self._active_file.flush()
+            os.fsync(self._active_file.fileno())
+            self._active_file.close()
+        self._active_id += 1
+        self._active_file = open(self._segment_path(self._active_id), "ab")
+        self._segment_sizes[self._active_id] = 0
+        self._dead_bytes[self._active_id] = 0
+
+    def _recover(self) -> None:
+        """Rebuild the index by scanning every segment from oldest to newest."""
+        segment_ids = self._existing_segment_ids()
+        for segment_id in segment_ids:
+            self._scan_segment(segment_id, is_last=(segment_id == segment_ids[-1]))
+
+        if segment_ids:
+            self._active_id = segment_ids[-1]
+            self._active_file = open(self._segment_path(self._active_id), "ab")
+            if self._segment_sizes[self._active_id] >= self.segment_size_bytes:
+                self._open_new_segment()
+        else:
+            self._open_new_segment()
+
+        self.logger.debug(f"Log storage recovered {len(self._index)} keys from {len(segment_ids)} segments")
+
+    def _scan_segment(self, segment_id: int, is_last: bool) -> None:
+        path = self._segment_path(segment_id)
+        data = path.read_bytes()
+        offset = 0
+        self._dead_bytes[segment_id] = 0
+
+        while offset + _HEADER.size <= len(data):
+            crc, op, key_len, value_len = _HEADER.unpack_from(data, offset)
+            body_start = offset + _HEADER.size
+            record_end = body_start + key_len + value_len
+            if record_end > len(data) or zlib.crc32(data[offset + 4:record_end]) != crc:
+                break
+
+            key = data[body_start:body_start + key_len].decode("utf-8")
+            self._mark_dead(key)
+            if op == _OP_PUT:
+                self._index[key] = (segment_id, body_start + key_len, value_len)
+            else:
+                self._index.pop(key, None)
+                self._dead_bytes[segment_id] += record_end - offset
+            offset = record_end
+
+        if offset < len(data):
+            if is_last:
+                # A torn tail left by a crash: cut it off so new appends stay parseable
+                self.logger.warning(f"Truncating torn tail of {path} at byte {offset}")
+                with open(path, "r+b") as handle:
+                    handle.truncate(offset)
+            else:
+                self.logger.warning(f"Ignoring corrupt data in {path} after byte {offset}")
+        self._segment_sizes[segment_id] = offset
+
+    def _mark_dead(self, key: str) -> None:
+        """Account the current record of ``key`` (if any) as dead bytes."""
+        previous = self._index.get(key)
+        if previous is not None:
+            segment_id, value_offset, value_len = previous
+            key_len = len(key.encode("utf-8"))
+            self._dead_bytes[segment_id] += _HEADER.size + key_len + value_len
+
+    def _append(self, op: int, key: str, value: bytes, flush: bool = True) -> Tuple[int, int, int]:
+        key_bytes = key.encode("utf-8")
+        body = _HEADER.pack(0, op, len(key_bytes), len(value))[4:] + key_bytes + value
+        record = struct.pack("<I", zlib.crc32(body)) + body
+
+        if self._segment_sizes[self._active_id] >= self.segment_size_bytes:
+            self._open_new_segment()
+
+        offset = self._segment_sizes[self._active_id]
+        self._active_file.write(record)
+        if flush:
+            self._active_file.flush()
+            if self.sync_writes:
+                os.fsync(self._active_file.fileno())
+        self._segment_sizes[self._active_id] = offset + len(record)
+
+        return self._active_id, offset + _HEADER.size + len(key_bytes), len(value)
+
+    # ------------------------------------------------------------------
+    # Public key/value API
+    # ------------------------------------------------------------------
+
+    def read(self, key: str) -> Optional[str]:
+        """
+        Read the latest value stored for a key.
+
+        Args:
+            key (str): Normalized client name
+
+        Returns:
+            Optional[str]: Stored content, or None if the key does not exist
+        """
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return None
+            segment_id, value_offset, value_len = location
+            reader = self._reader(segment_id)
+            reader.seek(value_offset)
+            value = reader.read(value_len)
+        return value.decode(self.encoding)
+
+    def write(self, key: str, content: str) -> None:
+        """
+        Append a new version of a key.
+
+        Args:
+            key (str): Normalized client name
+            content (str): Client data in file format
+        """
+        value = content.encode(self.encoding)
+        with self._lock:
+            self._mark_dead(key)
+            self._index[key] = self._append(_OP_PUT, key, value)
+
+    def write_many(self, items: Iterable[Tuple[str, str]]) -> int:
+        """
+        Append new versions of several keys with a single flush and fsync.
+
+        Args:
+            items (Iterable[Tuple[str, str]]): (normalized name, content) pairs
+
+        Returns:
+            int: Number of records written
+
+        Educational Note:
+            The records are buffered and flushed together, then (with
+            ``sync_writes``) the segment is synced once: a batch is as
+            durable as a single ``write`` when this returns, or it raised.
+            The index only points at the new records once the flush (and
+            fsync) succeeded, so a failed batch is never readable.
+        """
+        written: List[Tuple[str, Tuple[int, int, int]]] = []
+        with self._lock:
+            try:
+                for key, content in items:
+                    written.append((key, self._append(_OP_PUT, key, content.encode(self.encoding), flush=False)))
+            finally:
+                self._active_file.flush()
+                if self.sync_writes:
+                    os.fsync(self._active_file.fileno())
+                for key, location in written:
+                    self._mark_dead(key)
+                    self._index[key] = location
+        return len(written)
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a key by appending a tombstone.
+
+        Args:
+            key (str): Normalized client name
+
+        Returns:
+            bool: True if the key existed
+        """
+        with self._lock:
+            if key not in self._index:
+                return False
+            self._mark_dead(key)
+            del self._index[key]
+            segment_id, _, _ = self._append(_OP_DELETE, key, b"")
+            self._dead_bytes[segment_id] += _HEADER.size + len(key.encode("utf-8"))
+            return True
+
+    def exists(self, key: str) -> bool:
+        """Check whether a key has a live record."""
+        return key in self._index
+
+    def keys(self) -> List[str]:
+        """
+        List every live key.
+
+        Returns:
+            List[str]: Sorted normalized client names
+        """
+        with self._lock:
+            return sorted(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def dead_ratio(self) -> float:
+        """Fraction of bytes in sealed segments that belong to dead records."""
+        with self._lock:
+            sealed = [s for s in self._segment_sizes if s != self._active_id]
+            total = sum(self._segment_sizes[s] for s in sealed)
+            dead = sum(self._dead_bytes[s] for s in sealed)
+        return dead / total if total else 0.0
+
+    def compact(self, force: bool = False) -> int:
+        """
+        Copy the live records of sealed segments forward and delete them.
+
+        Args:
+            force (bool): Compact even if the dead ratio is below the threshold
+
+        Returns:
+            int: Number of bytes reclaimed
+
+        Educational Note:
+            Live records are appended to the active segment before any old
+            segment is removed, and old segments are removed oldest first.
+            A crash at any point therefore leaves every key readable and
+            never resurrects a deleted one.
+        """
+        with self._lock:
+            if not force and self.dead_ratio() < self.compaction_min_dead_ratio:
+                return 0
+
+            sealed = sorted(s for s in self._segment_sizes if s != self._active_id)
+            if not sealed:
+                return 0
+            sealed_set = set(sealed)
+            reclaimed = sum(self._segment_sizes[s] for s in sealed)
+
+            for key, (segment_id, value_offset, value_len) in list(self._index.items()):
+                if segment_id in sealed_set:
+                    reader = self._reader(segment_id)
+                    reader.seek(value_offset)
+                    value = reader.read(value_len)
+                    self._index[key] = self._append(_OP_PUT, key, value)
+                    reclaimed -= _HEADER.size + len(key.encode("utf-8")) + value_len
+
+            self._active_file.flush()
+            os.fsync(self._active_file.fileno())
+
+            for segment_id in sealed:
+                reader = self._readers.pop(segment_id, None)
+                if reader is not None:
+                    reader.close()
+                self._segment_path(segment_id).unlink()
+                del self._segment_sizes[segment_id]
+                del self._dead_bytes[segment_id]
+
+        self.logger.info(f"Log compaction reclaimed {reclaimed} bytes from {len(sealed)} segments")
+        return reclaimed
+
+    def _compaction_loop(self, interval_seconds: int) -> None:
+        while not self._stop_event.wait(interval_seconds):
+            try:
+                self.compact()
+            except OSError as e:
+                self.logger.error(f"Log compaction failed: {e}")
+
+    def close(self) -> None:
+        """Stop background compaction and close every open segment."""
+        self._stop_event.set()
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self._lock:
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+            if self._active_file is not None:
+                self._active_file.close()
+                self._active_file = None
+            self._release_directory_lock()
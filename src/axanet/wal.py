@@ -0,0 +1,473 @@
+"""
+Write-Ahead Log for Service Additions
+=====================================
+
+With the "files" backend, adding one service used to re-serialize and
+rewrite the whole client file, so the cost of an update grew with the
+number of services the client already had. This module turns a service
+addition into one small record appended to a shared log; a periodic
+checkpoint folds the logged services into the client files.
+
+Classes:
+--------
+- WriteAheadLog: Append-only log of service lines with checkpoints and replay
+
+Educational Notes for Students:
+-------------------------------
+1. "Write-ahead" means the change is made durable in the log first; the
+   client file is brought up to date later. Databases such as PostgreSQL
+   and SQLite (in WAL mode) work the same way
+2. Every record stores the position the service takes in the client's
+   list. Applying a record whose position the file already has is skipped,
+   so replaying the same log twice (for example after a crash in the middle
+   of a checkpoint) never duplicates a service: replay is idempotent
+3. Reading a client that has logged services means reading its file and
+   applying the pending records on top, so readers always see every
+   acknowledged service, folded or not
+4. A checkpoint first switches to a new log file, so writers keep appending
+   while the old file is being folded; the old file is deleted only after
+   the client files it covered are safely on disk
+5. Deleting a client writes a "clear" record, so services logged for a
+   deleted client are never applied to a new client with the same name
+
+On-disk record layout:
+----------------------
+    crc32 (4 bytes) | op (1 byte) | key length (2 bytes) | position (4 bytes)
+    line length (4 bytes) | key bytes | line bytes
+
+``op`` is 1 for a service line and 0 for a clear. Log files are named
+``wal_000001.log`` inside the data directory.
+"""
+
+import logging
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .locks import StripedLock
+from .storage import _fsync_directory, write_files_durably
+from .watcher import FileVersions
+
+
+_RECORD = struct.Struct("<IBHII")
+_OP_CLEAR = 0
+_OP_SERVICE = 1
+
+# Client files folded per group of stripe locks during a checkpoint
+_CHECKPOINT_CHUNK = 256
+
+
+class WriteAheadLog:
+    """
+    Shared append-only log of service additions for one data directory.
+
+    Args:
+        directory (Path): Data directory (the log files live next to the client files)
+        path_for (Callable[[str], Path]): Client file path of a normalized name
+        apply_records (Callable[[str, List[Tuple[int, str]]], str]): Returns
+            a client file's content with the given (position, line) records
+            applied, skipping positions the content already has
+        locks (StripedLock): The manager's per-client locks; a checkpoint
+            holds them while it rewrites a client file
+        encoding (str): Text encoding of client files and service lines
+        sync (bool): Whether appends are fsynced before they return
+        checkpoint_interval_seconds (int): Seconds between background
+            checkpoints; 0 disables the timer
+        checkpoint_records (int): Pending records that trigger an early
+            checkpoint; 0 disables the trigger
+        locate (Callable[[str], Path], optional): Path a client file is
+            read from when it can differ from ``path_for`` (while a
+            ``layout.ClientFileLayout`` migration runs); defaults to ``path_for``
+        versions (FileVersions, optional): The manager's remembered file
+            versions; a checkpoint records the files it rewrites so the
+            watcher does not report them as changed by another process
+
+    Educational Note:
+        Appends from many threads share their fsyncs: a thread that finds
+        its record already synced by someone else's ``fsync`` returns
+        without calling it again (group commit).
+    """
+
+    FILE_PREFIX = "wal_"
+    FILE_SUFFIX = ".log"
+
+    def __init__(
+        self,
+        directory: Path,
+        path_for: Callable[[str], Path],
+        apply_records: Callable[[str, List[Tuple[int, str]]], str],
+        locks: StripedLock,
+        encoding: str = "utf-8",
+        sync: bool = True,
+        checkpoint_interval_seconds: int = 60,
+        checkpoint_records: int = 10000,
+        locate: Optional[Callable[[str], Path]] = None,
+        versions: Optional[FileVersions] = None
+    ):
+        self.directory = Path(directory)
+        self.path_for = path_for
+        self.locate = locate or path_for
+        self.apply_records = apply_records
+        self.locks = locks
+        self.versions = versions
+        self.encoding = encoding
+        self.sync = sync
+        self.checkpoint_records = checkpoint_records
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        # key -> [(sequence number, position, line)] not yet folded into the file
+        self._pending: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._pending_count = 0
+        self._sequence = 0
+        self._synced_sequence = 0
+        self._active_id = 0
+        self._active_fd: Optional[int] = None
+        self._active_size = 0
+        self.appended = 0
+        self.checkpoints = 0
+
+        self._replay()
+
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        if checkpoint_interval_seconds > 0 or checkpoint_records > 0:
+            self._checkpoint_thread = threading.Thread(
+                target=self._checkpoint_loop,
+                args=(checkpoint_interval_seconds or None,),
+                name="axanet-wal-checkpoint",
+                daemon=True
+            )
+            self._checkpoint_thread.start()
+
+    @classmethod
+    def from_config(
+        cls,
+        database_config,
+        directory: Path,
+        path_for: Callable[[str], Path],
+        apply_records: Callable[[str, List[Tuple[int, str]]], str],
+        locks: StripedLock,
+        locate: Optional[Callable[[str], Path]] = None,
+        versions: Optional[FileVersions] = None
+    ) -> 'WriteAheadLog':
+        """
+        Open the log of a data directory using the ``wal_*`` settings of a ``DatabaseConfig``.
+
+        Returns:
+            WriteAheadLog: Opened log, with any records left by a crash already replayed
+        """
+        return cls(
+            directory=directory,
+            path_for=path_for,
+            apply_records=apply_records,
+            locks=locks,
+            encoding=database_config.encoding,
+            sync=database_config.durable_writes,
+            checkpoint_interval_seconds=database_config.wal_checkpoint_interval_seconds,
+            checkpoint_records=database_config.wal_checkpoint_records,
+            locate=locate,
+            versions=versions
+        )
+
+    # ------------------------------------------------------------------
+    # Log files
+    # ------------------------------------------------------------------
+
+    def _file_path(self, file_id: int) -> Path:
+        return self.directory / f"{self.FILE_PREFIX}{file_id:06d}{self.FILE_SUFFIX}"
+
+    def _existing_file_ids(self) -> List[int]:
+        file_ids = []
+        for path in self.directory.glob(f"{self.FILE_PREFIX}*{self.FILE_SUFFIX}"):
+            number = path.name[len(self.FILE_PREFIX):-len(self.FILE_SUFFIX)]
+            if number.isdigit():
+                file_ids.append(int(number))
+        return sorted(file_ids)
+
+    def _open_next_file(self) -> None:
+        """Switch appends to a new log file (caller holds both locks)."""
+        if self._active_fd is not None:
+            if self.sync:
+                os.fsync(self._active_fd)
+            os.close(self._active_fd)
+        self._synced_sequence = self._sequence
+        self._active_id += 1
+        self._active_fd = os.open(self._file_path(self._active_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._active_size = 0
+        if self.sync:
+            _fsync_directory(self.directory)
+
+    def _replay(self) -> None:
+        """Load the records of every log file left behind and fold them into the client files."""
+        file_ids = self._existing_file_ids()
+        for file_id in file_ids:
+            self._scan_file(file_id)
+        self._active_id = file_ids[-1] if file_ids else 0
+        with self._sync_lock, self._lock:
+            self._open_next_file()
+        if self._pending_count:
+            self.logger.info(f"Replaying {self._pending_count} logged services from {len(file_ids)} log files")
+        if file_ids:
+            self.checkpoint()
+
+    def _scan_file(self, file_id: int) -> None:
+        data = self._file_path(file_id).read_bytes()
+        offset = 0
+        while offset + _RECORD.size <= len(data):
+            crc, op, key_len, position, line_len = _RECORD.unpack_from(data, offset)
+            body_start = offset + _RECORD.size
+            record_end = body_start + key_len + line_len
+            if record_end > len(data) or zlib.crc32(data[offset + 4:record_end]) != crc:
+                # Torn tail of a record that was being written during a crash
+                break
+            key = data[body_start:body_start + key_len].decode("utf-8")
+            if op == _OP_SERVICE:
+                line = data[body_start + key_len:record_end].decode(self.encoding)
+                self._sequence += 1
+                self._pending.setdefault(key, []).append((self._sequence, position, line))
+                self._pending_count += 1
+            else:
+                self._pending_count -= len(self._pending.pop(key, ()))
+            offset = record_end
+
+    # ------------------------------------------------------------------
+    # Appends
+    # ------------------------------------------------------------------
+
+    def _write_record(self, op: int, key: str, position: int, line: str) -> int:
+        key_bytes = key.encode("utf-8")
+        line_bytes = line.encode(self.encoding)
+        body = struct.pack("<BHII", op, len(key_bytes), position, len(line_bytes)) + key_bytes + line_bytes
+        record = struct.pack("<I", zlib.crc32(body)) + body
+        with self._lock:
+            try:
+                data = record
+                while data:
+                    data = data[os.write(self._active_fd, data):]
+            except OSError:
+                # Cut off the partial record, or replay would stop there and
+                # miss every record appended after it
+                try:
+                    os.ftruncate(self._active_fd, self._active_size)
+                except OSError:
+                    pass
+                raise
+            self._active_size += len(record)
+            self._sequence += 1
+            sequence = self._sequence
+            if op == _OP_SERVICE:
+                self._pending.setdefault(key, []).append((sequence, position, line))
+                self._pending_count += 1
+            else:
+                self._pending_count -= len(self._pending.pop(key, ()))
+            self.appended += 1
+        return sequence
+
+    def _sync_to(self, sequence: int) -> None:
+        """fsync the active file unless another thread's fsync already covered ``sequence``."""
+        with self._sync_lock:
+            if self._synced_sequence >= sequence:
+                return
+            with self._lock:
+                target = self._sequence
+            os.fsync(self._active_fd)
+            self._synced_sequence = target
+
+    def append_service(self, key: str, position: int, line: str) -> None:
+        """
+        Log that the service ``line`` was added at ``position`` of client ``key``.
+
+        Args:
+            key (str): Normalized client name
+            position (int): Index of the new service in the client's list
+            line (str): Service line exactly as it appears in the client file
+
+        Raises:
+            OSError: If the record could not be written or synced
+        """
+        sequence = self._write_record(_OP_SERVICE, key, position, line)
+        if self.sync:
+            try:
+                self._sync_to(sequence)
+            except OSError:
+                with self._lock:
+                    entries = self._pending.get(key, [])
+                    if entries and entries[-1][0] == sequence:
+                        entries.pop()
+                        self._pending_count -= 1
+                raise
+        if self.checkpoint_records and self._pending_count >= self.checkpoint_records:
+            self._wake_event.set()
+
+    def clear(self, key: str) -> None:
+        """
+        Drop the pending services of a deleted client.
+
+        Call it after the client file is gone; a crash before the record is
+        written leaves records for a missing file, which replay ignores.
+        """
+        sequence = self._write_record(_OP_CLEAR, key, 0, "")
+        if self.sync:
+            self._sync_to(sequence)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def pending_records(self, key: str) -> List[Tuple[int, str]]:
+        """Get the (position, line) records of a client not yet folded into its file."""
+        with self._lock:
+            return [(position, line) for _, position, line in self._pending.get(key, ())]
+
+    def read(self, key: str, read_file: Callable[[str], str]) -> str:
+        """
+        Read a client file with its pending services applied.
+
+        Args:
+            key (str): Normalized client name
+            read_file (Callable[[str], str]): Reads the client file itself
+
+        Returns:
+            str: Up-to-date file content
+
+        Educational Note:
+            The pending records are taken before the file is read. If a
+            checkpoint folds them in between, the file already has their
+            positions and applying them again changes nothing.
+        """
+        records = self.pending_records(key)
+        content = read_file(key)
+        return self.apply_records(content, records) if records else content
+
+    def __len__(self) -> int:
+        """Number of logged services not yet folded into client files."""
+        return self._pending_count
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def checkpoint(self) -> int:
+        """
+        Fold every pending service into its client file and drop the old log files.
+
+        Returns:
+            int: Number of client files rewritten
+
+        Raises:
+            OSError: If a client file could not be written (the log is kept)
+
+        Educational Note:
+            Each group of clients is folded while holding their stripe
+            locks, so a checkpoint never races a write to the same client;
+            clients in other stripes keep being updated meanwhile. Each
+            rewrite counts as a write of the manager: its stripe generation
+            is bumped and, with the watcher, its file version remembered.
+        """
+        with self._checkpoint_lock:
+            with self._sync_lock, self._lock:
+                cutoff = self._sequence
+                sealed = self._existing_file_ids()
+                keys = sorted(self._pending)
+                self._open_next_file()
+
+            folded = 0
+            for start in range(0, len(keys), _CHECKPOINT_CHUNK):
+                folded += self._fold(keys[start:start + _CHECKPOINT_CHUNK], cutoff)
+
+            with self._lock:
+                for key in keys:
+                    entries = self._pending.get(key)
+                    if entries is None:
+                        continue
+                    remaining = [entry for entry in entries if entry[0] > cutoff]
+                    self._pending_count -= len(entries) - len(remaining)
+                    if remaining:
+                        self._pending[key] = remaining
+                    else:
+                        del self._pending[key]
+
+            for file_id in sealed:
+                try:
+                    self._file_path(file_id).unlink()
+                except FileNotFoundError:
+                    pass
+            self.checkpoints += 1
+
+        if folded:
+            self.logger.info(f"WAL checkpoint folded services into {folded} client files")
+        return folded
+
+    def _fold(self, keys: List[str], cutoff: int) -> int:
+        files: List[Tuple[Path, str]] = []
+        folded_keys: List[str] = []
+        with self.locks.hold(*keys):
+            for key in keys:
+                with self._lock:
+                    records = [(position, line) for sequence, position, line in self._pending.get(key, ())
+                               if sequence <= cutoff]
+                if not records:
+                    continue
+                path = self.path_for(key)
+                try:
+                    content = self.locate(key).read_text(encoding=self.encoding)
+                except FileNotFoundError:
+                    # Deleted before its clear record was written
+                    continue
+                try:
+                    files.append((path, self.apply_records(content, records)))
+                    folded_keys.append(key)
+                except Exception as e:
+                    # Keep the services: log them again in the new file
+                    self.logger.warning(f"Cannot fold logged services into {path}: {e}")
+                    for position, line in records:
+                        self.append_service(key, position, line)
+            failures = write_files_durably(files, self.encoding, self.sync)
+            for (path, _), key in zip(files, folded_keys):
+                if path in failures:
+                    continue
+                self.locks.bump(key)
+                if self.versions is not None:
+                    self.versions.remember(key)
+        if failures:
+            raise next(iter(failures.values()))
+        return len(files)
+
+    def _checkpoint_loop(self, interval_seconds: Optional[int]) -> None:
+        while not self._stop_event.is_set():
+            self._wake_event.wait(interval_seconds)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.checkpoint()
+            except OSError as e:
+                self.logger.error(f"WAL checkpoint failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background checkpoints, fold every pending service and close the log."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join()
+            self._checkpoint_thread = None
+        try:
+            self.checkpoint()
+        finally:
+            with self._sync_lock, self._lock:
+                if self._active_fd is not None:
+                    os.close(self._active_fd)
+                    self._active_fd = None
+                empty = not self._pending
+        if empty:
+            try:
+                self._file_path(self._active_id).unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,424 @@
+"""
+Data Directory Watcher for Axanet Client Manager
+================================================
+
+This module notices client files changed by other processes (a second
+application instance, the notification workflows, a text editor) so that
+a manager can refresh just those clients instead of reloading everything.
+
+Classes:
+--------
+- DirectoryWatcher: Reports changed client names, using inotify or polling
+- FileVersions: Remembers which file versions this process wrote or read
+
+Functions:
+----------
+- file_signature: (inode, modification time, size) of a file
+
+Educational Notes for Students:
+-------------------------------
+1. On Linux the kernel can report file changes itself (inotify): the watcher
+   sleeps until something happens, and a change costs nothing until then
+2. inotify is reached through ``ctypes``, which calls C functions in the
+   system library directly, so no extra package is needed
+3. Where inotify is missing (other systems, or the per-user watch limit is
+   reached) the watcher falls back to polling: it lists the directory every
+   few seconds and compares each file's signature with the previous scan
+4. The manager's own writes produce events too. Each write replaces the
+   file with a new inode, so remembering the signature of what we wrote
+   lets the manager recognise its own changes and skip them
+5. If the kernel's event queue overflows, individual changes are lost;
+   the only safe reaction is to refresh everything once
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .layout import MAX_SHARD_DEPTH, ClientFileLayout
+
+
+Signature = Tuple[int, int, int]
+
+# inotify constants from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+BACKENDS = ("auto", "inotify", "polling")
+
+
+def file_signature(path: Path) -> Optional[Signature]:
+    """
+    Get a file's (inode, modification time in ns, size).
+
+    Returns:
+        Optional[Signature]: The signature, or None if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class FileVersions:
+    """
+    Signatures of the client files this process last wrote or read.
+
+    A change whose file still has the remembered signature is the
+    process's own write (or a migration move) and needs no refresh.
+
+    Args:
+        layout (ClientFileLayout): Where the client files live
+    """
+
+    def __init__(self, layout: ClientFileLayout):
+        self.layout = layout
+        self._signatures: Dict[str, Signature] = {}
+
+    def remember(self, normalized_name: str) -> None:
+        """Record the current version of a client's file (call it under the client's lock)."""
+        signature = file_signature(self.layout.locate(normalized_name))
+        if signature is None:
+            self._signatures.pop(normalized_name, None)
+        else:
+            self._signatures[normalized_name] = signature
+
+    def forget(self, normalized_name: str) -> None:
+        """Drop a client whose file this process deleted."""
+        self._signatures.pop(normalized_name, None)
+
+    def is_known(self, normalized_name: str) -> bool:
+        """True if the file on disk is the version remembered (both absent counts too)."""
+        return file_signature(self.layout.locate(normalized_name)) == self._signatures.get(normalized_name)
+
+    def clear(self) -> None:
+        self._signatures.clear()
+
+
+class _Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+
+    def __init__(self):
+        library = ctypes.util.find_library("c")
+        if library is None:
+            raise OSError(errno.ENOSYS, "C library not found")
+        libc = ctypes.CDLL(library, use_errno=True)
+        try:
+            self._init1 = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+        except AttributeError:
+            raise OSError(errno.ENOSYS, "inotify is not available on this system")
+        self._init1.argtypes = [ctypes.c_int]
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self._init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+    def add_watch(self, path: Path) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), str(path))
+        return wd
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Read the queued events as (watch descriptor, mask, name)."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].split(b"\0", 1)[0]
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """
+    Background thread that reports client files changed on disk.
+
+    Args:
+        layout (ClientFileLayout): Where the client files live
+        on_change (Callable[[str], bool]): Called with the normalized name
+            of every changed, created or deleted client file; returns True
+            if it refreshed something (False for the process's own writes)
+        on_overflow (Callable[[], None]): Called when changes may have been
+            missed and everything must be refreshed
+        backend (str): "inotify", "polling" or "auto" (inotify when available)
+        poll_interval_seconds (float): Seconds between polling scans
+
+    Example:
+        watcher = DirectoryWatcher(layout, manager_callback, refresh_all)
+        ...
+        watcher.close()
+
+    Educational Note:
+        Several events for the same file that arrive together (close, then
+        rename) are merged, so ``on_change`` runs once per file per batch.
+    """
+
+    def __init__(
+        self,
+        layout: ClientFileLayout,
+        on_change: Callable[[str], bool],
+        on_overflow: Callable[[], None],
+        backend: str = "auto",
+        poll_interval_seconds: float = 2.0
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Watch backend must be one of: {BACKENDS}")
+        self.layout = layout
+        self.on_change = on_change
+        self.on_overflow = on_overflow
+        self.poll_interval_seconds = poll_interval_seconds
+        self.logger = logging.getLogger(__name__)
+
+        self.events = 0
+        self.changes = 0
+        self.own_writes = 0
+        self.overflows = 0
+        self.errors = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+        self._stop_event = threading.Event()
+        self._inotify: Optional[_Inotify] = None
+        self._watches: Dict[int, Tuple[Path, int]] = {}
+        self._wake_read = self._wake_write = -1
+        self.backend = "polling"
+        if backend != "polling":
+            try:
+                self._start_inotify()
+                self.backend = "inotify"
+            except OSError as e:
+                self._close_inotify()
+                if backend == "inotify":
+                    raise
+                self.logger.info(f"inotify unavailable ({e}); polling every {poll_interval_seconds} s")
+
+        self._polled: Dict[str, Signature] = {}
+        if self.backend == "polling":
+            self._polled = self._scan()
+        self._thread = threading.Thread(target=self._run, name="axanet-watcher", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # inotify
+    # ------------------------------------------------------------------
+
+    def _start_inotify(self) -> None:
+        self._inotify = _Inotify()
+        self._wake_read, self._wake_write = os.pipe()
+        self._watch_tree(self.layout.directory, 0)
+
+    def _watch_tree(self, directory: Path, level: int) -> List[str]:
+        """Watch a directory and its shard subdirectories; return the client files already in them."""
+        try:
+            wd = self._inotify.add_watch(directory)
+        except FileNotFoundError:
+            return []
+        self._watches[wd] = (directory, level)
+        names = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if level < MAX_SHARD_DEPTH and self._is_shard_directory(entry.name):
+                            names.extend(self._watch_tree(Path(entry.path), level + 1))
+                    elif self._client_name(entry.name) is not None:
+                        names.append(self._client_name(entry.name))
+        except FileNotFoundError:
+            pass
+        return names
+
+    def _close_inotify(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        for fd in (self._wake_read, self._wake_write):
+            if fd >= 0:
+                os.close(fd)
+        self._wake_read = self._wake_write = -1
+        self._watches.clear()
+
+    def _run_inotify(self) -> bool:
+        """Handle events until closed; return True to switch to polling."""
+        while not self._stop_event.is_set():
+            ready, _, _ = select.select([self._inotify.fd, self._wake_read], [], [])
+            if self._wake_read in ready:
+                return False
+            names: Dict[str, None] = {}
+            overflow = False
+            for wd, mask, name in self._inotify.read_events():
+                self.events += 1
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                elif mask & _IN_IGNORED:
+                    self._watches.pop(wd, None)
+                elif wd in self._watches:
+                    directory, level = self._watches[wd]
+                    if mask & _IN_ISDIR:
+                        if mask & (_IN_CREATE | _IN_MOVED_TO) and level < MAX_SHARD_DEPTH \
+                                and self._is_shard_directory(name):
+                            try:
+                                # Files may have been written before the watch existed
+                                names.update(dict.fromkeys(self._watch_tree(directory / name, level + 1)))
+                            except OSError as e:
+                                self.logger.warning(f"Cannot watch {directory / name}: {e}; switching to polling")
+                                return True
+                    elif not mask & _IN_CREATE:
+                        # Creation is followed by a close once the content is written
+                        client_name = self._client_name(name)
+                        if client_name is not None:
+                            names[client_name] = None
+            if overflow:
+                self._overflow()
+            else:
+                self._dispatch(names)
+        return False
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def _scan(self) -> Dict[str, Signature]:
+        signatures: Dict[str, Signature] = {}
+        for directory in self.layout.directories():
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = self._client_name(entry.name)
+                        if name is None or not entry.is_file():
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        signatures[name] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+        return signatures
+
+    def _run_polling(self) -> None:
+        while not self._stop_event.wait(self.poll_interval_seconds):
+            current = self._scan()
+            previous = self._polled
+            self._polled = current
+            changed = [name for name, signature in current.items() if previous.get(name) != signature]
+            changed.extend(name for name in previous if name not in current)
+            self.events += len(changed)
+            self._dispatch(changed)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_shard_directory(name: str) -> bool:
+        return len(name) == 2 and _HEX_DIGITS.issuperset(name)
+
+    def _client_name(self, filename: str) -> Optional[str]:
+        """Normalized name of a client file; None for temporary, log and other files."""
+        if filename.startswith(".") or not filename.endswith(self.layout.extension):
+            return None
+        return filename[:-len(self.layout.extension)]
+
+    def _dispatch(self, names: Iterable[str]) -> None:
+        for name in names:
+            if self._stop_event.is_set():
+                return
+            started = time.perf_counter()
+            try:
+                refreshed = self.on_change(name)
+            except Exception as e:
+                self.errors += 1
+                self.logger.warning(f"Cannot refresh client {name} after a change on disk: {e}")
+                continue
+            if not refreshed:
+                self.own_writes += 1
+                continue
+            elapsed = time.perf_counter() - started
+            self.changes += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+
+    def _overflow(self) -> None:
+        self.overflows += 1
+        self.logger.warning("Change notifications were lost; refreshing every client")
+        try:
+            self.on_overflow()
+        except Exception as e:
+            self.errors += 1
+            self.logger.error(f"Refresh after lost notifications failed: {e}")
+
+    def _run(self) -> None:
+        if self.backend == "inotify":
+            if not self._run_inotify():
+                return
+            self._close_inotify()
+            self.backend = "polling"
+            self._polled = self._scan()
+            # Changes between the failure and the first scan are unknown
+            self._overflow()
+        self._run_polling()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get watcher counters.
+
+        Returns:
+            Dict[str, Any]: Backend, raw events, refreshed changes (each one
+            invalidated or reloaded a client), own writes skipped, overflows,
+            errors, and average / maximum refresh latency in milliseconds
+        """
+        return {
+            "backend": self.backend,
+            "events": self.events,
+            "invalidations": self.changes,
+            "own_writes_skipped": self.own_writes,
+            "overflows": self.overflows,
+            "errors": self.errors,
+            "reload_latency_ms_avg": round(self._latency_total / self.changes * 1000, 3) if self.changes else 0.0,
+            "reload_latency_ms_max": round(self._latency_max * 1000, 3)
+        }
+
+    def close(self) -> None:
+        """Stop the watcher thread."""
+        self._stop_event.set()
+        if self._wake_write >= 0:
+            try:
+                os.write(self._wake_write, b"\0")
+            except OSError:
+                pass
+        self._thread.join()
+        self._close_inotify()